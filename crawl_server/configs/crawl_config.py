@@ -53,6 +53,29 @@ def load_crawl_config() -> CrawlConfig:
         VERSION_CHECK_URL=get_env("VERSION_CHECK_URL", "https://raw.githubusercontent.com/sansan0/TrendRadar/refs/heads/master/version"),
         SHOW_VERSION_UPDATE=get_bool_env("SHOW_VERSION_UPDATE", True),
         REQUEST_INTERVAL=get_int_env("REQUEST_INTERVAL", 1000),
+        CRAWL_MAX_WORKERS=get_int_env("CRAWL_MAX_WORKERS", 8),
+        CRAWL_RATE_LIMIT=get_float_env("CRAWL_RATE_LIMIT", 10.0),
+        CRAWL_HOST_RATE_LIMIT=get_float_env("CRAWL_HOST_RATE_LIMIT", 2.0),
+        CRAWL_BACKEND=get_env("CRAWL_BACKEND", "thread"),
+        CRAWL_REQUEST_TIMEOUT=get_float_env("CRAWL_REQUEST_TIMEOUT", 10.0),
+        CRAWL_HTTP2=get_bool_env("CRAWL_HTTP2", False),
+        CRAWL_MAX_RETRIES=get_int_env("CRAWL_MAX_RETRIES", 2),
+        CRAWL_RETRY_BASE_DELAY=get_float_env("CRAWL_RETRY_BASE_DELAY", 1.0),
+        CRAWL_RETRY_MAX_DELAY=get_float_env("CRAWL_RETRY_MAX_DELAY", 8.0),
+        CRAWL_DEADLINE=get_float_env("CRAWL_DEADLINE", 60.0),
+        CRAWL_BREAKER_THRESHOLD=get_int_env("CRAWL_BREAKER_THRESHOLD", 5),
+        CRAWL_BREAKER_COOLDOWN=get_float_env("CRAWL_BREAKER_COOLDOWN", 300.0),
+        CRAWL_ADAPTIVE_ENABLED=get_bool_env("CRAWL_ADAPTIVE_ENABLED", False),
+        CRAWL_ADAPTIVE_MIN_MINUTES=get_float_env("CRAWL_ADAPTIVE_MIN_MINUTES", 5.0),
+        CRAWL_ADAPTIVE_MAX_MINUTES=get_float_env("CRAWL_ADAPTIVE_MAX_MINUTES", 60.0),
+        CRAWL_ADAPTIVE_TARGET_NEW=get_float_env("CRAWL_ADAPTIVE_TARGET_NEW", 5.0),
+        SNAPSHOT_TXT_EXPORT=get_bool_env("SNAPSHOT_TXT_EXPORT", False),
+        SNAPSHOT_FILE_EXPORT=get_bool_env("SNAPSHOT_FILE_EXPORT", False),
+        HTTP_POOL_MAXSIZE=get_int_env("HTTP_POOL_MAXSIZE", 10),
+        NOTIFY_QUEUE_ENABLED=get_bool_env("NOTIFY_QUEUE_ENABLED", True),
+        NOTIFY_MAX_ATTEMPTS=get_int_env("NOTIFY_MAX_ATTEMPTS", 5),
+        NOTIFY_RETRY_BASE_DELAY=get_float_env("NOTIFY_RETRY_BASE_DELAY", 30.0),
+        NOTIFY_RETRY_MAX_DELAY=get_float_env("NOTIFY_RETRY_MAX_DELAY", 900.0),
         REPORT_MODE=get_env("REPORT_MODE", "daily"),
         RANK_THRESHOLD=get_int_env("RANK_THRESHOLD", 5),
         SORT_BY_POSITION_FIRST=get_bool_env("SORT_BY_POSITION_FIRST", False),
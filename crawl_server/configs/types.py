@@ -37,6 +37,29 @@ class CrawlConfig:
     VERSION_CHECK_URL: str = "https://raw.githubusercontent.com/sansan0/TrendRadar/refs/heads/master/version"
     SHOW_VERSION_UPDATE: bool = True
     REQUEST_INTERVAL: int = 1000
+    CRAWL_MAX_WORKERS: int = 8
+    CRAWL_RATE_LIMIT: float = 10.0
+    CRAWL_HOST_RATE_LIMIT: float = 2.0
+    CRAWL_BACKEND: str = "thread"
+    CRAWL_REQUEST_TIMEOUT: float = 10.0
+    CRAWL_HTTP2: bool = False
+    CRAWL_MAX_RETRIES: int = 2
+    CRAWL_RETRY_BASE_DELAY: float = 1.0
+    CRAWL_RETRY_MAX_DELAY: float = 8.0
+    CRAWL_DEADLINE: float = 60.0
+    CRAWL_BREAKER_THRESHOLD: int = 5
+    CRAWL_BREAKER_COOLDOWN: float = 300.0
+    CRAWL_ADAPTIVE_ENABLED: bool = False
+    CRAWL_ADAPTIVE_MIN_MINUTES: float = 5.0
+    CRAWL_ADAPTIVE_MAX_MINUTES: float = 60.0
+    CRAWL_ADAPTIVE_TARGET_NEW: float = 5.0
+    SNAPSHOT_TXT_EXPORT: bool = False
+    SNAPSHOT_FILE_EXPORT: bool = False
+    HTTP_POOL_MAXSIZE: int = 10
+    NOTIFY_QUEUE_ENABLED: bool = True
+    NOTIFY_MAX_ATTEMPTS: int = 5
+    NOTIFY_RETRY_BASE_DELAY: float = 30.0
+    NOTIFY_RETRY_MAX_DELAY: float = 900.0
     REPORT_MODE: str = "daily"
     RANK_THRESHOLD: int = 5
     SORT_BY_POSITION_FIRST: bool = False
@@ -15,7 +15,9 @@ from crawl_server.resources.kafka import (
     KafkaEventConsumer,
     KafkaConsumerThread,
 )
-from crawl_server.resources.kafka.client import KafkaClient
+from crawl_server.resources.kafka.client import KafkaClient, get_kafka_client
+from crawl_server.core.utils.http_utils import get_session_registry
+from crawl_server.core.connections.notify_queue import get_notify_queue
 from crawl_server.controllers import CrawlController, FrequencyController, DataController
 from crawl_server.services import CrawlService, FrequencyService, PlatformService, DataService
 from crawl_server.repositories import (
@@ -36,6 +38,7 @@ class Connections(NamedTuple):
     """连接对象集合"""
     db_session: Optional[DatabaseSession]
     redis_client: Optional[RedisClient]
+    kafka_client: Optional[KafkaClient]
     kafka_consumer: Optional[KafkaEventConsumer]
     kafka_consumer_thread: Optional[KafkaConsumerThread]
     crawl_controller: Optional[CrawlController]
@@ -58,6 +61,7 @@ def init_connections(db_config: DatabaseConfig, crawl_config: CrawlConfig) -> Co
     
     db_session: Optional[DatabaseSession] = None
     redis_client: Optional[RedisClient] = None
+    kafka_client: Optional[KafkaClient] = None
     kafka_consumer: Optional[KafkaEventConsumer] = None
     kafka_consumer_thread: Optional[KafkaConsumerThread] = None
     platform_service: Optional[PlatformService] = None
@@ -68,6 +72,19 @@ def init_connections(db_config: DatabaseConfig, crawl_config: CrawlConfig) -> Co
     data_controller: Optional[DataController] = None
     event_router: Optional[object] = None
     
+    # HTTP 连接池大小（抓取和通知共用的 Session 注册表）
+    get_session_registry().configure(pool_maxsize=crawl_config.HTTP_POOL_MAXSIZE)
+    
+    # 启动通知发送队列（继续发送上次退出时未完成的通知）
+    if crawl_config.NOTIFY_QUEUE_ENABLED:
+        try:
+            notify_queue = get_notify_queue(crawl_config)
+            pending = notify_queue.pending_count()
+            if pending:
+                logger.info(f"📨 通知队列中有 {pending} 个未完成任务，后台继续发送")
+        except Exception as e:
+            logger.error(f"❌ 通知发送队列启动失败: {e}")
+    
     # 初始化 PostgreSQL（使用 SQLAlchemy ORM）
     if db_config.POSTGRESQL_ENABLED:
         try:
@@ -99,11 +116,29 @@ def init_connections(db_config: DatabaseConfig, crawl_config: CrawlConfig) -> Co
         except Exception as e:
             logger.error(f"❌ Redis 初始化失败: {e}")
     
+    # 初始化 Kafka 生产者（进程内共享，抓取数据发送时复用；topic 只在启动时检查一次）
+    if db_config.KAFKA_ENABLED:
+        try:
+            bootstrap_servers = db_config.KAFKA_BOOTSTRAP_SERVERS or "Resources-Kafka:9092"
+            event_topic = db_config.KAFKA_EVENT_TOPIC or "trendradar.crawl_server"
+            
+            kafka_client = get_kafka_client(bootstrap_servers)
+            if not kafka_client.enable_kafka:
+                logger.error("❌ Kafka 生产者初始化失败，抓取数据发送时将重试")
+                kafka_client = None
+            elif kafka_client.ensure_topic_exists(event_topic):
+                logger.info(f"✅ Kafka topic 已存在或创建成功: {event_topic}")
+            else:
+                logger.warning(f"⚠️  Kafka topic 创建失败: {event_topic}")
+        except Exception as e:
+            logger.error(f"❌ Kafka 生产者初始化失败: {e}")
+            kafka_client = None
+    
     # 初始化 MVC Controllers（必须在 Kafka Consumer 之前初始化，因为注册处理器时需要用到）
     # 1. 初始化 Repositories
     frequency_cache_repo = FrequencyCache(redis_client=redis_client)
     frequency_database_repo = FrequencyDatabase(db_session=db_session)
-    pipeline_repo = CrawlPipeline(db_config=db_config)
+    pipeline_repo = CrawlPipeline(kafka_client=kafka_client, db_config=db_config)
     
     # Platform Repositories
     platform_cache_repo = PlatformCache(redis_client=redis_client)
@@ -164,16 +199,6 @@ def init_connections(db_config: DatabaseConfig, crawl_config: CrawlConfig) -> Co
             event_topic = db_config.KAFKA_EVENT_TOPIC or "trendradar.crawl_server"
             group_id = db_config.KAFKA_CONSUMER_GROUP_ID or "trendradar-crawl-server"
             
-            # 确保 Kafka topic 存在
-            kafka_client = KafkaClient(
-                bootstrap_servers=bootstrap_servers,
-                enable_kafka=True
-            )
-            if kafka_client.ensure_topic_exists(event_topic):
-                logger.info(f"✅ Kafka topic 已存在或创建成功: {event_topic}")
-            else:
-                logger.warning(f"⚠️  Kafka topic 创建失败: {event_topic}")
-            
             kafka_consumer = KafkaEventConsumer(
                 bootstrap_servers=bootstrap_servers,
                 topic=event_topic,
@@ -193,6 +218,7 @@ def init_connections(db_config: DatabaseConfig, crawl_config: CrawlConfig) -> Co
     return Connections(
         db_session=db_session,
         redis_client=redis_client,
+        kafka_client=kafka_client,
         kafka_consumer=kafka_consumer,
         kafka_consumer_thread=kafka_consumer_thread,
         crawl_controller=crawl_controller,
@@ -213,11 +239,29 @@ def cleanup_connections(connections: Connections):
     if connections.kafka_consumer:
         connections.kafka_consumer.stop()
     
+    # 停止通知发送线程（尽量发完已到期的通知，剩余任务保留在磁盘上）
+    from crawl_server.core.connections.notify_queue import stop_notify_queue
+    stop_notify_queue()
+    
+    # 发送完剩余消息后关闭共享的 Kafka 生产者
+    from crawl_server.resources.kafka.client import close_kafka_client
+    close_kafka_client()
+    
     if connections.redis_client:
         connections.redis_client.close()
     
     if connections.db_session:
         connections.db_session.close()
     
+    # 关闭 HTTP 连接池（抓取和通知共用的 Session，以及异步抓取后端）
+    from crawl_server.core.utils.http_utils import close_http_sessions
+    from crawl_server.core.data.async_backend import close_async_fetch_backends
+    close_http_sessions()
+    close_async_fetch_backends()
+    
+    # 关闭缓存的 SMTP 连接（需在通知队列停止之后）
+    from crawl_server.core.connections.smtp_client import close_smtp_connections
+    close_smtp_connections()
+    
     logger.info("✅ 所有连接已清理")
 
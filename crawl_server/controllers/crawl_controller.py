@@ -7,6 +7,7 @@
 """
 import logging
 from typing import Dict, Any, Optional
+from crawl_server.core.data import CrawlCancelledError
 from crawl_server.resources.kafka.events import OperationCrawlEvent
 from crawl_server.services import CrawlService, PlatformService, FrequencyService
 from crawl_server.configs import CrawlConfig, DatabaseConfig
@@ -99,6 +100,8 @@ class CrawlController:
                 trigger=trigger
             )
             
+        except CrawlCancelledError:
+            raise
         except Exception as e:
             logger.error(f"❌ 执行抓取任务失败: {e}", exc_info=True)
             raise
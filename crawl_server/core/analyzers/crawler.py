@@ -4,18 +4,26 @@
 负责执行数据爬取
 """
 import uuid
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 from crawl_server.configs import DatabaseConfig
-from crawl_server.core.utils import ensure_directory_exists
+from crawl_server.core.data import CrawlSnapshot
+from crawl_server.core.utils import ensure_directory_exists, get_word_matcher
 from crawl_server.core.analyzers.data_loader import DataLoader
 from crawl_server.resources.kafka import send_fetched_data_to_kafka
 
 class Crawler:
     """数据抓取器"""
     
-    def __init__(self, data_fetcher, request_interval: int, db_config: Optional[DatabaseConfig] = None):
+    def __init__(
+        self,
+        data_fetcher,
+        request_interval: int,
+        db_config: Optional[DatabaseConfig] = None,
+        export_txt: bool = False,
+        export_snapshot: bool = False,
+    ):
         """
         初始化抓取器
         
@@ -23,10 +31,14 @@ class Crawler:
             data_fetcher: 数据获取器
             request_interval: 请求间隔（毫秒）
             db_config: 数据库配置对象
+            export_txt: 是否在当日标题日志之外同时导出 txt 文件
+            export_snapshot: 是否在当日标题日志之外同时导出单次抓取的二进制快照文件
         """
         self.data_fetcher = data_fetcher
         self.request_interval = request_interval
         self.db_config = db_config
+        self.export_txt = export_txt
+        self.export_snapshot = export_snapshot
 
     def crawl(
         self, 
@@ -34,7 +46,7 @@ class Crawler:
         trigger_source: str = "scheduled",
         word_groups: Optional[List[Dict]] = None,
         filter_words: Optional[List[str]] = None,
-    ) -> Tuple[Dict, Dict, List]:
+    ) -> CrawlSnapshot:
         """
         执行数据爬取
         
@@ -46,7 +58,7 @@ class Crawler:
             filter_words: 使用的过滤词列表
         
         Returns:
-            (results, id_to_name, failed_ids) 元组
+            本次抓取的快照句柄（包含 results, id_to_name, failed_ids 和抓取时间）
         """
         # 使用传入的 platforms，必须从数据库获取
         if platforms is None:
@@ -70,18 +82,37 @@ class Crawler:
         print(f"抓取会话ID: {session_id}")
         ensure_directory_exists("output")
 
+        # 只有定时抓取按自适应调度跳过未到期的平台，手动/API 触发的抓取全部实际抓取
         results, id_to_name, failed_ids = self.data_fetcher.crawl_websites(
-            ids, self.request_interval
+            ids, self.request_interval, use_schedule=trigger_source == "scheduled"
         )
+        carried_ids = self.data_fetcher.last_crawl_carried
 
-        # 保存数据
-        DataLoader.save_crawl_results(results, id_to_name, failed_ids)
+        # 词组匹配：标注在记录上，Kafka 事件和后续统计直接复用
+        if word_groups:
+            get_word_matcher(word_groups, filter_words or []).annotate(results)
+
+        # 保存数据（追加到当日标题日志）；沿用上次数据的平台只用于本次报告，不作为新的抓取记录
+        snapshot = DataLoader.save_crawl_results(
+            results,
+            id_to_name,
+            failed_ids,
+            export_txt=self.export_txt,
+            export_snapshot=self.export_snapshot,
+            carried_ids=carried_ids,
+        )
+        fetched_results = {
+            id_value: title_data
+            for id_value, title_data in results.items()
+            if id_value not in carried_ids
+        }
 
         # 发送数据到 Kafka（通过 Pipeline Repository）
         # 注意：这里暂时保留原有逻辑，未来可以改为通过 Service 调用
+        sent = False
         try:
-            send_fetched_data_to_kafka(
-                results, 
+            sent = send_fetched_data_to_kafka(
+                fetched_results, 
                 id_to_name, 
                 failed_ids, 
                 db_config=self.db_config,
@@ -90,10 +121,17 @@ class Crawler:
                 trigger_source=trigger_source,
                 platforms=platforms,
                 word_groups=word_groups,
-                filter_words=filter_words
+                filter_words=filter_words,
+                # 沿用上次数据的平台不发送新闻事件，会话事件中与未变化的平台一并记录
+                unchanged_ids=self.data_fetcher.last_crawl_unchanged + carried_ids,
             )
         except Exception as e:
             print(f"⚠️  发送数据到 Kafka 时出错: {e}")
 
-        return results, id_to_name, failed_ids
+        # 发送失败时不记录，下次抓取到相同内容仍会重新发送
+        kafka_enabled = bool(self.db_config and self.db_config.KAFKA_ENABLED)
+        if sent or not kafka_enabled:
+            self.data_fetcher.mark_emitted()
+
+        return snapshot
 
@@ -3,13 +3,13 @@
 
 负责数据加载和预处理
 """
-from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from crawl_server.core.data import (
+    CrawlSnapshot,
     detect_latest_new_titles,
     read_all_today_titles,
-    save_titles_to_file,
+    save_crawl_snapshot,
 )
 from crawl_server.core.utils import load_frequency_words
 
@@ -88,14 +88,23 @@ class DataLoader:
         return title_info
 
     @staticmethod
-    def save_crawl_results(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
-        """保存抓取结果并返回文件路径"""
-        title_file = save_titles_to_file(results, id_to_name, failed_ids)
-        print(f"标题已保存到: {title_file}")
-        return title_file
-
-    @staticmethod
-    def get_time_info_from_file(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
-        """从保存的文件中获取时间信息"""
-        return Path(save_titles_to_file(results, id_to_name, failed_ids)).stem
+    def save_crawl_results(
+        results: Dict,
+        id_to_name: Dict,
+        failed_ids: List,
+        export_txt: bool = False,
+        export_snapshot: bool = False,
+        carried_ids: Optional[List] = None,
+    ) -> CrawlSnapshot:
+        """保存抓取结果并返回快照句柄（carried_ids 中的平台只保留在快照句柄中，不写入文件）"""
+        snapshot = save_crawl_snapshot(
+            results,
+            id_to_name,
+            failed_ids,
+            export_txt=export_txt,
+            export_snapshot=export_snapshot,
+            carried_ids=carried_ids,
+        )
+        print(f"标题已保存到: {snapshot.path}")
+        return snapshot
 
@@ -5,10 +5,10 @@
 """
 import webbrowser
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 
 from crawl_server.configs import CrawlConfig
-from crawl_server.core.data import detect_latest_new_titles
+from crawl_server.core.data import CrawlSnapshot, detect_latest_new_titles
 from crawl_server.core.analyzers.data_loader import DataLoader
 from crawl_server.core.analyzers.pipeline import AnalysisPipeline
 from crawl_server.core.analyzers.notifier import Notifier
@@ -47,17 +47,15 @@ class ModeExecutor:
         self.pipeline = AnalysisPipeline(rank_threshold, update_info, crawl_config=crawl_config)
         self.notifier = Notifier(report_mode, proxy_url, crawl_config=crawl_config)
         self.report_generator = ReportGenerator(
-            report_mode, rank_threshold, update_info, proxy_url
+            report_mode, rank_threshold, update_info, proxy_url, crawl_config=crawl_config
         )
         self.should_open_browser = should_open_browser
         self.is_docker_container = is_docker_container
 
     def execute(
         self, 
-        mode_strategy: Dict, 
-        results: Dict, 
-        id_to_name: Dict, 
-        failed_ids: List,
+        mode_strategy: Dict,
+        snapshot: CrawlSnapshot,
         platforms=None,
         word_groups=None,
         filter_words=None
@@ -67,9 +65,7 @@ class ModeExecutor:
         
         Args:
             mode_strategy: 模式策略
-            results: 抓取结果
-            id_to_name: 平台ID到名称的映射
-            failed_ids: 失败的平台ID列表
+            snapshot: 本次抓取的快照句柄（已保存，不再重复写入）
             platforms: 平台列表（如果为None，则从CONFIG获取，向后兼容）
             word_groups: 频率词组列表（如果为None，则从文件加载，向后兼容）
             filter_words: 过滤词列表（如果为None，则从文件加载，向后兼容）
@@ -79,9 +75,12 @@ class ModeExecutor:
             # 如果 platforms 为 None，说明调用方没有传递，这是不应该的
             raise ValueError("platforms 参数不能为 None，必须从数据库获取")
         current_platform_ids = [platform["id"] for platform in platforms]
+        results = snapshot.results
+        id_to_name = snapshot.id_to_name
+        failed_ids = snapshot.failed_ids
+        time_info = snapshot.time_info
 
         new_titles = detect_latest_new_titles(current_platform_ids)
-        time_info = DataLoader.get_time_info_from_file(results, id_to_name, failed_ids)
         
         # 如果没有传入，则从文件加载（向后兼容）
         if word_groups is None or filter_words is None:
@@ -24,7 +24,13 @@ class NewsAnalyzer(NewsAnalyzerBase):
             db_config: 数据库配置对象
         """
         super().__init__(crawl_config=crawl_config)
-        self.crawler = Crawler(self.data_fetcher, self.request_interval, db_config=db_config)
+        self.crawler = Crawler(
+            self.data_fetcher,
+            self.request_interval,
+            db_config=db_config,
+            export_txt=crawl_config.SNAPSHOT_TXT_EXPORT,
+            export_snapshot=crawl_config.SNAPSHOT_FILE_EXPORT,
+        )
         self.mode_executor = ModeExecutor(
             self.report_mode,
             self.rank_threshold,
@@ -77,7 +83,7 @@ class NewsAnalyzer(NewsAnalyzerBase):
 
             mode_strategy = ConfigChecker.get_mode_strategy(self.report_mode)
 
-            results, id_to_name, failed_ids = self.crawler.crawl(
+            snapshot = self.crawler.crawl(
                 platforms=platforms,
                 trigger_source=trigger_source,
                 word_groups=word_groups,
@@ -85,10 +91,8 @@ class NewsAnalyzer(NewsAnalyzerBase):
             )
 
             self.mode_executor.execute(
-                mode_strategy, 
-                results, 
-                id_to_name, 
-                failed_ids,
+                mode_strategy,
+                snapshot,
                 platforms=platforms,
                 word_groups=word_groups,
                 filter_words=filter_words
@@ -6,7 +6,7 @@
 from typing import Dict, List, Optional
 
 from crawl_server.configs import CrawlConfig
-from crawl_server.core.connections import send_to_notifications
+from crawl_server.core.connections import get_notify_queue, send_to_notifications
 from crawl_server.core.analyzers.config_checker import ConfigChecker
 
 
@@ -48,18 +48,27 @@ class Notifier:
             and has_notification
             and ConfigChecker.has_valid_content(self.report_mode, stats, new_titles)
         ):
-            send_to_notifications(
-                stats,
-                failed_ids or [],
-                report_type,
-                new_titles,
-                id_to_name,
-                update_info,
-                self.proxy_url,
-                mode=mode,
-                html_file_path=html_file_path,
-                crawl_config=self.crawl_config,
-            )
+            notification_kwargs = {
+                "stats": stats,
+                "failed_ids": failed_ids or [],
+                "report_type": report_type,
+                "new_titles": new_titles,
+                "id_to_name": id_to_name,
+                "update_info": update_info,
+                "proxy_url": self.proxy_url,
+                "mode": mode,
+                "html_file_path": html_file_path,
+            }
+            if self.crawl_config.NOTIFY_QUEUE_ENABLED:
+                # 写入持久化队列后立即返回，由后台线程发送并重试失败渠道
+                try:
+                    job_id = get_notify_queue(self.crawl_config).enqueue(notification_kwargs)
+                    if job_id:
+                        print(f"{report_type}通知已加入发送队列: {job_id}")
+                    return True
+                except (OSError, TypeError, ValueError) as e:
+                    print(f"通知写入发送队列失败，改为直接发送: {e}")
+            send_to_notifications(**notification_kwargs, crawl_config=self.crawl_config)
             return True
         elif self.crawl_config.ENABLE_NOTIFICATION and not has_notification:
             print("⚠️ 警告：通知功能已启用但未配置任何通知渠道，将跳过通知发送")
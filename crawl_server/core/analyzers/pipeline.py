@@ -6,7 +6,8 @@
 from typing import Dict, List, Optional, Tuple
 
 from crawl_server.configs import CrawlConfig
-from crawl_server.core.utils import count_word_frequency, generate_html_report
+from crawl_server.core.utils import count_word_frequency, generate_html_report, get_word_matcher
+from crawl_server.core.utils.statistics_utils import resolve_word_groups
 
 
 class AnalysisPipeline:
@@ -37,11 +38,16 @@ class AnalysisPipeline:
         failed_ids: Optional[List] = None,
         is_daily_summary: bool = False,
     ) -> Tuple[List[Dict], str]:
-        """统一的分析流水线：数据处理 → 统计计算 → HTML生成"""
+        """统一的分析流水线：词组匹配 → 统计计算 → HTML生成"""
 
         # 统计计算
         if not self.crawl_config:
             raise RuntimeError("CrawlConfig 未提供，无法执行统计计算")
+
+        # 词组匹配：每条标题只匹配一次，结果标注在记录上供统计、报告数据和通知复用
+        matcher = get_word_matcher(*resolve_word_groups(word_groups, filter_words))
+        matcher.annotate(data_source)
+        matcher.annotate(new_titles)
         stats, total_titles = count_word_frequency(
             data_source,
             word_groups,
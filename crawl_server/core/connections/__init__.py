@@ -3,25 +3,33 @@
 
 负责与各种通知平台的连接和消息发送
 """
-from .batch_utils import split_content_into_batches
+from .batch_utils import split_content_for_channels, split_content_into_batches
 from .bark_sender import send_to_bark
 from .dingtalk_sender import send_to_dingtalk
 from .email_sender import send_to_email
 from .feishu_sender import send_to_feishu
 from .notifications import send_to_notifications
+from .notify_queue import NotifyQueue, get_notify_queue, stop_notify_queue
 from .ntfy_sender import send_to_ntfy
+from .smtp_client import close_smtp_connections, get_smtp_pool
 from .push_manager import PushRecordManager
 from .telegram_sender import send_to_telegram
 from .wework_sender import send_to_wework
 
 __all__ = [
     "split_content_into_batches",
+    "split_content_for_channels",
     "send_to_notifications",
+    "NotifyQueue",
+    "get_notify_queue",
+    "stop_notify_queue",
     "send_to_feishu",
     "send_to_dingtalk",
     "send_to_wework",
     "send_to_telegram",
     "send_to_email",
+    "get_smtp_pool",
+    "close_smtp_connections",
     "send_to_ntfy",
     "send_to_bark",
     "PushRecordManager",
@@ -4,13 +4,14 @@ Bark发送器
 用于发送消息到 Bark 平台
 """
 import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 import requests
 
 from crawl_server.configs import CrawlConfig
 from crawl_server.core.connections.batch_utils import split_content_into_batches
 from crawl_server.core.utils import strip_markdown
+from crawl_server.core.utils.http_utils import get_http_session
 
 def send_to_bark(
     bark_url: str,
@@ -20,12 +21,14 @@ def send_to_bark(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     crawl_config: Optional[CrawlConfig] = None,
+    batches: Optional[List[str]] = None,
 ) -> bool:
     """
     发送到Bark（支持分批发送，使用纯文本格式）
     
     Args:
         crawl_config: 爬虫配置对象
+        batches: 预先分好的批次内容（为 None 时按本渠道格式分批）
     """
     if not crawl_config:
         raise RuntimeError("CrawlConfig 未提供，无法发送到Bark")
@@ -35,9 +38,10 @@ def send_to_bark(
         proxies = {"http": proxy_url, "https": proxy_url}
 
     # 获取分批内容（Bark 限制为 3600 字节以避免 413 错误）
-    batches = split_content_into_batches(
-        report_data, "wework", update_info, max_bytes=crawl_config.BARK_BATCH_SIZE, mode=mode, crawl_config=crawl_config
-    )
+    if batches is None:
+        batches = split_content_into_batches(
+            report_data, "wework", update_info, max_bytes=crawl_config.BARK_BATCH_SIZE, mode=mode, crawl_config=crawl_config
+        )
 
     total_batches = len(batches)
     print(f"Bark消息分为 {total_batches} 批次发送 [{report_type}]")
@@ -82,7 +86,7 @@ def send_to_bark(
         }
 
         try:
-            response = requests.post(
+            response = get_http_session(bark_url, proxy_url).post(
                 bark_url,
                 json=payload,
                 proxies=proxies,
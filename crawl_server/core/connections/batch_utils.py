@@ -1,98 +1,273 @@
 """
 批量处理工具
 
-用于将消息内容分批处理，确保不超过各平台的大小限制
+用于将消息内容分批处理，确保不超过各平台的大小限制。
+每个片段只编码一次，按累计字节数判断批次是否放得下；
+多个渠道可在一次遍历 report_data 时同时完成分批（相同格式的内容只生成一次）
 """
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from crawl_server.configs import CrawlConfig
 from crawl_server.core.utils import format_title_for_platform, get_beijing_time
 
-def split_content_into_batches(
+# 统计部分使用 format_title_for_platform 的格式，其它格式直接使用原标题
+_TITLE_FORMATS = ("wework", "telegram", "ntfy", "feishu", "dingtalk")
+# 新增新闻部分使用 format_title_for_platform 的格式（ntfy 使用原标题）
+_NEW_TITLE_FORMATS = ("wework", "telegram", "feishu", "dingtalk")
+
+# 各通知渠道使用的消息格式（Bark 复用企业微信格式）
+CHANNEL_BATCH_FORMATS = {
+    "feishu": "feishu",
+    "dingtalk": "dingtalk",
+    "wework": "wework",
+    "telegram": "telegram",
+    "ntfy": "ntfy",
+    "bark": "wework",
+}
+
+
+def _utf8_len(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+def _resolve_max_bytes(format_type: str, max_bytes: Optional[int], crawl_config: Optional[CrawlConfig]) -> int:
+    if max_bytes is not None:
+        return max_bytes
+    if not crawl_config:
+        raise RuntimeError("CrawlConfig 未提供，无法确定批次大小")
+    if format_type == "dingtalk":
+        return crawl_config.DINGTALK_BATCH_SIZE
+    if format_type == "feishu":
+        return crawl_config.FEISHU_BATCH_SIZE
+    if format_type == "ntfy":
+        return 3800
+    return crawl_config.MESSAGE_BATCH_SIZE
+
+
+def _feishu_separator(crawl_config: Optional[CrawlConfig]) -> str:
+    if not crawl_config:
+        raise RuntimeError("CrawlConfig 未提供，无法获取分隔符")
+    return crawl_config.FEISHU_MESSAGE_SEPARATOR
+
+
+def _base_header(format_type: str, total_titles: int, now) -> str:
+    if format_type == "wework":
+        return f"**总新闻数：** {total_titles}\n\n\n\n"
+    if format_type == "telegram":
+        return f"总新闻数： {total_titles}\n\n"
+    if format_type == "ntfy":
+        return f"**总新闻数：** {total_titles}\n\n"
+    if format_type == "dingtalk":
+        return (
+            f"**总新闻数：** {total_titles}\n\n"
+            f"**时间：** {now.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+            f"**类型：** 热点分析报告\n\n"
+            "---\n\n"
+        )
+    return ""
+
+
+def _base_footer(format_type: str, now, update_info: Optional[Dict]) -> str:
+    time_text = now.strftime('%Y-%m-%d %H:%M:%S')
+    if format_type in ("wework", "ntfy", "dingtalk"):
+        footer = f"\n\n> 更新时间：{time_text}"
+        if format_type == "wework":
+            footer = f"\n\n\n> 更新时间：{time_text}"
+        if update_info:
+            footer += f"\n> TrendRadar 发现新版本 **{update_info['remote_version']}**，当前 **{update_info['current_version']}**"
+        return footer
+    if format_type == "telegram":
+        footer = f"\n\n更新时间：{time_text}"
+        if update_info:
+            footer += f"\nTrendRadar 发现新版本 {update_info['remote_version']}，当前 {update_info['current_version']}"
+        return footer
+    if format_type == "feishu":
+        footer = f"\n\n<font color='grey'>更新时间：{time_text}</font>"
+        if update_info:
+            footer += f"\n<font color='grey'>TrendRadar 发现新版本 {update_info['remote_version']}，当前 {update_info['current_version']}</font>"
+        return footer
+    return ""
+
+
+def _stats_header(format_type: str) -> str:
+    if format_type == "telegram":
+        return "📊 热点词汇统计\n\n"
+    if format_type in ("wework", "ntfy", "feishu", "dingtalk"):
+        return "📊 **热点词汇统计**\n\n"
+    return ""
+
+
+def _word_header(format_type: str, sequence_display: str, word: str, count: int) -> str:
+    if count >= 10:
+        icon = "🔥"
+    elif count >= 5:
+        icon = "📈"
+    else:
+        icon = "📌"
+
+    if format_type in ("wework", "ntfy", "dingtalk"):
+        if count >= 5:
+            return f"{icon} {sequence_display} **{word}** : **{count}** 条\n\n"
+        return f"{icon} {sequence_display} **{word}** : {count} 条\n\n"
+    if format_type == "telegram":
+        return f"{icon} {sequence_display} {word} : {count} 条\n\n"
+    if format_type == "feishu":
+        if count >= 10:
+            return f"{icon} <font color='grey'>{sequence_display}</font> **{word}** : <font color='red'>{count}</font> 条\n\n"
+        if count >= 5:
+            return f"{icon} <font color='grey'>{sequence_display}</font> **{word}** : <font color='orange'>{count}</font> 条\n\n"
+        return f"{icon} <font color='grey'>{sequence_display}</font> **{word}** : {count} 条\n\n"
+    return ""
+
+
+def _format_stat_title(format_type: str, title_data: Dict) -> str:
+    if format_type in _TITLE_FORMATS:
+        return format_title_for_platform(format_type, title_data, show_source=True)
+    return f"{title_data['title']}"
+
+
+def _format_new_title(format_type: str, title_data: Dict) -> str:
+    title_data_copy = title_data.copy()
+    title_data_copy["is_new"] = False
+    if format_type in _NEW_TITLE_FORMATS:
+        return format_title_for_platform(format_type, title_data_copy, show_source=False)
+    return f"{title_data_copy['title']}"
+
+
+def _group_separator(format_type: str, crawl_config: Optional[CrawlConfig]) -> str:
+    if format_type == "wework":
+        return "\n\n\n\n"
+    if format_type in ("telegram", "ntfy"):
+        return "\n\n"
+    if format_type == "feishu":
+        return f"\n{_feishu_separator(crawl_config)}\n\n"
+    if format_type == "dingtalk":
+        return "\n---\n\n"
+    return ""
+
+
+def _new_header(format_type: str, total_new_count: int, crawl_config: Optional[CrawlConfig]) -> str:
+    if format_type == "wework":
+        return f"\n\n\n\n🆕 **本次新增热点新闻** (共 {total_new_count} 条)\n\n"
+    if format_type == "telegram":
+        return f"\n\n🆕 本次新增热点新闻 (共 {total_new_count} 条)\n\n"
+    if format_type == "ntfy":
+        return f"\n\n🆕 **本次新增热点新闻** (共 {total_new_count} 条)\n\n"
+    if format_type == "feishu":
+        return f"\n{_feishu_separator(crawl_config)}\n\n🆕 **本次新增热点新闻** (共 {total_new_count} 条)\n\n"
+    if format_type == "dingtalk":
+        return f"\n---\n\n🆕 **本次新增热点新闻** (共 {total_new_count} 条)\n\n"
+    return ""
+
+
+def _source_header(format_type: str, source_name: str, titles_count: int) -> str:
+    if format_type in ("wework", "ntfy", "feishu", "dingtalk"):
+        return f"**{source_name}** ({titles_count} 条):\n\n"
+    if format_type == "telegram":
+        return f"{source_name} ({titles_count} 条):\n\n"
+    return ""
+
+
+def _failed_header(format_type: str, crawl_config: Optional[CrawlConfig]) -> str:
+    if format_type == "wework":
+        return "\n\n\n\n⚠️ **数据获取失败的平台：**\n\n"
+    if format_type == "telegram":
+        return "\n\n⚠️ 数据获取失败的平台：\n\n"
+    if format_type == "ntfy":
+        return "\n\n⚠️ **数据获取失败的平台：**\n\n"
+    if format_type == "feishu":
+        return f"\n{_feishu_separator(crawl_config)}\n\n⚠️ **数据获取失败的平台：**\n\n"
+    if format_type == "dingtalk":
+        return "\n---\n\n⚠️ **数据获取失败的平台：**\n\n"
+    return ""
+
+
+def _failed_line(format_type: str, id_value: str) -> str:
+    if format_type == "feishu":
+        return f"  • <font color='red'>{id_value}</font>\n"
+    if format_type == "dingtalk":
+        return f"  • **{id_value}**\n"
+    return f"  • {id_value}\n"
+
+
+# (文本, UTF-8 字节数)
+Fragment = Tuple[str, int]
+
+
+class _BatchBuilder:
+    """单个渠道的分批状态：片段存入列表并累计字节数，批次内容加尾部必须小于 max_bytes"""
+
+    def __init__(self, max_bytes: int, base_header: Fragment, base_footer: str):
+        self.base_header = base_header
+        self.base_footer = base_footer
+        self.limit = max_bytes - _utf8_len(base_footer)
+        self.batches: List[str] = []
+        self.parts = [base_header[0]]
+        self.size = base_header[1]
+        self.has_content = False
+
+    def fits(self, size: int) -> bool:
+        return self.size + size < self.limit
+
+    def append(self, fragment: Fragment, content: bool = True) -> None:
+        self.parts.append(fragment[0])
+        self.size += fragment[1]
+        if content:
+            self.has_content = True
+
+    def append_or_restart(self, fragment: Fragment, prefix: Sequence[Fragment] = ()) -> None:
+        """放得下时追加，否则结束当前批次，以 基础头部 + prefix + 片段 开始新批次"""
+        if not self.fits(fragment[1]):
+            self.flush()
+            self.parts = [self.base_header[0]]
+            self.size = self.base_header[1]
+            for part in prefix:
+                self.append(part)
+        self.append(fragment)
+
+    def flush(self) -> None:
+        if self.has_content:
+            self.batches.append("".join(self.parts) + self.base_footer)
+
+    def finish(self) -> List[str]:
+        self.flush()
+        return self.batches
+
+
+def _fragment(text: str) -> Fragment:
+    return text, _utf8_len(text)
+
+
+def _split_batches(
     report_data: Dict,
-    format_type: str,
-    update_info: Optional[Dict] = None,
-    max_bytes: int = None,
-    mode: str = "daily",
-    crawl_config: Optional[CrawlConfig] = None,
-) -> List[str]:
+    targets: Dict[str, Tuple[str, int]],
+    update_info: Optional[Dict],
+    mode: str,
+    crawl_config: Optional[CrawlConfig],
+) -> Dict[str, List[str]]:
     """
-    分批处理消息内容，确保词组标题+至少第一条新闻的完整性
-    
+    一次遍历 report_data，为每个目标生成分批内容
+
     Args:
-        crawl_config: 爬虫配置对象
+        targets: {目标名: (消息格式, 批次字节上限)}
     """
-    if max_bytes is None:
-        if not crawl_config:
-            raise RuntimeError("CrawlConfig 未提供，无法确定批次大小")
-        if format_type == "dingtalk":
-            max_bytes = crawl_config.DINGTALK_BATCH_SIZE
-        elif format_type == "feishu":
-            max_bytes = crawl_config.FEISHU_BATCH_SIZE
-        elif format_type == "ntfy":
-            max_bytes = 3800
-        else:
-            max_bytes = crawl_config.MESSAGE_BATCH_SIZE
-
-    batches = []
-
     total_titles = sum(
         len(stat["titles"]) for stat in report_data["stats"] if stat["count"] > 0
     )
     now = get_beijing_time()
 
-    base_header = ""
-    if format_type == "wework":
-        base_header = f"**总新闻数：** {total_titles}\n\n\n\n"
-    elif format_type == "telegram":
-        base_header = f"总新闻数： {total_titles}\n\n"
-    elif format_type == "ntfy":
-        base_header = f"**总新闻数：** {total_titles}\n\n"
-    elif format_type == "feishu":
-        base_header = ""
-    elif format_type == "dingtalk":
-        base_header = f"**总新闻数：** {total_titles}\n\n"
-        base_header += f"**时间：** {now.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-        base_header += f"**类型：** 热点分析报告\n\n"
-        base_header += "---\n\n"
-
-    base_footer = ""
-    if format_type == "wework":
-        base_footer = f"\n\n\n> 更新时间：{now.strftime('%Y-%m-%d %H:%M:%S')}"
-        if update_info:
-            base_footer += f"\n> TrendRadar 发现新版本 **{update_info['remote_version']}**，当前 **{update_info['current_version']}**"
-    elif format_type == "telegram":
-        base_footer = f"\n\n更新时间：{now.strftime('%Y-%m-%d %H:%M:%S')}"
-        if update_info:
-            base_footer += f"\nTrendRadar 发现新版本 {update_info['remote_version']}，当前 {update_info['current_version']}"
-    elif format_type == "ntfy":
-        base_footer = f"\n\n> 更新时间：{now.strftime('%Y-%m-%d %H:%M:%S')}"
-        if update_info:
-            base_footer += f"\n> TrendRadar 发现新版本 **{update_info['remote_version']}**，当前 **{update_info['current_version']}**"
-    elif format_type == "feishu":
-        base_footer = f"\n\n<font color='grey'>更新时间：{now.strftime('%Y-%m-%d %H:%M:%S')}</font>"
-        if update_info:
-            base_footer += f"\n<font color='grey'>TrendRadar 发现新版本 {update_info['remote_version']}，当前 {update_info['current_version']}</font>"
-    elif format_type == "dingtalk":
-        base_footer = f"\n\n> 更新时间：{now.strftime('%Y-%m-%d %H:%M:%S')}"
-        if update_info:
-            base_footer += f"\n> TrendRadar 发现新版本 **{update_info['remote_version']}**，当前 **{update_info['current_version']}**"
-
-    stats_header = ""
-    if report_data["stats"]:
-        if format_type == "wework":
-            stats_header = f"📊 **热点词汇统计**\n\n"
-        elif format_type == "telegram":
-            stats_header = f"📊 热点词汇统计\n\n"
-        elif format_type == "ntfy":
-            stats_header = f"📊 **热点词汇统计**\n\n"
-        elif format_type == "feishu":
-            stats_header = f"📊 **热点词汇统计**\n\n"
-        elif format_type == "dingtalk":
-            stats_header = f"📊 **热点词汇统计**\n\n"
-
-    current_batch = base_header
-    current_batch_has_content = False
+    # 相同格式的目标共享生成的文本，只在批次大小上不同
+    format_builders: Dict[str, List[_BatchBuilder]] = {}
+    builders: Dict[str, _BatchBuilder] = {}
+    base_headers: Dict[str, Fragment] = {}
+    base_footers: Dict[str, str] = {}
+    for name, (format_type, max_bytes) in targets.items():
+        if format_type not in base_headers:
+            base_headers[format_type] = _fragment(_base_header(format_type, total_titles, now))
+            base_footers[format_type] = _base_footer(format_type, now, update_info)
+        builder = _BatchBuilder(max_bytes, base_headers[format_type], base_footers[format_type])
+        builders[name] = builder
+        format_builders.setdefault(format_type, []).append(builder)
 
     if (
         not report_data["stats"]
@@ -106,384 +281,123 @@ def split_content_into_batches(
         else:
             mode_text = "暂无匹配的热点词汇"
         simple_content = f"📭 {mode_text}\n\n"
-        final_content = base_header + simple_content + base_footer
-        batches.append(final_content)
-        return batches
-
-    # 处理热点词汇统计
-    if report_data["stats"]:
-        total_count = len(report_data["stats"])
-
-        # 添加统计标题
-        test_content = current_batch + stats_header
-        if (
-            len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-            < max_bytes
-        ):
-            current_batch = test_content
-            current_batch_has_content = True
-        else:
-            if current_batch_has_content:
-                batches.append(current_batch + base_footer)
-            current_batch = base_header + stats_header
-            current_batch_has_content = True
-
-        # 逐个处理词组（确保词组标题+第一条新闻的原子性）
-        for i, stat in enumerate(report_data["stats"]):
-            word = stat["word"]
-            count = stat["count"]
+        return {
+            name: [base_headers[format_type][0] + simple_content + base_footers[format_type]]
+            for name, (format_type, _) in targets.items()
+        }
+
+    def feed(format_type: str, fragment: Fragment, prefix: Sequence[Fragment] = ()) -> None:
+        for builder in format_builders[format_type]:
+            builder.append_or_restart(fragment, prefix)
+
+    # 处理热点词汇统计（确保词组标题+第一条新闻的原子性）
+    stats = report_data["stats"]
+    if stats:
+        total_count = len(stats)
+        stats_headers = {format_type: _fragment(_stats_header(format_type)) for format_type in format_builders}
+        for format_type, stats_header in stats_headers.items():
+            feed(format_type, stats_header)
+
+        for i, stat in enumerate(stats):
             sequence_display = f"[{i + 1}/{total_count}]"
-
-            # 构建词组标题
-            word_header = ""
-            if format_type == "wework":
-                if count >= 10:
-                    word_header = (
-                        f"🔥 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                elif count >= 5:
-                    word_header = (
-                        f"📈 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                else:
-                    word_header = f"📌 {sequence_display} **{word}** : {count} 条\n\n"
-            elif format_type == "telegram":
-                if count >= 10:
-                    word_header = f"🔥 {sequence_display} {word} : {count} 条\n\n"
-                elif count >= 5:
-                    word_header = f"📈 {sequence_display} {word} : {count} 条\n\n"
-                else:
-                    word_header = f"📌 {sequence_display} {word} : {count} 条\n\n"
-            elif format_type == "ntfy":
-                if count >= 10:
-                    word_header = (
-                        f"🔥 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                elif count >= 5:
-                    word_header = (
-                        f"📈 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                else:
-                    word_header = f"📌 {sequence_display} **{word}** : {count} 条\n\n"
-            elif format_type == "feishu":
-                if count >= 10:
-                    word_header = f"🔥 <font color='grey'>{sequence_display}</font> **{word}** : <font color='red'>{count}</font> 条\n\n"
-                elif count >= 5:
-                    word_header = f"📈 <font color='grey'>{sequence_display}</font> **{word}** : <font color='orange'>{count}</font> 条\n\n"
-                else:
-                    word_header = f"📌 <font color='grey'>{sequence_display}</font> **{word}** : {count} 条\n\n"
-            elif format_type == "dingtalk":
-                if count >= 10:
-                    word_header = (
-                        f"🔥 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                elif count >= 5:
-                    word_header = (
-                        f"📈 {sequence_display} **{word}** : **{count}** 条\n\n"
-                    )
-                else:
-                    word_header = f"📌 {sequence_display} **{word}** : {count} 条\n\n"
-
-            # 构建第一条新闻
-            first_news_line = ""
-            if stat["titles"]:
-                first_title_data = stat["titles"][0]
-                if format_type == "wework":
-                    formatted_title = format_title_for_platform(
-                        "wework", first_title_data, show_source=True
-                    )
-                elif format_type == "telegram":
-                    formatted_title = format_title_for_platform(
-                        "telegram", first_title_data, show_source=True
-                    )
-                elif format_type == "ntfy":
-                    formatted_title = format_title_for_platform(
-                        "ntfy", first_title_data, show_source=True
-                    )
-                elif format_type == "feishu":
-                    formatted_title = format_title_for_platform(
-                        "feishu", first_title_data, show_source=True
-                    )
-                elif format_type == "dingtalk":
-                    formatted_title = format_title_for_platform(
-                        "dingtalk", first_title_data, show_source=True
-                    )
-                else:
-                    formatted_title = f"{first_title_data['title']}"
-
-                first_news_line = f"  1. {formatted_title}\n"
-                if len(stat["titles"]) > 1:
-                    first_news_line += "\n"
-
-            # 原子性检查：词组标题+第一条新闻必须一起处理
-            word_with_first_news = word_header + first_news_line
-            test_content = current_batch + word_with_first_news
-
-            if (
-                len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                >= max_bytes
-            ):
-                # 当前批次容纳不下，开启新批次
-                if current_batch_has_content:
-                    batches.append(current_batch + base_footer)
-                current_batch = base_header + stats_header + word_with_first_news
-                current_batch_has_content = True
-                start_index = 1
-            else:
-                current_batch = test_content
-                current_batch_has_content = True
-                start_index = 1
-
-            # 处理剩余新闻条目
-            for j in range(start_index, len(stat["titles"])):
-                title_data = stat["titles"][j]
-                if format_type == "wework":
-                    formatted_title = format_title_for_platform(
-                        "wework", title_data, show_source=True
-                    )
-                elif format_type == "telegram":
-                    formatted_title = format_title_for_platform(
-                        "telegram", title_data, show_source=True
-                    )
-                elif format_type == "ntfy":
-                    formatted_title = format_title_for_platform(
-                        "ntfy", title_data, show_source=True
-                    )
-                elif format_type == "feishu":
-                    formatted_title = format_title_for_platform(
-                        "feishu", title_data, show_source=True
-                    )
-                elif format_type == "dingtalk":
-                    formatted_title = format_title_for_platform(
-                        "dingtalk", title_data, show_source=True
-                    )
-                else:
-                    formatted_title = f"{title_data['title']}"
-
-                news_line = f"  {j + 1}. {formatted_title}\n"
-                if j < len(stat["titles"]) - 1:
-                    news_line += "\n"
-
-                test_content = current_batch + news_line
-                if (
-                    len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                    >= max_bytes
-                ):
-                    if current_batch_has_content:
-                        batches.append(current_batch + base_footer)
-                    current_batch = base_header + stats_header + word_header + news_line
-                    current_batch_has_content = True
-                else:
-                    current_batch = test_content
-                    current_batch_has_content = True
-
-            # 词组间分隔符
-            if i < len(report_data["stats"]) - 1:
-                separator = ""
-                if format_type == "wework":
-                    separator = f"\n\n\n\n"
-                elif format_type == "telegram":
-                    separator = f"\n\n"
-                elif format_type == "ntfy":
-                    separator = f"\n\n"
-                elif format_type == "feishu":
-                    if not crawl_config:
-                        raise RuntimeError("CrawlConfig 未提供，无法获取分隔符")
-                    separator = f"\n{crawl_config.FEISHU_MESSAGE_SEPARATOR}\n\n"
-                elif format_type == "dingtalk":
-                    separator = f"\n---\n\n"
-
-                test_content = current_batch + separator
-                if (
-                    len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                    < max_bytes
-                ):
-                    current_batch = test_content
+            titles = stat["titles"]
+            for format_type, stats_header in stats_headers.items():
+                word_header = _fragment(_word_header(format_type, sequence_display, stat["word"], stat["count"]))
+
+                # 词组标题+第一条新闻必须一起处理
+                first_news_line = ""
+                if titles:
+                    first_news_line = f"  1. {_format_stat_title(format_type, titles[0])}\n"
+                    if len(titles) > 1:
+                        first_news_line += "\n"
+                feed(format_type, _fragment(word_header[0] + first_news_line), (stats_header,))
+
+                for j in range(1, len(titles)):
+                    news_line = f"  {j + 1}. {_format_stat_title(format_type, titles[j])}\n"
+                    if j < len(titles) - 1:
+                        news_line += "\n"
+                    feed(format_type, _fragment(news_line), (stats_header, word_header))
+
+                # 词组间分隔符（放不下时省略）
+                if i < total_count - 1:
+                    separator = _fragment(_group_separator(format_type, crawl_config))
+                    for builder in format_builders[format_type]:
+                        if builder.fits(separator[1]):
+                            builder.append(separator, content=False)
 
     # 处理新增新闻（同样确保来源标题+第一条新闻的原子性）
     if report_data["new_titles"]:
-        new_header = ""
-        if format_type == "wework":
-            new_header = f"\n\n\n\n🆕 **本次新增热点新闻** (共 {report_data['total_new_count']} 条)\n\n"
-        elif format_type == "telegram":
-            new_header = (
-                f"\n\n🆕 本次新增热点新闻 (共 {report_data['total_new_count']} 条)\n\n"
-            )
-        elif format_type == "ntfy":
-            new_header = f"\n\n🆕 **本次新增热点新闻** (共 {report_data['total_new_count']} 条)\n\n"
-        elif format_type == "feishu":
-            if not crawl_config:
-                raise RuntimeError("CrawlConfig 未提供，无法获取分隔符")
-            new_header = f"\n{crawl_config.FEISHU_MESSAGE_SEPARATOR}\n\n🆕 **本次新增热点新闻** (共 {report_data['total_new_count']} 条)\n\n"
-        elif format_type == "dingtalk":
-            new_header = f"\n---\n\n🆕 **本次新增热点新闻** (共 {report_data['total_new_count']} 条)\n\n"
-
-        test_content = current_batch + new_header
-        if (
-            len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-            >= max_bytes
-        ):
-            if current_batch_has_content:
-                batches.append(current_batch + base_footer)
-            current_batch = base_header + new_header
-            current_batch_has_content = True
-        else:
-            current_batch = test_content
-            current_batch_has_content = True
-
-        # 逐个处理新增新闻来源
-        for source_data in report_data["new_titles"]:
-            source_header = ""
-            if format_type == "wework":
-                source_header = f"**{source_data['source_name']}** ({len(source_data['titles'])} 条):\n\n"
-            elif format_type == "telegram":
-                source_header = f"{source_data['source_name']} ({len(source_data['titles'])} 条):\n\n"
-            elif format_type == "ntfy":
-                source_header = f"**{source_data['source_name']}** ({len(source_data['titles'])} 条):\n\n"
-            elif format_type == "feishu":
-                source_header = f"**{source_data['source_name']}** ({len(source_data['titles'])} 条):\n\n"
-            elif format_type == "dingtalk":
-                source_header = f"**{source_data['source_name']}** ({len(source_data['titles'])} 条):\n\n"
-
-            # 构建第一条新增新闻
-            first_news_line = ""
-            if source_data["titles"]:
-                first_title_data = source_data["titles"][0]
-                title_data_copy = first_title_data.copy()
-                title_data_copy["is_new"] = False
-
-                if format_type == "wework":
-                    formatted_title = format_title_for_platform(
-                        "wework", title_data_copy, show_source=False
-                    )
-                elif format_type == "telegram":
-                    formatted_title = format_title_for_platform(
-                        "telegram", title_data_copy, show_source=False
-                    )
-                elif format_type == "feishu":
-                    formatted_title = format_title_for_platform(
-                        "feishu", title_data_copy, show_source=False
-                    )
-                elif format_type == "dingtalk":
-                    formatted_title = format_title_for_platform(
-                        "dingtalk", title_data_copy, show_source=False
-                    )
-                else:
-                    formatted_title = f"{title_data_copy['title']}"
-
-                first_news_line = f"  1. {formatted_title}\n"
-
-            # 原子性检查：来源标题+第一条新闻
-            source_with_first_news = source_header + first_news_line
-            test_content = current_batch + source_with_first_news
-
-            if (
-                len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                >= max_bytes
-            ):
-                if current_batch_has_content:
-                    batches.append(current_batch + base_footer)
-                current_batch = base_header + new_header + source_with_first_news
-                current_batch_has_content = True
-                start_index = 1
-            else:
-                current_batch = test_content
-                current_batch_has_content = True
-                start_index = 1
-
-            # 处理剩余新增新闻
-            for j in range(start_index, len(source_data["titles"])):
-                title_data = source_data["titles"][j]
-                title_data_copy = title_data.copy()
-                title_data_copy["is_new"] = False
-
-                if format_type == "wework":
-                    formatted_title = format_title_for_platform(
-                        "wework", title_data_copy, show_source=False
-                    )
-                elif format_type == "telegram":
-                    formatted_title = format_title_for_platform(
-                        "telegram", title_data_copy, show_source=False
-                    )
-                elif format_type == "feishu":
-                    formatted_title = format_title_for_platform(
-                        "feishu", title_data_copy, show_source=False
-                    )
-                elif format_type == "dingtalk":
-                    formatted_title = format_title_for_platform(
-                        "dingtalk", title_data_copy, show_source=False
-                    )
-                else:
-                    formatted_title = f"{title_data_copy['title']}"
-
-                news_line = f"  {j + 1}. {formatted_title}\n"
-
-                test_content = current_batch + news_line
-                if (
-                    len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                    >= max_bytes
-                ):
-                    if current_batch_has_content:
-                        batches.append(current_batch + base_footer)
-                    current_batch = base_header + new_header + source_header + news_line
-                    current_batch_has_content = True
-                else:
-                    current_batch = test_content
-                    current_batch_has_content = True
-
-            current_batch += "\n"
+        for format_type in format_builders:
+            new_header = _fragment(_new_header(format_type, report_data["total_new_count"], crawl_config))
+            feed(format_type, new_header)
+
+            for source_data in report_data["new_titles"]:
+                source_titles = source_data["titles"]
+                source_header = _fragment(
+                    _source_header(format_type, source_data["source_name"], len(source_titles))
+                )
+
+                first_news_line = ""
+                if source_titles:
+                    first_news_line = f"  1. {_format_new_title(format_type, source_titles[0])}\n"
+                feed(format_type, _fragment(source_header[0] + first_news_line), (new_header,))
+
+                for j in range(1, len(source_titles)):
+                    news_line = f"  {j + 1}. {_format_new_title(format_type, source_titles[j])}\n"
+                    feed(format_type, _fragment(news_line), (new_header, source_header))
+
+                for builder in format_builders[format_type]:
+                    builder.append(("\n", 1), content=False)
 
     if report_data["failed_ids"]:
-        failed_header = ""
-        if format_type == "wework":
-            failed_header = f"\n\n\n\n⚠️ **数据获取失败的平台：**\n\n"
-        elif format_type == "telegram":
-            failed_header = f"\n\n⚠️ 数据获取失败的平台：\n\n"
-        elif format_type == "ntfy":
-            failed_header = f"\n\n⚠️ **数据获取失败的平台：**\n\n"
-        elif format_type == "feishu":
-            if not crawl_config:
-                raise RuntimeError("CrawlConfig 未提供，无法获取分隔符")
-            failed_header = f"\n{crawl_config.FEISHU_MESSAGE_SEPARATOR}\n\n⚠️ **数据获取失败的平台：**\n\n"
-        elif format_type == "dingtalk":
-            failed_header = f"\n---\n\n⚠️ **数据获取失败的平台：**\n\n"
-
-        test_content = current_batch + failed_header
-        if (
-            len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-            >= max_bytes
-        ):
-            if current_batch_has_content:
-                batches.append(current_batch + base_footer)
-            current_batch = base_header + failed_header
-            current_batch_has_content = True
-        else:
-            current_batch = test_content
-            current_batch_has_content = True
-
-        for i, id_value in enumerate(report_data["failed_ids"], 1):
-            if format_type == "feishu":
-                failed_line = f"  • <font color='red'>{id_value}</font>\n"
-            elif format_type == "dingtalk":
-                failed_line = f"  • **{id_value}**\n"
-            else:
-                failed_line = f"  • {id_value}\n"
-
-            test_content = current_batch + failed_line
-            if (
-                len(test_content.encode("utf-8")) + len(base_footer.encode("utf-8"))
-                >= max_bytes
-            ):
-                if current_batch_has_content:
-                    batches.append(current_batch + base_footer)
-                current_batch = base_header + failed_header + failed_line
-                current_batch_has_content = True
-            else:
-                current_batch = test_content
-                current_batch_has_content = True
-
-    # 完成最后批次
-    if current_batch_has_content:
-        batches.append(current_batch + base_footer)
-
-    return batches
\ No newline at end of file
+        for format_type in format_builders:
+            failed_header = _fragment(_failed_header(format_type, crawl_config))
+            feed(format_type, failed_header)
+            for id_value in report_data["failed_ids"]:
+                feed(format_type, _fragment(_failed_line(format_type, id_value)), (failed_header,))
+
+    return {name: builder.finish() for name, builder in builders.items()}
+
+
+def split_content_into_batches(
+    report_data: Dict,
+    format_type: str,
+    update_info: Optional[Dict] = None,
+    max_bytes: int = None,
+    mode: str = "daily",
+    crawl_config: Optional[CrawlConfig] = None,
+) -> List[str]:
+    """
+    分批处理消息内容，确保词组标题+至少第一条新闻的完整性
+
+    Args:
+        crawl_config: 爬虫配置对象
+    """
+    max_bytes = _resolve_max_bytes(format_type, max_bytes, crawl_config)
+    return _split_batches(
+        report_data, {format_type: (format_type, max_bytes)}, update_info, mode, crawl_config
+    )[format_type]
+
+
+def split_content_for_channels(
+    report_data: Dict,
+    channels: Sequence[str],
+    update_info: Optional[Dict] = None,
+    mode: str = "daily",
+    crawl_config: Optional[CrawlConfig] = None,
+) -> Dict[str, List[str]]:
+    """
+    一次遍历为多个通知渠道分批，结果与各发送器单独调用 split_content_into_batches 相同
+
+    Args:
+        channels: 渠道名列表（见 CHANNEL_BATCH_FORMATS）
+        crawl_config: 爬虫配置对象
+    """
+    if not crawl_config:
+        raise RuntimeError("CrawlConfig 未提供，无法确定批次大小")
+    targets = {}
+    for channel in channels:
+        format_type = CHANNEL_BATCH_FORMATS[channel]
+        max_bytes = crawl_config.BARK_BATCH_SIZE if channel == "bark" else None
+        targets[channel] = (format_type, _resolve_max_bytes(format_type, max_bytes, crawl_config))
+    return _split_batches(report_data, targets, update_info, mode, crawl_config)
@@ -4,12 +4,11 @@
 用于发送消息到 钉钉 平台
 """
 import time
-from typing import Dict, Optional
-
-import requests
+from typing import Dict, List, Optional
 
 from crawl_server.configs import CrawlConfig
 from crawl_server.core.connections.batch_utils import split_content_into_batches
+from crawl_server.core.utils.http_utils import get_http_session
 
 def send_to_dingtalk(
     webhook_url: str,
@@ -19,12 +18,14 @@ def send_to_dingtalk(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     crawl_config: Optional[CrawlConfig] = None,
+    batches: Optional[List[str]] = None,
 ) -> bool:
     """
     发送到钉钉（支持分批发送）
     
     Args:
         crawl_config: 爬虫配置对象
+        batches: 预先分好的批次内容（为 None 时按本渠道格式分批）
     """
     if not crawl_config:
         raise RuntimeError("CrawlConfig 未提供，无法发送到钉钉")
@@ -35,14 +36,15 @@ def send_to_dingtalk(
         proxies = {"http": proxy_url, "https": proxy_url}
 
     # 获取分批内容，使用钉钉专用的批次大小
-    batches = split_content_into_batches(
-        report_data,
-        "dingtalk",
-        update_info,
-        max_bytes=crawl_config.DINGTALK_BATCH_SIZE,
-        mode=mode,
-        crawl_config=crawl_config,
-    )
+    if batches is None:
+        batches = split_content_into_batches(
+            report_data,
+            "dingtalk",
+            update_info,
+            max_bytes=crawl_config.DINGTALK_BATCH_SIZE,
+            mode=mode,
+            crawl_config=crawl_config,
+        )
 
     print(f"钉钉消息分为 {len(batches)} 批次发送 [{report_type}]")
 
@@ -74,7 +76,7 @@ def send_to_dingtalk(
         }
 
         try:
-            response = requests.post(
+            response = get_http_session(webhook_url, proxy_url).post(
                 webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
             )
             if response.status_code == 200:
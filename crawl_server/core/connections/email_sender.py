@@ -3,17 +3,51 @@
 
 用于发送邮件通知
 """
+import os
 import smtplib
+import threading
+from email import encoders
+from email.mime.base import MIMEBase
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.header import Header
 from email.utils import formataddr, formatdate, make_msgid
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from crawl_server.configs import SMTP_CONFIGS
+from crawl_server.core.connections.smtp_client import get_smtp_pool
 from crawl_server.core.utils import get_beijing_time
 
+# 最近一次编码的 HTML 邮件正文：((路径, mtime_ns, 大小), MIME 部分)
+_html_part_cache: Optional[Tuple[Tuple[str, int, int], MIMEBase]] = None
+_html_part_lock = threading.Lock()
+
+
+def _get_html_part(html_file_path: str) -> MIMEBase:
+    """
+    读取 HTML 报告并编码为 base64 的 MIME 部分（与 MIMEText(html, "html", "utf-8") 一致）
+
+    按文件的 mtime 和大小缓存，同一份报告重试或再次发送时不再重新读取和编码
+    """
+    global _html_part_cache
+    stat = os.stat(html_file_path)
+    cache_key = (os.path.abspath(html_file_path), stat.st_mtime_ns, stat.st_size)
+    with _html_part_lock:
+        if _html_part_cache is not None and _html_part_cache[0] == cache_key:
+            return _html_part_cache[1]
+
+    # 报告文件本身就是 UTF-8，直接对字节做 base64，省去解码再编码
+    with open(html_file_path, "rb") as f:
+        html_part = MIMEBase("text", "html", charset="utf-8")
+        html_part.set_payload(f.read())
+    encoders.encode_base64(html_part)
+
+    with _html_part_lock:
+        _html_part_cache = (cache_key, html_part)
+    return html_part
+
+
 def send_to_email(
     from_email: str,
     password: str,
@@ -30,8 +64,7 @@ def send_to_email(
             return False
 
         print(f"使用HTML文件: {html_file_path}")
-        with open(html_file_path, "r", encoding="utf-8") as f:
-            html_content = f.read()
+        html_part = _get_html_part(html_file_path)
 
         domain = from_email.split("@")[-1].lower()
 
@@ -94,7 +127,6 @@ TrendRadar 热点分析报告
         text_part = MIMEText(text_content, "plain", "utf-8")
         msg.attach(text_part)
 
-        html_part = MIMEText(html_content, "html", "utf-8")
         msg.attach(html_part)
 
         print(f"正在发送邮件到 {to_email}...")
@@ -102,25 +134,8 @@ TrendRadar 热点分析报告
         print(f"发件人: {from_email}")
 
         try:
-            if use_tls:
-                # TLS 模式
-                server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
-                server.set_debuglevel(0)  # 设为1可以查看详细调试信息
-                server.ehlo()
-                server.starttls()
-                server.ehlo()
-            else:
-                # SSL 模式
-                server = smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=30)
-                server.set_debuglevel(0)
-                server.ehlo()
-
-            # 登录
-            server.login(from_email, password)
-
-            # 发送邮件
-            server.send_message(msg)
-            server.quit()
+            # 复用已登录的连接（NOOP 检查失败或发送时断开会自动重连）
+            get_smtp_pool().send_message(smtp_server, smtp_port, use_tls, from_email, password, msg)
 
             print(f"邮件发送成功 [{report_type}] -> {to_email}")
             return True
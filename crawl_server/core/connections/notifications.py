@@ -3,10 +3,13 @@
 
 统一管理所有通知平台的发送
 """
-from typing import Dict, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 
 from crawl_server.configs import CrawlConfig
 from crawl_server.core.connections.bark_sender import send_to_bark
+from crawl_server.core.connections.batch_utils import split_content_for_channels
 from crawl_server.core.connections.dingtalk_sender import send_to_dingtalk
 from crawl_server.core.connections.email_sender import send_to_email
 from crawl_server.core.connections.feishu_sender import send_to_feishu
@@ -16,6 +19,62 @@ from crawl_server.core.connections.wework_sender import send_to_wework
 from crawl_server.core.connections.push_manager import PushRecordManager
 from crawl_server.core.utils import get_beijing_time, prepare_report_data
 
+
+def _timed_send(name: str, send: Callable[[], bool]) -> Tuple[bool, float]:
+    """执行单个渠道的发送，返回 (是否成功, 耗时秒数)，异常视为发送失败"""
+    start = time.perf_counter()
+    try:
+        success = bool(send())
+    except Exception as e:
+        print(f"{name} 通知发送出错：{e}")
+        success = False
+    return success, time.perf_counter() - start
+
+
+def _dispatch_channels(channels: List[Tuple[str, Callable[[], bool]]]) -> Dict[str, bool]:
+    """并发发送各渠道通知，结果按渠道顺序返回，并输出各渠道耗时"""
+    if not channels:
+        return {}
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(channels), thread_name_prefix="notify") as executor:
+        futures = [(name, executor.submit(_timed_send, name, send)) for name, send in channels]
+        outcomes = [(name, future.result()) for name, future in futures]
+
+    results = {}
+    timings = []
+    for name, (success, elapsed) in outcomes:
+        results[name] = success
+        timings.append(f"{name} {'成功' if success else '失败'} {elapsed:.2f}s")
+    print(f"通知发送完成，总耗时 {time.perf_counter() - start:.2f}s：{'，'.join(timings)}")
+    return results
+
+
+def push_window_allows(crawl_config: CrawlConfig) -> bool:
+    """推送窗口控制：当前是否允许推送（未启用推送窗口时始终允许），不允许时输出原因"""
+    if not crawl_config.PUSH_WINDOW.ENABLED:
+        return True
+
+    push_manager = PushRecordManager(crawl_config=crawl_config)
+    time_range_start = crawl_config.PUSH_WINDOW.TIME_RANGE.START
+    time_range_end = crawl_config.PUSH_WINDOW.TIME_RANGE.END
+
+    if not push_manager.is_in_time_range(time_range_start, time_range_end):
+        now = get_beijing_time()
+        print(
+            f"推送窗口控制：当前时间 {now.strftime('%H:%M')} 不在推送时间窗口 {time_range_start}-{time_range_end} 内，跳过推送"
+        )
+        return False
+
+    if crawl_config.PUSH_WINDOW.ONCE_PER_DAY:
+        if push_manager.has_pushed_today():
+            print(f"推送窗口控制：今天已推送过，跳过本次推送")
+            return False
+        else:
+            print(f"推送窗口控制：今天首次推送")
+    return True
+
+
 def send_to_notifications(
     stats: List[Dict],
     failed_ids: Optional[List] = None,
@@ -27,36 +86,29 @@ def send_to_notifications(
     mode: str = "daily",
     html_file_path: Optional[str] = None,
     crawl_config: Optional[CrawlConfig] = None,
+    only_channels: Optional[List[str]] = None,
+    check_push_window: bool = True,
+    record_push: bool = True,
 ) -> Dict[str, bool]:
     """
     发送数据到多个通知平台
     
+    各渠道并发发送，单个渠道的慢请求和分批间隔不再拖慢其它渠道；
+    返回 {渠道: 是否成功}，顺序与配置顺序一致
+    
     Args:
         crawl_config: 爬虫配置对象
+        only_channels: 只发送这些渠道（None 表示所有已配置渠道，通知队列重试失败渠道时使用）
+        check_push_window: 是否检查推送窗口（通知队列在入队时已检查，发送时不再检查）
+        record_push: 发送成功时是否记录推送（通知队列只在任务第一次有渠道成功时记录）
     """
     if not crawl_config:
         raise RuntimeError("CrawlConfig 未提供，无法发送通知")
     
     results = {}
 
-    if crawl_config.PUSH_WINDOW.ENABLED:
-        push_manager = PushRecordManager(crawl_config=crawl_config)
-        time_range_start = crawl_config.PUSH_WINDOW.TIME_RANGE.START
-        time_range_end = crawl_config.PUSH_WINDOW.TIME_RANGE.END
-
-        if not push_manager.is_in_time_range(time_range_start, time_range_end):
-            now = get_beijing_time()
-            print(
-                f"推送窗口控制：当前时间 {now.strftime('%H:%M')} 不在推送时间窗口 {time_range_start}-{time_range_end} 内，跳过推送"
-            )
-            return results
-
-        if crawl_config.PUSH_WINDOW.ONCE_PER_DAY:
-            if push_manager.has_pushed_today():
-                print(f"推送窗口控制：今天已推送过，跳过本次推送")
-                return results
-            else:
-                print(f"推送窗口控制：今天首次推送")
+    if check_push_window and not push_window_allows(crawl_config):
+        return results
 
     report_data = prepare_report_data(stats, failed_ids, new_titles, id_to_name, mode, crawl_config=crawl_config)
 
@@ -77,27 +129,53 @@ def send_to_notifications(
 
     update_info_to_send = update_info if crawl_config.SHOW_VERSION_UPDATE else None
 
+    # 已配置的消息渠道一次遍历 report_data 完成分批，发送器直接使用
+    batch_channels = [
+        name
+        for name, enabled in (
+            ("feishu", feishu_url),
+            ("dingtalk", dingtalk_url),
+            ("wework", wework_url),
+            ("telegram", telegram_token and telegram_chat_id),
+            ("ntfy", ntfy_server_url and ntfy_topic),
+            ("bark", bark_url),
+        )
+        if enabled and (only_channels is None or name in only_channels)
+    ]
+    channel_batches = split_content_for_channels(
+        report_data, batch_channels, update_info_to_send, mode, crawl_config=crawl_config
+    )
+
+    # 各渠道的发送任务（按配置顺序），每个渠道在自己的线程内按顺序分批发送并遵守发送间隔
+    channels: List[Tuple[str, Callable[[], bool]]] = []
+
     # 发送到飞书
     if feishu_url:
-        results["feishu"] = send_to_feishu(
-            feishu_url, report_data, report_type, update_info_to_send, proxy_url, mode, crawl_config=crawl_config
-        )
+        channels.append(("feishu", lambda: send_to_feishu(
+            feishu_url, report_data, report_type, update_info_to_send, proxy_url, mode,
+            crawl_config=crawl_config,
+            batches=channel_batches["feishu"],
+        )))
 
     # 发送到钉钉
     if dingtalk_url:
-        results["dingtalk"] = send_to_dingtalk(
-            dingtalk_url, report_data, report_type, update_info_to_send, proxy_url, mode, crawl_config=crawl_config
-        )
+        channels.append(("dingtalk", lambda: send_to_dingtalk(
+            dingtalk_url, report_data, report_type, update_info_to_send, proxy_url, mode,
+            crawl_config=crawl_config,
+            batches=channel_batches["dingtalk"],
+        )))
 
     # 发送到企业微信
     if wework_url:
-        results["wework"] = send_to_wework(
-            wework_url, report_data, report_type, update_info_to_send, proxy_url, mode, crawl_config=crawl_config
-        )
+        channels.append(("wework", lambda: send_to_wework(
+            wework_url, report_data, report_type, update_info_to_send, proxy_url, mode,
+            crawl_config=crawl_config,
+            batches=channel_batches["wework"],
+        )))
 
     # 发送到 Telegram
     if telegram_token and telegram_chat_id:
-        results["telegram"] = send_to_telegram(
+        channels.append(("telegram", lambda: send_to_telegram(
             telegram_token,
             telegram_chat_id,
             report_data,
@@ -106,11 +184,12 @@ def send_to_notifications(
             proxy_url,
             mode,
             crawl_config=crawl_config,
-        )
+            batches=channel_batches["telegram"],
+        )))
 
     # 发送到 ntfy
     if ntfy_server_url and ntfy_topic:
-        results["ntfy"] = send_to_ntfy(
+        channels.append(("ntfy", lambda: send_to_ntfy(
             ntfy_server_url,
             ntfy_topic,
             ntfy_token,
@@ -120,11 +199,12 @@ def send_to_notifications(
             proxy_url,
             mode,
             crawl_config=crawl_config,
-        )
+            batches=channel_batches["ntfy"],
+        )))
 
     # 发送到 Bark
     if bark_url:
-        results["bark"] = send_to_bark(
+        channels.append(("bark", lambda: send_to_bark(
             bark_url,
             report_data,
             report_type,
@@ -132,11 +212,12 @@ def send_to_notifications(
             proxy_url,
             mode,
             crawl_config=crawl_config,
-        )
+            batches=channel_batches["bark"],
+        )))
 
     # 发送邮件
     if email_from and email_password and email_to:
-        results["email"] = send_to_email(
+        channels.append(("email", lambda: send_to_email(
             email_from,
             email_password,
             email_to,
@@ -144,14 +225,20 @@ def send_to_notifications(
             html_file_path,
             email_smtp_server,
             email_smtp_port,
-        )
+        )))
+
+    if only_channels is not None:
+        channels = [(name, send) for name, send in channels if name in only_channels]
+
+    results = _dispatch_channels(channels)
 
     if not results:
         print("未配置任何通知渠道，跳过通知发送")
 
     # 如果成功发送了任何通知，且启用了每天只推一次，则记录推送
     if (
-        crawl_config.PUSH_WINDOW.ENABLED
+        record_push
+        and crawl_config.PUSH_WINDOW.ENABLED
         and crawl_config.PUSH_WINDOW.ONCE_PER_DAY
         and any(results.values())
     ):
@@ -0,0 +1,264 @@
+"""
+通知发送队列
+
+通知任务写入本地持久化队列（output/notify_queue/pending，每个任务一个 JSON 文件）后立即返回，
+由后台线程发送；部分渠道失败时只重试失败的渠道（指数退避），超过最大尝试次数后移入 dead 目录。
+进程重启后未完成的任务会继续发送。
+
+HTML 报告在入队时保存一份到任务旁（<任务ID>.html），重试时发送的是失败那次的报告，
+而不是之后被覆盖的新报告；任务完成或移入 dead 目录时随任务一起删除或移动。
+
+推送窗口只在入队时判断一次，不在窗口内的通知不入队；重试只补发失败的渠道，
+"每天只推一次"的推送记录只在任务第一次有渠道发送成功时写入。
+同一报告类型有更新的任务入队后，尚未完成的旧任务直接丢弃，积压时不会补发过时的报告。
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+from crawl_server.configs import CrawlConfig
+from crawl_server.core.connections.notifications import push_window_allows, send_to_notifications
+from crawl_server.core.data.retry_queue import backoff_delay
+from crawl_server.core.utils import json_loads, link_or_copy_file
+
+NOTIFY_QUEUE_DIR = Path("output") / "notify_queue"
+NOTIFY_JOB_VERSION = 1
+
+
+class NotifyQueue:
+    """文件持久化的通知队列 + 后台发送线程"""
+
+    def __init__(self, crawl_config: CrawlConfig, queue_dir: Path = NOTIFY_QUEUE_DIR):
+        """
+        初始化通知队列
+
+        Args:
+            crawl_config: 爬虫配置对象（发送和重试参数）
+            queue_dir: 队列目录
+        """
+        self.crawl_config = crawl_config
+        self.pending_dir = Path(queue_dir) / "pending"
+        self.dead_dir = Path(queue_dir) / "dead"
+        self.pending_dir.mkdir(parents=True, exist_ok=True)
+        self.dead_dir.mkdir(parents=True, exist_ok=True)
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """启动后台发送线程（已启动时忽略），之前未完成的任务会继续发送"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="notify-worker", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """停止后台线程：先尝试发送已到期的任务，超时后未完成的任务留在队列中，下次启动时继续"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        thread.join(timeout)
+        if thread.is_alive():
+            print(f"通知队列：{timeout:.0f} 秒内未发送完，剩余任务将在下次启动时继续")
+
+    def enqueue(self, payload: Dict) -> Optional[str]:
+        """
+        写入一个通知任务并唤醒发送线程，返回任务 ID（不在推送窗口内时不入队，返回 None）
+
+        Args:
+            payload: send_to_notifications 的参数（需可 JSON 序列化）
+        """
+        if not push_window_allows(self.crawl_config):
+            return None
+
+        job_id = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"  # 文件名按入队顺序排序
+        job_path = self.pending_dir / f"{job_id}.json"
+        html_path = self._html_path(job_path)
+
+        # 报告文件每次抓取都会被覆盖（原子替换），入队时保存当前这份
+        html_file_path = payload.get("html_file_path")
+        has_html = bool(html_file_path) and os.path.exists(html_file_path)
+        if has_html:
+            link_or_copy_file(html_file_path, str(html_path))
+
+        job = {
+            "version": NOTIFY_JOB_VERSION,
+            "id": job_id,
+            "created_at": time.time(),
+            "attempts": 0,
+            "next_attempt_at": 0.0,
+            "channels": None,  # None 表示所有已配置渠道，重试时只包含失败的渠道
+            "last_results": {},
+            "has_html": has_html,  # 发送时使用任务旁保存的 HTML 报告
+            "pushed": False,  # 是否已有渠道发送成功（已写入推送记录）
+            "payload": payload,
+        }
+        try:
+            self._write_job(job_path, job)
+        except BaseException:
+            html_path.unlink(missing_ok=True)
+            raise
+        self._wakeup.set()
+        self.start()
+        return job_id
+
+    def pending_count(self) -> int:
+        return sum(1 for _ in self.pending_dir.glob("*.json"))
+
+    @staticmethod
+    def _html_path(job_path: Path) -> Path:
+        return job_path.with_suffix(".html")
+
+    @staticmethod
+    def _write_job(path: Path, job: Dict) -> None:
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(job, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _run(self) -> None:
+        while True:
+            wait = self._process_due()
+            if self._stopping.is_set():
+                return
+            self._wakeup.wait(wait)
+            self._wakeup.clear()
+
+    def _process_due(self) -> Optional[float]:
+        """按入队顺序发送所有已到期的任务，返回距下一个任务到期的秒数（没有待重试任务时为 None）"""
+        jobs = []
+        for path in sorted(self.pending_dir.glob("*.json")):
+            try:
+                with open(path, "rb") as f:
+                    jobs.append((path, json_loads(f.read())))
+            except (OSError, ValueError) as e:
+                print(f"通知队列：任务文件无法读取，移入 dead 目录: {path.name} ({e})")
+                self._move_to_dead(path)
+
+        # 同一报告类型只保留最新的任务，旧任务（包括等待重试的）已被新报告取代
+        latest: Dict[str, str] = {}
+        for path, job in jobs:
+            latest[job["payload"].get("report_type")] = job["id"]
+
+        next_wait: Optional[float] = None
+        for path, job in jobs:
+            if latest[job["payload"].get("report_type")] != job["id"]:
+                print(f"通知队列：任务 {job['id']} 已被更新的同类报告取代，丢弃")
+                self._remove(path)
+                continue
+
+            wait = job.get("next_attempt_at", 0.0) - time.time()
+            if wait > 0:
+                next_wait = wait if next_wait is None else min(next_wait, wait)
+                continue
+            retry_in = self._deliver(path, job)
+            if retry_in is not None:
+                next_wait = retry_in if next_wait is None else min(next_wait, retry_in)
+        return next_wait
+
+    def _deliver(self, path: Path, job: Dict) -> Optional[float]:
+        """发送一个任务，需要重试时返回退避时间（秒）"""
+        attempts = job.get("attempts", 0)
+        pushed = job.get("pushed", attempts > 0)
+        payload = job["payload"]
+        if job.get("has_html"):
+            payload = dict(payload, html_file_path=str(self._html_path(path)))
+        try:
+            # 推送窗口已在入队时判断；推送记录只在第一次有渠道成功时写入
+            results = send_to_notifications(
+                **payload,
+                only_channels=job.get("channels"),
+                check_push_window=False,
+                record_push=not pushed,
+                crawl_config=self.crawl_config,
+            )
+            failed = [channel for channel, success in results.items() if not success]
+        except Exception as e:
+            print(f"通知队列：任务 {job['id']} 发送出错: {e}")
+            results = {}
+            failed = job.get("channels")  # 本次要发送的渠道全部重试
+
+        if failed is not None and not failed:
+            self._remove(path)
+            return None
+
+        attempts += 1
+        job["attempts"] = attempts
+        job["pushed"] = pushed or any(results.values())
+        job["channels"] = failed
+        job["last_results"] = results
+        failed_text = ", ".join(failed) if failed else "全部渠道"
+        if attempts >= self.crawl_config.NOTIFY_MAX_ATTEMPTS:
+            print(f"通知队列：任务 {job['id']} 已尝试 {attempts} 次，{failed_text} 仍失败，移入 dead 目录")
+            self._write_job(path, job)
+            self._move_to_dead(path)
+            return None
+
+        delay = backoff_delay(
+            attempts,
+            self.crawl_config.NOTIFY_RETRY_BASE_DELAY,
+            self.crawl_config.NOTIFY_RETRY_MAX_DELAY,
+        )
+        job["next_attempt_at"] = time.time() + delay
+        self._write_job(path, job)
+        print(f"通知队列：任务 {job['id']} {failed_text} 发送失败，{delay:.0f} 秒后重试（第 {attempts} 次）")
+        return delay
+
+    def _remove(self, path: Path) -> None:
+        path.unlink(missing_ok=True)
+        self._html_path(path).unlink(missing_ok=True)
+
+    def _move_to_dead(self, path: Path) -> None:
+        html_path = self._html_path(path)
+        try:
+            if html_path.exists():
+                os.replace(html_path, self.dead_dir / html_path.name)
+            os.replace(path, self.dead_dir / path.name)
+        except OSError as e:
+            print(f"通知队列：移入 dead 目录失败: {e}")
+
+
+# 进程级共享实例
+_notify_queue_instance: Optional[NotifyQueue] = None
+_notify_queue_lock = threading.Lock()
+
+
+def get_notify_queue(crawl_config: CrawlConfig) -> NotifyQueue:
+    """获取进程级共享的通知队列（首次调用时创建并启动发送线程）"""
+    global _notify_queue_instance
+    with _notify_queue_lock:
+        if _notify_queue_instance is None:
+            _notify_queue_instance = NotifyQueue(crawl_config)
+            _notify_queue_instance.start()
+        return _notify_queue_instance
+
+
+def stop_notify_queue(timeout: float = 30.0) -> None:
+    """停止通知队列的发送线程（未完成的任务保留在磁盘上）"""
+    global _notify_queue_instance
+    with _notify_queue_lock:
+        queue = _notify_queue_instance
+        _notify_queue_instance = None
+    if queue is not None:
+        queue.stop(timeout)
+
+
+def reset_notify_queue() -> None:
+    """重置通知队列（主要用于测试）"""
+    stop_notify_queue(timeout=0)
@@ -4,12 +4,13 @@ ntfy发送器
 用于发送消息到 ntfy 平台
 """
 import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 import requests
 
 from crawl_server.configs import CrawlConfig
 from crawl_server.core.connections.batch_utils import split_content_into_batches
+from crawl_server.core.utils.http_utils import get_http_session
 
 def send_to_ntfy(
     server_url: str,
@@ -21,12 +22,14 @@ def send_to_ntfy(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     crawl_config: Optional[CrawlConfig] = None,
+    batches: Optional[List[str]] = None,
 ) -> bool:
     """
     发送到ntfy（支持分批发送，严格遵守4KB限制）
     
     Args:
         crawl_config: 爬虫配置对象
+        batches: 预先分好的批次内容（为 None 时按本渠道格式分批）
     """
     # 避免 HTTP header 编码问题
     report_type_en_map = {
@@ -60,9 +63,10 @@ def send_to_ntfy(
         proxies = {"http": proxy_url, "https": proxy_url}
 
     # 获取分批内容，使用ntfy专用的4KB限制
-    batches = split_content_into_batches(
-        report_data, "ntfy", update_info, max_bytes=3800, mode=mode, crawl_config=crawl_config
-    )
+    if batches is None:
+        batches = split_content_into_batches(
+            report_data, "ntfy", update_info, max_bytes=3800, mode=mode, crawl_config=crawl_config
+        )
 
     total_batches = len(batches)
     print(f"ntfy消息分为 {total_batches} 批次发送 [{report_type}]")
@@ -98,7 +102,7 @@ def send_to_ntfy(
             )
 
         try:
-            response = requests.post(
+            response = get_http_session(url, proxy_url).post(
                 url,
                 headers=current_headers,
                 data=batch_content.encode("utf-8"),
@@ -119,7 +123,7 @@ def send_to_ntfy(
                 )
                 time.sleep(10)  # 等待10秒后重试
                 # 重试一次
-                retry_response = requests.post(
+                retry_response = get_http_session(url, proxy_url).post(
                     url,
                     headers=current_headers,
                     data=batch_content.encode("utf-8"),
@@ -0,0 +1,147 @@
+"""
+SMTP 连接复用
+
+进程级 SMTP 连接缓存，按 (服务器, 端口, 加密方式, 账号) 保留已登录的连接，
+每次发送前用 NOOP 检查连接是否可用，断开时自动重连，避免每次推送都重新握手和登录
+"""
+import smtplib
+import threading
+from email.message import Message
+from typing import Dict, Optional, Tuple
+
+SMTP_TIMEOUT = 30
+
+_ConnectionKey = Tuple[str, int, bool, str, str]
+
+
+class SmtpConnectionPool:
+    """已登录 SMTP 连接的缓存（线程安全，同一时间只有一个线程使用连接）"""
+
+    def __init__(self, timeout: float = SMTP_TIMEOUT):
+        self.timeout = timeout
+        self._connections: Dict[_ConnectionKey, smtplib.SMTP] = {}
+        self._lock = threading.Lock()
+
+    def send_message(
+        self,
+        smtp_server: str,
+        smtp_port: int,
+        use_tls: bool,
+        username: str,
+        password: str,
+        msg: Message,
+    ) -> None:
+        """
+        通过缓存的连接发送邮件，出错时抛出 smtplib 的异常
+
+        缓存的连接在发送过程中被服务器断开时，重新连接并重试一次
+        """
+        key = (smtp_server, smtp_port, use_tls, username, password)
+        with self._lock:
+            server = self._connections.get(key)
+            if server is not None and not self._is_alive(server):
+                print("SMTP 连接已失效，重新连接")
+                self._discard(key)
+                server = None
+
+            reused = server is not None
+            if server is None:
+                server = self._connect(key)
+            else:
+                print(f"复用 SMTP 连接: {smtp_server}:{smtp_port}")
+
+            try:
+                server.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                self._discard(key)
+                if not reused:
+                    raise
+                print("SMTP 连接在发送时断开，重新连接后重试")
+                server = self._connect(key)
+                try:
+                    server.send_message(msg)
+                except Exception:
+                    self._discard(key)
+                    raise
+            except Exception:
+                # 发送失败后连接状态不确定，下次重新建立
+                self._discard(key)
+                raise
+
+    def _connect(self, key: _ConnectionKey) -> smtplib.SMTP:
+        """建立连接并登录，成功后放入缓存"""
+        smtp_server, smtp_port, use_tls, username, password = key
+        if use_tls:
+            # TLS 模式
+            server = smtplib.SMTP(smtp_server, smtp_port, timeout=self.timeout)
+            server.set_debuglevel(0)  # 设为1可以查看详细调试信息
+            server.ehlo()
+            server.starttls()
+            server.ehlo()
+        else:
+            # SSL 模式
+            server = smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=self.timeout)
+            server.set_debuglevel(0)
+            server.ehlo()
+
+        try:
+            server.login(username, password)
+        except Exception:
+            self._close_quietly(server)
+            raise
+        self._connections[key] = server
+        return server
+
+    @staticmethod
+    def _is_alive(server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _discard(self, key: _ConnectionKey) -> None:
+        server = self._connections.pop(key, None)
+        if server is not None:
+            self._close_quietly(server)
+
+    @staticmethod
+    def _close_quietly(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def close(self) -> None:
+        """关闭所有缓存的连接"""
+        with self._lock:
+            for key in list(self._connections):
+                self._discard(key)
+
+
+# 进程级共享实例
+_smtp_pool_instance: Optional[SmtpConnectionPool] = None
+_smtp_pool_lock = threading.Lock()
+
+
+def get_smtp_pool() -> SmtpConnectionPool:
+    """获取进程级共享的 SMTP 连接缓存（首次调用时创建）"""
+    global _smtp_pool_instance
+    with _smtp_pool_lock:
+        if _smtp_pool_instance is None:
+            _smtp_pool_instance = SmtpConnectionPool()
+        return _smtp_pool_instance
+
+
+def close_smtp_connections() -> None:
+    """关闭所有缓存的 SMTP 连接"""
+    get_smtp_pool().close()
+
+
+def reset_smtp_pool() -> None:
+    """关闭并重置 SMTP 连接缓存（主要用于测试）"""
+    global _smtp_pool_instance
+    with _smtp_pool_lock:
+        pool = _smtp_pool_instance
+        _smtp_pool_instance = None
+    if pool is not None:
+        pool.close()
@@ -4,13 +4,12 @@
 用于发送消息到 企业微信 平台
 """
 import time
-from typing import Dict, Optional
-
-import requests
+from typing import Dict, List, Optional
 
 from crawl_server.configs import CrawlConfig
 from crawl_server.core.connections.batch_utils import split_content_into_batches
 from crawl_server.core.utils import strip_markdown
+from crawl_server.core.utils.http_utils import get_http_session
 
 def send_to_wework(
     webhook_url: str,
@@ -20,12 +19,14 @@ def send_to_wework(
     proxy_url: Optional[str] = None,
     mode: str = "daily",
     crawl_config: Optional[CrawlConfig] = None,
+    batches: Optional[List[str]] = None,
 ) -> bool:
     """
     发送到企业微信（支持分批发送，支持 markdown 和 text 两种格式）
     
     Args:
         crawl_config: 爬虫配置对象
+        batches: 预先分好的批次内容（为 None 时按本渠道格式分批）
     """
     if not crawl_config:
         raise RuntimeError("CrawlConfig 未提供，无法发送到企业微信")
@@ -45,7 +46,8 @@ def send_to_wework(
         print(f"企业微信使用 markdown 格式（群机器人模式）[{report_type}]")
 
     # 获取分批内容
-    batches = split_content_into_batches(report_data, "wework", update_info, mode=mode, crawl_config=crawl_config)
+    if batches is None:
+        batches = split_content_into_batches(report_data, "wework", update_info, mode=mode, crawl_config=crawl_config)
 
     print(f"企业微信消息分为 {len(batches)} 批次发送 [{report_type}]")
 
@@ -75,7 +77,7 @@ def send_to_wework(
         )
 
         try:
-            response = requests.post(
+            response = get_http_session(webhook_url, proxy_url).post(
                 webhook_url, headers=headers, json=payload, proxies=proxies, timeout=30
             )
             if response.status_code == 200:
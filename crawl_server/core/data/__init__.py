@@ -3,19 +3,43 @@
 
 负责数据获取、存储和解析
 """
-from .fetcher import DataFetcher
+from .day_log import DayLog, DayLogFormatError, append_day_log, read_day_log
+from .day_state import DayState, get_day_state
+from .fetcher import CrawlCancelledError, DataFetcher
+from .parse_cache import ParseCache, get_parse_cache
 from .parser import (
     detect_latest_new_titles,
     parse_file_titles,
     process_source_data,
     read_all_today_titles,
 )
-from .storage import save_titles_to_file
+from .snapshot import (
+    SnapshotFormatError,
+    decode_snapshot,
+    encode_snapshot,
+    read_snapshot_file,
+)
+from .storage import CrawlSnapshot, save_crawl_snapshot, save_titles_to_file
 
 __all__ = [
     "DataFetcher",
+    "CrawlCancelledError",
+    "CrawlSnapshot",
+    "save_crawl_snapshot",
     "save_titles_to_file",
+    "SnapshotFormatError",
+    "encode_snapshot",
+    "decode_snapshot",
+    "read_snapshot_file",
+    "DayLog",
+    "DayLogFormatError",
+    "append_day_log",
+    "read_day_log",
+    "DayState",
+    "get_day_state",
     "parse_file_titles",
+    "ParseCache",
+    "get_parse_cache",
     "read_all_today_titles",
     "process_source_data",
     "detect_latest_new_titles",
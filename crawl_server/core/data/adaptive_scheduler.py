@@ -0,0 +1,172 @@
+"""
+自适应抓取调度器
+
+按平台统计新标题出现速率（指数平滑），据此调整各平台的抓取间隔：
+变化快的平台缩短间隔，变化慢的平台拉长间隔，间隔限制在配置范围内
+"""
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class PlatformSchedule:
+    """单个平台的调度状态"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.last_fetch_at: Optional[float] = None
+        self.new_per_minute: Optional[float] = None  # 新标题速率（条/分钟，指数平滑）
+        self.titles: Set[str] = set()
+
+    def next_due(self) -> float:
+        if self.last_fetch_at is None:
+            return 0.0
+        return self.last_fetch_at + self.interval
+
+
+class AdaptiveScheduler:
+    """自适应抓取调度器（线程安全，进程内跨抓取共享）"""
+
+    def __init__(
+        self,
+        min_interval: float,
+        max_interval: float,
+        default_interval: float,
+        target_new_titles: float = 5.0,
+        alpha: float = 0.3,
+    ):
+        """
+        初始化调度器
+
+        Args:
+            min_interval: 最短抓取间隔（秒）
+            max_interval: 最长抓取间隔（秒）
+            default_interval: 尚无统计数据时的抓取间隔（秒）
+            target_new_titles: 期望每次抓取看到的新标题数，间隔 = 目标数 / 新标题速率
+            alpha: 新标题速率的指数平滑系数
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.default_interval = min(max(default_interval, self.min_interval), self.max_interval)
+        self.target_new_titles = target_new_titles
+        self.alpha = alpha
+        self._platforms: Dict[str, PlatformSchedule] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, platform_id: str) -> PlatformSchedule:
+        schedule = self._platforms.get(platform_id)
+        if schedule is None:
+            schedule = PlatformSchedule(self.default_interval)
+            self._platforms[platform_id] = schedule
+        return schedule
+
+    def split_due(self, platform_ids: Iterable[str], now: Optional[float] = None) -> Tuple[List[str], List[str]]:
+        """
+        拆分出本次需要抓取和尚未到期的平台
+
+        在半个最短间隔内即将到期的平台也算作到期，合并到本次抓取
+
+        Returns:
+            (到期平台列表, 未到期平台列表)
+        """
+        if now is None:
+            now = time.monotonic()
+        horizon = now + self.min_interval / 2
+        due, not_due = [], []
+        with self._lock:
+            for platform_id in platform_ids:
+                schedule = self._platforms.get(platform_id)
+                if schedule is None or schedule.next_due() <= horizon:
+                    due.append(platform_id)
+                else:
+                    not_due.append(platform_id)
+        return due, not_due
+
+    def observe(self, platform_id: str, titles: Iterable[str], now: Optional[float] = None) -> float:
+        """
+        记录一次成功抓取，更新新标题速率和抓取间隔
+
+        Returns:
+            更新后的抓取间隔（秒）
+        """
+        if now is None:
+            now = time.monotonic()
+        current = set(titles)
+        with self._lock:
+            schedule = self._get(platform_id)
+            if schedule.last_fetch_at is not None and schedule.titles:
+                elapsed_minutes = max((now - schedule.last_fetch_at) / 60, 1e-6)
+                rate = len(current - schedule.titles) / elapsed_minutes
+                if schedule.new_per_minute is None:
+                    schedule.new_per_minute = rate
+                else:
+                    schedule.new_per_minute = (
+                        self.alpha * rate + (1 - self.alpha) * schedule.new_per_minute
+                    )
+
+                if schedule.new_per_minute > 0:
+                    interval = self.target_new_titles / schedule.new_per_minute * 60
+                else:
+                    interval = self.max_interval
+                schedule.interval = min(max(interval, self.min_interval), self.max_interval)
+
+            schedule.last_fetch_at = now
+            schedule.titles = current
+            return schedule.interval
+
+    def seconds_until_next_due(self, default: float, now: Optional[float] = None) -> float:
+        """距离最早到期平台的秒数（不短于最短间隔），没有统计数据时返回 default"""
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            due_times = [
+                schedule.next_due()
+                for schedule in self._platforms.values()
+                if schedule.last_fetch_at is not None
+            ]
+        if not due_times:
+            return default
+        earliest = min(due_times)
+        return max(self.min_interval, earliest - now)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """各平台的调度状态快照"""
+        with self._lock:
+            return {
+                platform_id: {
+                    "interval": round(schedule.interval, 1),
+                    "new_per_minute": (
+                        round(schedule.new_per_minute, 3)
+                        if schedule.new_per_minute is not None else None
+                    ),
+                }
+                for platform_id, schedule in self._platforms.items()
+            }
+
+
+# 进程级共享实例
+_adaptive_scheduler_instance: Optional[AdaptiveScheduler] = None
+_adaptive_scheduler_lock = threading.Lock()
+
+
+def get_adaptive_scheduler(crawl_config) -> Optional[AdaptiveScheduler]:
+    """获取进程级共享的调度器，未启用自适应调度时返回 None"""
+    global _adaptive_scheduler_instance
+    if not crawl_config or not crawl_config.CRAWL_ADAPTIVE_ENABLED:
+        return None
+    with _adaptive_scheduler_lock:
+        if _adaptive_scheduler_instance is None:
+            _adaptive_scheduler_instance = AdaptiveScheduler(
+                min_interval=crawl_config.CRAWL_ADAPTIVE_MIN_MINUTES * 60,
+                max_interval=crawl_config.CRAWL_ADAPTIVE_MAX_MINUTES * 60,
+                default_interval=crawl_config.SCHEDULE_MINUTES * 60,
+                target_new_titles=crawl_config.CRAWL_ADAPTIVE_TARGET_NEW,
+            )
+        return _adaptive_scheduler_instance
+
+
+def reset_adaptive_scheduler() -> None:
+    """重置调度器（主要用于测试）"""
+    global _adaptive_scheduler_instance
+    with _adaptive_scheduler_lock:
+        _adaptive_scheduler_instance = None
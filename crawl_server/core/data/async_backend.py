@@ -0,0 +1,213 @@
+"""
+异步抓取后端
+
+在独立的事件循环线程中运行 httpx.AsyncClient，
+整个进程复用同一个连接池（HTTP/1.1 keep-alive 或 HTTP/2），
+支持单请求超时、整体截止时间和取消
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Coroutine, Dict, Mapping, Optional, Set, Tuple
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    logging.warning("httpx 未安装，异步抓取后端将不可用")
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFetchBackend:
+    """异步抓取后端（事件循环线程 + 共享连接池）"""
+
+    def __init__(
+        self,
+        headers: Dict[str, str],
+        proxy_url: Optional[str] = None,
+        max_connections: int = 10,
+        http2: bool = False,
+    ):
+        """
+        初始化异步抓取后端
+
+        Args:
+            headers: 默认请求头
+            proxy_url: 代理URL
+            max_connections: 连接池最大连接数
+            http2: 是否启用 HTTP/2（需要安装 h2）
+        """
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx 未安装，请运行: pip install httpx")
+
+        self.headers = headers
+        self.proxy_url = proxy_url
+        self.max_connections = max(1, max_connections)
+        self.http2 = http2
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._inflight: Set[Future] = set()
+        self._inflight_lock = threading.Lock()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="crawl-async-loop", daemon=True
+        )
+        self._thread.start()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        """获取共享客户端（只在事件循环线程内调用）"""
+        if self._client is None:
+            limits = httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            )
+            try:
+                self._client = httpx.AsyncClient(
+                    headers=self.headers,
+                    limits=limits,
+                    http2=self.http2,
+                    proxy=self.proxy_url,
+                )
+            except ImportError:
+                # 未安装 h2 时回退到 HTTP/1.1
+                logger.warning("⚠️  h2 未安装，异步抓取回退到 HTTP/1.1")
+                self._client = httpx.AsyncClient(
+                    headers=self.headers,
+                    limits=limits,
+                    proxy=self.proxy_url,
+                )
+        return self._client
+
+    async def get(
+        self, url: str, timeout: float, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, bytes, Mapping[str, str]]:
+        """
+        发起 GET 请求，返回 (状态码, 响应体字节, 响应头)
+
+        Args:
+            url: 请求地址
+            timeout: 单请求超时时间（秒）
+            headers: 额外请求头（如条件请求头）
+        """
+        client = self._get_client()
+        response = await client.get(url, timeout=timeout, headers=headers)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response.status_code, response.content, response.headers
+
+    def submit(self, coro: Coroutine) -> Future:
+        """将协程提交到后端事件循环，返回 concurrent.futures.Future"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        with self._inflight_lock:
+            self._inflight.add(future)
+        future.add_done_callback(self._discard_inflight)
+        return future
+
+    def _discard_inflight(self, future: Future) -> None:
+        with self._inflight_lock:
+            self._inflight.discard(future)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        在后端事件循环中执行协程并等待结果（调用线程阻塞，事件循环不阻塞）
+
+        Args:
+            coro: 协程
+            timeout: 整体截止时间（秒），超时后取消协程并抛出 TimeoutError
+        """
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def cancel_all(self) -> int:
+        """取消所有正在执行的协程，返回取消数量"""
+        with self._inflight_lock:
+            inflight = list(self._inflight)
+        cancelled = sum(1 for future in inflight if future.cancel())
+        if cancelled:
+            logger.info(f"🛑 已取消 {cancelled} 个异步抓取任务")
+        return cancelled
+
+    async def _shutdown(self) -> None:
+        """取消并等待所有任务结束，然后关闭连接池（在事件循环线程内执行）"""
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def close(self) -> None:
+        """取消未完成任务，关闭连接池并停止事件循环"""
+        self.cancel_all()
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=5)
+        except Exception as e:
+            logger.error(f"❌ 关闭异步抓取后端时出错: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        logger.debug("✅ 异步抓取后端已关闭")
+
+
+# 进程级共享实例（按代理区分）
+_backends: Dict[Optional[str], AsyncFetchBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_async_fetch_backend(
+    headers: Dict[str, str],
+    proxy_url: Optional[str] = None,
+    max_connections: int = 10,
+    http2: bool = False,
+) -> AsyncFetchBackend:
+    """
+    获取进程级共享的异步抓取后端（首次调用时创建）
+
+    Args:
+        headers: 默认请求头
+        proxy_url: 代理URL
+        max_connections: 连接池最大连接数
+        http2: 是否启用 HTTP/2
+    """
+    with _backends_lock:
+        backend = _backends.get(proxy_url)
+        if backend is None:
+            backend = AsyncFetchBackend(
+                headers=headers,
+                proxy_url=proxy_url,
+                max_connections=max_connections,
+                http2=http2,
+            )
+            _backends[proxy_url] = backend
+            logger.info(
+                f"✅ 异步抓取后端已启动（连接池大小 {backend.max_connections}，HTTP/2={'开' if http2 else '关'}）"
+            )
+        return backend
+
+
+def cancel_async_fetches() -> int:
+    """取消所有异步抓取后端中正在执行的任务"""
+    with _backends_lock:
+        backends = list(_backends.values())
+    return sum(backend.cancel_all() for backend in backends)
+
+
+def close_async_fetch_backends() -> None:
+    """关闭所有异步抓取后端"""
+    with _backends_lock:
+        backends = list(_backends.values())
+        _backends.clear()
+    for backend in backends:
+        backend.close()
@@ -0,0 +1,164 @@
+"""
+平台熔断器与健康状态
+
+按平台 ID 记录抓取结果：连续失败达到阈值后熔断（跳过该平台），
+冷却期结束后放行一个探测请求（半开），探测成功则恢复。
+同时统计成功率和延迟，供动态调整平台优先级使用
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class PlatformBreaker:
+    """单个平台的熔断器和统计数据（由 PlatformHealthBoard 加锁访问）"""
+
+    def __init__(self):
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_started_at: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+        self.skipped = 0
+        self.avg_latency: Optional[float] = None
+        self.last_latency: Optional[float] = None
+        self.last_error = ""
+
+    def record_latency(self, latency: float, alpha: float) -> None:
+        self.last_latency = latency
+        if self.avg_latency is None:
+            self.avg_latency = latency
+        else:
+            self.avg_latency = alpha * latency + (1 - alpha) * self.avg_latency
+
+    def to_dict(self) -> Dict:
+        total = self.successes + self.failures
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "successes": self.successes,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "success_rate": round(self.successes / total, 4) if total else None,
+            "avg_latency": round(self.avg_latency, 3) if self.avg_latency is not None else None,
+            "last_latency": round(self.last_latency, 3) if self.last_latency is not None else None,
+            "last_error": self.last_error,
+        }
+
+
+class PlatformHealthBoard:
+    """平台健康状态板（线程安全，进程内跨抓取共享）"""
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 300.0, latency_alpha: float = 0.2):
+        """
+        初始化健康状态板
+
+        Args:
+            failure_threshold: 连续失败多少次后熔断，<= 0 表示不熔断（仅统计）
+            cooldown: 熔断后多少秒进入半开状态
+            latency_alpha: 平均延迟的指数平滑系数
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.latency_alpha = latency_alpha
+        self._breakers: Dict[str, PlatformBreaker] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, platform_id: str) -> PlatformBreaker:
+        breaker = self._breakers.get(platform_id)
+        if breaker is None:
+            breaker = PlatformBreaker()
+            self._breakers[platform_id] = breaker
+        return breaker
+
+    def allow(self, platform_id: str) -> bool:
+        """是否允许请求该平台（熔断中返回 False，冷却结束后放行一个探测请求）"""
+        with self._lock:
+            breaker = self._get(platform_id)
+            if breaker.state == STATE_CLOSED:
+                return True
+
+            now = time.monotonic()
+            if breaker.state == STATE_OPEN and now - breaker.opened_at >= self.cooldown:
+                breaker.state = STATE_HALF_OPEN
+                breaker.probe_started_at = now
+                return True
+
+            # 半开状态只放行一个探测请求；探测请求未返回（如被截止时间取消）超过冷却时间后再放行一次
+            if (
+                breaker.state == STATE_HALF_OPEN
+                and breaker.probe_started_at is not None
+                and now - breaker.probe_started_at >= self.cooldown
+            ):
+                breaker.probe_started_at = now
+                return True
+
+            breaker.skipped += 1
+            return False
+
+    def record_success(self, platform_id: str, latency: float) -> None:
+        """记录一次成功请求"""
+        with self._lock:
+            breaker = self._get(platform_id)
+            breaker.successes += 1
+            breaker.consecutive_failures = 0
+            breaker.record_latency(latency, self.latency_alpha)
+            breaker.state = STATE_CLOSED
+            breaker.probe_started_at = None
+
+    def record_failure(self, platform_id: str, latency: float, error: str = "") -> None:
+        """记录一次失败请求，达到阈值或半开探测失败时熔断"""
+        with self._lock:
+            breaker = self._get(platform_id)
+            breaker.failures += 1
+            breaker.consecutive_failures += 1
+            breaker.record_latency(latency, self.latency_alpha)
+            breaker.last_error = error
+
+            if self.failure_threshold <= 0:
+                return
+            if (
+                breaker.state == STATE_HALF_OPEN
+                or breaker.consecutive_failures >= self.failure_threshold
+            ):
+                breaker.state = STATE_OPEN
+                breaker.opened_at = time.monotonic()
+                breaker.probe_started_at = None
+
+    def open_platforms(self) -> List[str]:
+        """当前处于熔断（或半开）状态的平台"""
+        with self._lock:
+            return [pid for pid, b in self._breakers.items() if b.state != STATE_CLOSED]
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """所有平台的健康状态快照"""
+        with self._lock:
+            return {pid: breaker.to_dict() for pid, breaker in self._breakers.items()}
+
+
+# 进程级共享实例
+_health_board_instance: Optional[PlatformHealthBoard] = None
+_health_board_lock = threading.Lock()
+
+
+def get_platform_health_board(
+    failure_threshold: int = 5, cooldown: float = 300.0
+) -> PlatformHealthBoard:
+    """获取进程级共享的健康状态板（首次调用时按参数创建）"""
+    global _health_board_instance
+    with _health_board_lock:
+        if _health_board_instance is None:
+            _health_board_instance = PlatformHealthBoard(failure_threshold, cooldown)
+        return _health_board_instance
+
+
+def reset_platform_health_board() -> None:
+    """重置健康状态板（主要用于测试）"""
+    global _health_board_instance
+    with _health_board_lock:
+        _health_board_instance = None
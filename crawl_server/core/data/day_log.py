@@ -0,0 +1,40 @@
+"""
+当日标题日志写入
+
+日志格式、解码和写入器在 trendradar_formats.day_log（mcp_server 共用），
+这里按快照的规范化规则整理抓取结果后追加到当天的日志
+"""
+import threading
+from typing import Dict, Optional
+
+from trendradar_formats.day_log import DayLog, DayLogFormatError, DayLogWriter, read_day_log
+from crawl_server.core.data.snapshot import normalize_results
+from crawl_server.core.utils import get_output_path
+from crawl_server.core.utils.file_utils import DAY_LOG_FILENAME, SNAPSHOT_SUBFOLDER
+
+
+# 进程级共享实例（日期变化时按新路径重建）
+_day_log_writer_instance: Optional[DayLogWriter] = None
+_day_log_writer_lock = threading.Lock()
+
+
+def get_day_log_writer() -> DayLogWriter:
+    """获取当天的日志写入器"""
+    global _day_log_writer_instance
+    file_path = get_output_path(SNAPSHOT_SUBFOLDER, DAY_LOG_FILENAME)
+    with _day_log_writer_lock:
+        if _day_log_writer_instance is None or _day_log_writer_instance.file_path != file_path:
+            _day_log_writer_instance = DayLogWriter(file_path)
+        return _day_log_writer_instance
+
+
+def reset_day_log_writer() -> None:
+    """重置日志写入器（主要用于测试）"""
+    global _day_log_writer_instance
+    with _day_log_writer_lock:
+        _day_log_writer_instance = None
+
+
+def append_day_log(time_info: str, results: Dict, id_to_name: Dict) -> None:
+    """将一次抓取追加到当天的标题日志"""
+    get_day_log_writer().append_crawl(time_info, normalize_results(results, id_to_name))
@@ -0,0 +1,192 @@
+"""
+当日累计状态
+
+在内存中维护当天的 all_results / id_to_name / title_info 和最新一次抓取的新增标题，
+每次抓取只合并本次结果，读取方不再逐个重读当天的数据。
+
+数据来自当日标题日志（titles.dlog），每次只读取日志新追加的部分；启用日志前的旧数据
+（以及日志追加失败时保存的快照）按快照文件读取。不单独保存检查点：日志本身就是持久化的
+增量记录，内存中只记录已合并的抓取时间和日志读取位置，进程重启后重放一次即可恢复。
+"""
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from crawl_server.core.data.day_log import DayLog, DayLogFormatError
+from crawl_server.core.data.parser import parse_file_titles, process_source_data
+from crawl_server.core.utils import format_date_folder, list_snapshot_files
+from crawl_server.core.utils.file_utils import DAY_LOG_FILENAME, SNAPSHOT_SUBFOLDER
+
+
+def _copy_title_data(title_data: Dict) -> Dict:
+    return {
+        title: {"ranks": list(data["ranks"]), "url": data["url"], "mobileUrl": data["mobileUrl"]}
+        for title, data in title_data.items()
+    }
+
+
+class DayState:
+    """当日累计状态（线程安全）"""
+
+    def __init__(self, day_dir: Path):
+        self.day_dir = Path(day_dir)
+        self.log_path = self.day_dir / SNAPSHOT_SUBFOLDER / DAY_LOG_FILENAME
+        self.crawl_times: List[str] = []  # 已合并的抓取时间（与快照文件名一致）
+        self.all_results: Dict = {}
+        self.id_to_name: Dict = {}
+        self.title_info: Dict = {}
+        self.latest_new: Dict = {}  # 最新一次抓取的新增标题
+        self._day_log = DayLog()
+        self._lock = threading.Lock()
+
+    def _clear(self) -> None:
+        self.crawl_times = []
+        self.all_results = {}
+        self.id_to_name = {}
+        self.title_info = {}
+        self.latest_new = {}
+
+    def _apply(self, time_info: str, titles_by_id: Dict, id_to_name: Dict) -> None:
+        """合并一次抓取，开销只与本次抓取的标题数有关"""
+        latest_new = {}
+        for source_id, title_data in titles_by_id.items():
+            seen = self.all_results.get(source_id, {})
+            new_titles = {title: data for title, data in title_data.items() if title not in seen}
+            if new_titles:
+                latest_new[source_id] = _copy_title_data(new_titles)
+
+        self.id_to_name.update(id_to_name)
+        for source_id, title_data in titles_by_id.items():
+            process_source_data(source_id, title_data, time_info, self.all_results, self.title_info)
+
+        self.crawl_times.append(time_info)
+        # 与按文件检测一致：当天只有一次抓取时没有"新增"
+        self.latest_new = latest_new if len(self.crawl_times) >= 2 else {}
+
+    def _read_day_log(self) -> bool:
+        """
+        读取日志新追加的部分
+
+        Returns:
+            已合并的数据是否失效（日志被截短或替换、已合并的抓取时间被重新写入），需要重建
+        """
+        try:
+            size = os.path.getsize(self.log_path)
+        except OSError:
+            size = 0
+
+        stale = False
+        if size < self._day_log.valid_end:
+            self._day_log = DayLog()
+            stale = True
+        if size > self._day_log.valid_end:
+            try:
+                with open(self.log_path, "rb") as f:
+                    f.seek(self._day_log.valid_end)
+                    new_times = self._day_log.update(f.read(size - self._day_log.valid_end))
+            except (OSError, DayLogFormatError) as e:
+                # 已读到的完整记录仍然有效，之后的部分等下次读取
+                print(f"读取当日标题日志失败: {e}")
+                new_times = []
+            if any(time_info in self.crawl_times for time_info in new_times):
+                stale = True
+        return stale
+
+    def _sync(self) -> None:
+        """与当日标题日志和快照文件对齐，只合并新出现的抓取"""
+        rebuild = self._read_day_log()
+
+        # 日志中没有的抓取时间（启用日志前的旧数据或日志追加失败）从快照文件读取
+        files = {
+            file_path.stem: file_path
+            for file_path in list_snapshot_files(self.day_dir)
+            if file_path.stem not in self._day_log.crawls
+        }
+        times = sorted([*self._day_log.crawls, *files])
+
+        count = len(self.crawl_times)
+        if rebuild or times[:count] != self.crawl_times:
+            self._clear()
+            count = 0
+
+        for time_info in times[count:]:
+            file_path = files.get(time_info)
+            if file_path is None:
+                titles_by_id, id_to_name = self._day_log.crawl_titles(time_info)
+            else:
+                titles_by_id, id_to_name = parse_file_titles(file_path)
+            self._apply(time_info, titles_by_id, id_to_name)
+
+    def sync(self) -> None:
+        """与当日标题日志和快照文件对齐"""
+        with self._lock:
+            self._sync()
+
+    def crawl_count(self) -> int:
+        """当天已合并的抓取次数"""
+        with self._lock:
+            return len(self.crawl_times)
+
+    def results(self, platform_ids: Optional[List[str]] = None) -> Tuple[Dict, Dict, Dict]:
+        """返回 (all_results, id_to_name, title_info) 的副本，支持按平台过滤"""
+        all_results = {}
+        title_info = {}
+        with self._lock:
+            for source_id, title_data in self.all_results.items():
+                if platform_ids is not None and source_id not in platform_ids:
+                    continue
+                source_infos = self.title_info.get(source_id, {})
+                source_results = {}
+                source_info = {}
+                for title, data in title_data.items():
+                    ranks = list(data["ranks"])
+                    source_results[title] = {"ranks": ranks, "url": data["url"], "mobileUrl": data["mobileUrl"]}
+                    info = source_infos.get(title)
+                    if info is not None:
+                        source_info[title] = dict(info, ranks=ranks)
+                all_results[source_id] = source_results
+                title_info[source_id] = source_info
+            id_to_name = {
+                source_id: name
+                for source_id, name in self.id_to_name.items()
+                if platform_ids is None or source_id in platform_ids
+            }
+        return all_results, id_to_name, title_info
+
+    def new_titles(self, platform_ids: Optional[List[str]] = None) -> Dict:
+        """返回最新一次抓取新增标题的副本，支持按平台过滤"""
+        with self._lock:
+            return {
+                source_id: _copy_title_data(title_data)
+                for source_id, title_data in self.latest_new.items()
+                if platform_ids is None or source_id in platform_ids
+            }
+
+
+# 进程级共享实例（日期变化时按新目录重建）
+_day_state_instance: Optional[DayState] = None
+_day_state_lock = threading.Lock()
+
+
+def _current_day_state() -> DayState:
+    global _day_state_instance
+    day_dir = Path("output") / format_date_folder()
+    with _day_state_lock:
+        if _day_state_instance is None or _day_state_instance.day_dir != day_dir:
+            _day_state_instance = DayState(day_dir)
+        return _day_state_instance
+
+
+def get_day_state() -> DayState:
+    """获取当天的累计状态（已与当日标题日志和快照文件对齐）"""
+    state = _current_day_state()
+    state.sync()
+    return state
+
+
+def reset_day_state() -> None:
+    """重置当日状态（主要用于测试）"""
+    global _day_state_instance
+    with _day_state_lock:
+        _day_state_instance = None
@@ -0,0 +1,110 @@
+"""
+平台增量缓存
+
+按平台记录上次抓取的响应摘要、条目摘要、ETag/Last-Modified 和解析结果，用于发送条件请求；
+另记录每个平台最后一次成功发往下游的条目摘要，与之相同的平台视为未变化，让下游跳过重复处理
+"""
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Union
+
+
+@dataclass
+class DeltaEntry:
+    """单个平台的缓存条目"""
+    body_hash: str  # 原始响应摘要
+    items_hash: str  # 规范化条目摘要（忽略响应中的时间戳等字段）
+    titles: Dict  # 解析结果 {title: {ranks, url, mobileUrl}}
+    etag: str = ""
+    last_modified: str = ""
+
+
+def hash_body(body: Union[bytes, str]) -> str:
+    """原始响应摘要"""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return hashlib.sha1(body).hexdigest()
+
+
+def hash_titles(titles: Dict) -> str:
+    """解析结果摘要（保持标题顺序，排名变化也视为内容变化）"""
+    payload = json.dumps(
+        [(title, info["ranks"], info["url"], info["mobileUrl"]) for title, info in titles.items()],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def copy_titles(titles: Dict) -> Dict:
+    """复制解析结果，避免下游修改缓存内容"""
+    return {
+        title: {"ranks": list(info["ranks"]), "url": info["url"], "mobileUrl": info["mobileUrl"]}
+        for title, info in titles.items()
+    }
+
+
+class DeltaCache:
+    """平台增量缓存（线程安全）"""
+
+    def __init__(self):
+        self._entries: Dict[str, DeltaEntry] = {}
+        self._emitted: Dict[str, str] = {}  # 平台ID -> 最后一次成功发往下游的条目摘要
+        self._lock = threading.Lock()
+
+    def get(self, platform_id: str) -> Optional[DeltaEntry]:
+        with self._lock:
+            return self._entries.get(platform_id)
+
+    def put(self, platform_id: str, entry: DeltaEntry) -> None:
+        with self._lock:
+            self._entries[platform_id] = entry
+
+    def is_emitted(self, platform_id: str, items_hash: str) -> bool:
+        """该条目摘要是否已成功发往下游"""
+        with self._lock:
+            return self._emitted.get(platform_id) == items_hash
+
+    def mark_emitted(self, items_hashes: Dict[str, str]) -> None:
+        """下游发送成功后记录各平台已发送的条目摘要"""
+        with self._lock:
+            self._emitted.update(items_hashes)
+
+    def conditional_headers(self, platform_id: str) -> Dict[str, str]:
+        """条件请求头（If-None-Match / If-Modified-Since）"""
+        entry = self.get(platform_id)
+        headers = {}
+        if entry:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._emitted.clear()
+
+
+# 进程级共享实例
+_delta_cache_instance: Optional[DeltaCache] = None
+_delta_cache_lock = threading.Lock()
+
+
+def get_delta_cache() -> DeltaCache:
+    """获取进程级共享的增量缓存（首次调用时创建）"""
+    global _delta_cache_instance
+    with _delta_cache_lock:
+        if _delta_cache_instance is None:
+            _delta_cache_instance = DeltaCache()
+        return _delta_cache_instance
+
+
+def reset_delta_cache() -> None:
+    """重置增量缓存（主要用于测试）"""
+    global _delta_cache_instance
+    with _delta_cache_lock:
+        _delta_cache_instance = None
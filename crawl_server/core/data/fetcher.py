@@ -3,14 +3,40 @@
 
 负责从API获取新闻数据
 """
-import json
+import asyncio
 import random
 import time
-from typing import Dict, List, Tuple, Optional, Union
+from collections import deque
+from dataclasses import replace
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Callable, Dict, List, Tuple, Optional, Union
+from urllib.parse import urlparse
 
 import requests
 
 from crawl_server.configs import CrawlConfig
+from crawl_server.core.data.adaptive_scheduler import get_adaptive_scheduler
+from crawl_server.core.data.async_backend import HTTPX_AVAILABLE, get_async_fetch_backend
+from crawl_server.core.data.circuit_breaker import get_platform_health_board
+from crawl_server.core.data.delta_cache import (
+    DeltaEntry,
+    copy_titles,
+    get_delta_cache,
+    hash_body,
+    hash_titles,
+)
+from crawl_server.core.data.rate_limiter import HostRateLimiter
+from crawl_server.core.utils.http_utils import get_http_session
+from crawl_server.core.utils.json_utils import json_loads
+from crawl_server.core.data.retry_queue import RetryQueue, backoff_delay
+
+API_URL_TEMPLATE = "https://newsnow.busiyi.world/api/s?id={id_value}&latest"
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
@@ -21,6 +47,19 @@ HEADERS = {
     "X-Requested-With": "XMLHttpRequest",
 }
 
+# 单个平台的抓取结果：(解析结果, 内容是否已发往下游, 待写入增量缓存的条目)
+FetchOutcome = Tuple[Dict, bool, DeltaEntry]
+
+
+class CrawlCancelledError(RuntimeError):
+    """抓取被取消（收到停止信号），本轮结果不应保存或推送"""
+
+
+def get_fetch_session(proxy_url: Optional[str] = None) -> requests.Session:
+    """获取共享的抓取 Session（来自进程级 Session 注册表，复用 keep-alive 连接）"""
+    return get_http_session(API_URL_TEMPLATE, proxy_url, headers=HEADERS)
+
+
 class DataFetcher:
     """数据获取器"""
 
@@ -34,120 +73,462 @@ class DataFetcher:
         """
         self.proxy_url = proxy_url
         self.crawl_config = crawl_config
+        self.request_timeout = crawl_config.CRAWL_REQUEST_TIMEOUT if crawl_config else 10
+        self.delta_cache = get_delta_cache()
+        # 最近一次 crawl_websites 中内容未变化的平台ID
+        self.last_crawl_unchanged: List[str] = []
+        # 最近一次 crawl_websites 中未到抓取时间、沿用上次数据的平台ID（不是本次的真实抓取结果）
+        self.last_crawl_carried: List[str] = []
+        # 最近一次 crawl_websites 中各平台的条目摘要，下游发送成功后通过 mark_emitted 记录
+        self.last_crawl_hashes: Dict[str, str] = {}
+        self.scheduler = get_adaptive_scheduler(crawl_config)
+        self.health_board = get_platform_health_board(
+            failure_threshold=crawl_config.CRAWL_BREAKER_THRESHOLD if crawl_config else 5,
+            cooldown=crawl_config.CRAWL_BREAKER_COOLDOWN if crawl_config else 300.0,
+        )
 
-    def fetch_data(
-        self,
-        id_info: Union[str, Tuple[str, str]],
-        max_retries: int = 2,
-        min_retry_wait: int = 3,
-        max_retry_wait: int = 5,
-    ) -> Tuple[Optional[str], str, str]:
-        """获取指定ID数据，支持重试"""
+    @staticmethod
+    def _check_status(data_json: Dict, id_value: str) -> None:
+        """校验响应状态，异常时抛出 ValueError"""
+        status = data_json.get("status", "未知")
+        if status not in ["success", "cache"]:
+            raise ValueError(f"响应状态异常: {status}")
+
+        status_info = "最新数据" if status == "success" else "缓存数据"
+        print(f"获取 {id_value} 成功（{status_info}）")
+
+    @staticmethod
+    def _split_id_info(id_info: Union[str, Tuple[str, str]]) -> Tuple[str, str]:
+        """拆分 (id, name) 或 id"""
         if isinstance(id_info, tuple):
-            id_value, alias = id_info
-        else:
-            id_value = id_info
-            alias = id_value
+            return id_info
+        return id_info, id_info
 
-        url = f"https://newsnow.busiyi.world/api/s?id={id_value}&latest"
+    @staticmethod
+    def _build_titles(data: Dict) -> Dict:
+        """将解码后的响应转换为 {title: {ranks, url, mobileUrl}} 结构"""
+        titles = {}
+        for index, item in enumerate(data.get("items") or [], 1):
+            title = item.get("title")
+            # 跳过无效标题（None、float、空字符串）
+            if title is None or isinstance(title, float):
+                continue
+            title = str(title).strip()
+            if not title:
+                continue
 
-        proxies = None
-        if self.proxy_url:
-            proxies = {"http": self.proxy_url, "https": self.proxy_url}
+            info = titles.get(title)
+            if info is not None:
+                info["ranks"].append(index)
+            else:
+                titles[title] = {
+                    "ranks": [index],
+                    "url": item.get("url", ""),
+                    "mobileUrl": item.get("mobileUrl", ""),
+                }
+        return titles
 
-        retries = 0
-        while retries <= max_retries:
-            try:
-                response = requests.get(
-                    url, proxies=proxies, headers=HEADERS, timeout=10
-                )
-                response.raise_for_status()
+    def _apply_response(
+        self, id_value: str, status_code: int, body: bytes, headers
+    ) -> FetchOutcome:
+        """
+        结合增量缓存处理响应，返回 (解析结果, 是否未变化, 新的缓存条目)
+
+        304 或响应与上次完全一致时直接复用上次的解析结果，不再解析；
+        否则只解码一次，状态校验和标题提取共用同一份解码结果。
+        这里不写入增量缓存：超过截止时间的请求仍可能在此完成，由 crawl_websites
+        只为计入结果的平台写入；是否未变化与最后一次成功发往下游的内容比较
+        """
+        entry = self.delta_cache.get(id_value)
+        if status_code == 304:
+            if entry is None:
+                raise ValueError("收到 304 但没有缓存数据")
+            print(f"获取 {id_value} 成功（响应未变化）")
+            return copy_titles(entry.titles), self.delta_cache.is_emitted(id_value, entry.items_hash), entry
+
+        etag = headers.get("ETag", "") or ""
+        last_modified = headers.get("Last-Modified", "") or ""
+        body_hash = hash_body(body)
+        if entry is not None and entry.body_hash == body_hash:
+            print(f"获取 {id_value} 成功（响应未变化）")
+            return (
+                copy_titles(entry.titles),
+                self.delta_cache.is_emitted(id_value, entry.items_hash),
+                replace(entry, etag=etag, last_modified=last_modified),
+            )
+
+        data = json_loads(body)
+        self._check_status(data, id_value)
+        titles = self._build_titles(data)
+        items_hash = hash_titles(titles)
+        # 响应中的时间戳等字段变化但条目未变化时，同样视为未变化
+        unchanged = self.delta_cache.is_emitted(id_value, items_hash)
+        new_entry = DeltaEntry(
+            body_hash=body_hash,
+            items_hash=items_hash,
+            titles=copy_titles(titles),
+            etag=etag,
+            last_modified=last_modified,
+        )
+        return titles, unchanged, new_entry
 
-                data_text = response.text
-                data_json = json.loads(data_text)
+    def _fetch_once(self, id_info: Union[str, Tuple[str, str]]) -> FetchOutcome:
+        """单次获取并解析平台数据（不重试），失败时抛出异常"""
+        id_value, _ = self._split_id_info(id_info)
+        session = get_fetch_session(self.proxy_url)
+        response = session.get(
+            API_URL_TEMPLATE.format(id_value=id_value),
+            headers=self.delta_cache.conditional_headers(id_value),
+            timeout=self.request_timeout,
+        )
+        if response.status_code != 304:
+            response.raise_for_status()
+        return self._apply_response(
+            id_value, response.status_code, response.content, response.headers
+        )
 
-                status = data_json.get("status", "未知")
-                if status not in ["success", "cache"]:
-                    raise ValueError(f"响应状态异常: {status}")
+    async def _fetch_once_async(
+        self, backend, id_info: Union[str, Tuple[str, str]]
+    ) -> FetchOutcome:
+        """单次异步获取并解析平台数据（不重试），失败时抛出异常"""
+        id_value, _ = self._split_id_info(id_info)
+        # 单请求截止时间：连接、读取等各阶段整体不超过 request_timeout
+        status_code, body, headers = await asyncio.wait_for(
+            backend.get(
+                API_URL_TEMPLATE.format(id_value=id_value),
+                timeout=self.request_timeout,
+                headers=self.delta_cache.conditional_headers(id_value),
+            ),
+            timeout=self.request_timeout,
+        )
+        return self._apply_response(id_value, status_code, body, headers)
 
-                status_info = "最新数据" if status == "success" else "缓存数据"
-                print(f"获取 {id_value} 成功（{status_info}）")
-                return data_text, id_value, alias
+    def _retry_settings(self) -> Tuple[int, float, float]:
+        """返回 (最大重试次数, 基础退避秒数, 最大退避秒数)"""
+        if not self.crawl_config:
+            return 2, 1.0, 8.0
+        return (
+            self.crawl_config.CRAWL_MAX_RETRIES,
+            self.crawl_config.CRAWL_RETRY_BASE_DELAY,
+            self.crawl_config.CRAWL_RETRY_MAX_DELAY,
+        )
 
+    def _crawl_deadline(self) -> Optional[float]:
+        """本次抓取的截止时间（monotonic），未配置时返回 None"""
+        seconds = self.crawl_config.CRAWL_DEADLINE if self.crawl_config else 0
+        if seconds <= 0:
+            return None
+        return time.monotonic() + seconds
+
+    def _report_late(self, ids_list: List[Union[str, Tuple[str, str]]], late: List[int]) -> None:
+        if late:
+            late_ids = [self._split_id_info(ids_list[index])[0] for index in sorted(late)]
+            print(f"超过抓取截止时间（{self.crawl_config.CRAWL_DEADLINE} 秒），未完成: {late_ids}")
+
+    def _allow(self, id_info: Union[str, Tuple[str, str]]) -> bool:
+        """熔断检查：平台处于熔断状态时跳过"""
+        id_value, _ = self._split_id_info(id_info)
+        if self.health_board.allow(id_value):
+            return True
+        print(f"平台 {id_value} 处于熔断状态，跳过")
+        return False
+
+    def _make_limiter(self) -> HostRateLimiter:
+        return HostRateLimiter(
+            global_rate=self.crawl_config.CRAWL_RATE_LIMIT if self.crawl_config else 0,
+            per_host_rate=self.crawl_config.CRAWL_HOST_RATE_LIMIT if self.crawl_config else 0,
+        )
+
+    @staticmethod
+    def _make_sequential_pacer(request_interval: int) -> Callable[[str], None]:
+        """顺序模式的节流：除第一个请求外，每个请求前按 request_interval 随机间隔等待"""
+        state = {"first": True}
+
+        def pace(host: str) -> None:
+            if state["first"]:
+                state["first"] = False
+                return
+            actual_interval = request_interval + random.randint(-10, 20)
+            actual_interval = max(50, actual_interval)
+            time.sleep(actual_interval / 1000)
+
+        return pace
+
+    def _crawl_scheduled(
+        self,
+        ids_list: List[Union[str, Tuple[str, str]]],
+        workers: int,
+        pace: Callable[[str], None],
+    ) -> List[Optional[FetchOutcome]]:
+        """
+        线程池抓取 + 重试队列
+
+        失败的平台按抖动指数退避重新入队，其它平台继续抓取；
+        到达截止时间后立即返回，未完成的平台视为失败
+
+        Args:
+            ids_list: 平台列表
+            workers: 线程数（1 表示顺序抓取）
+            pace: 每次请求前调用的节流函数，参数为主机名
+        """
+        max_retries, base_delay, max_delay = self._retry_settings()
+        deadline = self._crawl_deadline()
+        outcomes: List[Optional[FetchOutcome]] = [None] * len(ids_list)
+        ready = deque((index, 0) for index in range(len(ids_list)))
+        retry_queue = RetryQueue(base_delay, max_delay)
+        pending: Dict[Future, Tuple[int, int]] = {}
+
+        def attempt_task(id_info):
+            id_value, _ = self._split_id_info(id_info)
+            pace(urlparse(API_URL_TEMPLATE.format(id_value=id_value)).netloc)
+            started = time.monotonic()
+            try:
+                outcome = self._fetch_once(id_info)
             except Exception as e:
-                retries += 1
-                if retries <= max_retries:
-                    base_wait = random.uniform(min_retry_wait, max_retry_wait)
-                    additional_wait = (retries - 1) * random.uniform(1, 2)
-                    wait_time = base_wait + additional_wait
-                    print(f"请求 {id_value} 失败: {e}. {wait_time:.2f}秒后重试...")
-                    time.sleep(wait_time)
-                else:
-                    print(f"请求 {id_value} 失败: {e}")
-                    return None, id_value, alias
-        return None, id_value, alias
+                self.health_board.record_failure(id_value, time.monotonic() - started, str(e))
+                raise
+            self.health_board.record_success(id_value, time.monotonic() - started)
+            return outcome
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crawl-fetch")
+        try:
+            while ready or pending or retry_queue:
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    break
+
+                ready.extend(retry_queue.pop_ready(now))
+                while ready and len(pending) < workers:
+                    index, attempt = ready.popleft()
+                    if not self._allow(ids_list[index]):
+                        continue
+                    pending[executor.submit(attempt_task, ids_list[index])] = (index, attempt)
+
+                # 等待任一请求完成、下一个重试到期或截止时间
+                timeouts = [retry_queue.next_ready_in(now)]
+                if deadline is not None:
+                    timeouts.append(deadline - now)
+                timeouts = [t for t in timeouts if t is not None]
+                timeout = min(timeouts) if timeouts else None
+
+                if not pending:
+                    time.sleep(timeout or 0)
+                    continue
+
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, attempt = pending.pop(future)
+                    id_value, _ = self._split_id_info(ids_list[index])
+                    try:
+                        outcomes[index] = future.result()
+                    except Exception as e:
+                        if attempt < max_retries:
+                            delay = retry_queue.push(index, attempt + 1)
+                            print(f"请求 {id_value} 失败: {e}. {delay:.2f}秒后重试...")
+                        else:
+                            print(f"请求 {id_value} 失败: {e}")
+        finally:
+            # 截止时间到达时不等待仍在进行中的请求
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self._report_late(
+            ids_list,
+            [index for index, _ in pending.values()]
+            + [index for index, _ in ready]
+            + retry_queue.items(),
+        )
+        return outcomes
+
+    def _crawl_async(
+        self,
+        ids_list: List[Union[str, Tuple[str, str]]],
+        max_workers: int,
+    ) -> List[Optional[FetchOutcome]]:
+        """
+        异步抓取（共享连接池 + 信号量限制并发 + 全局/按主机限速）
+
+        失败的平台在各自协程中退避后重试（退避期间不占用并发名额），
+        到达截止时间后取消未完成的平台
+        """
+        backend = get_async_fetch_backend(
+            HEADERS,
+            proxy_url=self.proxy_url,
+            max_connections=max_workers,
+            http2=self.crawl_config.CRAWL_HTTP2 if self.crawl_config else False,
+        )
+        limiter = self._make_limiter()
+        max_retries, base_delay, max_delay = self._retry_settings()
+        deadline = self._crawl_deadline()
+
+        async def crawl_all():
+            semaphore = asyncio.Semaphore(max_workers)
+
+            async def task(id_info):
+                id_value, _ = self._split_id_info(id_info)
+                host = urlparse(API_URL_TEMPLATE.format(id_value=id_value)).netloc
+                attempt = 0
+                while True:
+                    if not self._allow(id_info):
+                        return None
+                    started = None
+                    try:
+                        async with semaphore:
+                            wait_time = limiter.reserve(host)
+                            if wait_time > 0:
+                                await asyncio.sleep(wait_time)
+                            started = time.monotonic()
+                            outcome = await self._fetch_once_async(backend, id_info)
+                        self.health_board.record_success(id_value, time.monotonic() - started)
+                        return outcome
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        if started is not None:
+                            self.health_board.record_failure(
+                                id_value, time.monotonic() - started, repr(e)
+                            )
+                        if attempt >= max_retries:
+                            print(f"请求 {id_value} 失败: {e!r}")
+                            return None
+                        attempt += 1
+                        delay = backoff_delay(attempt, base_delay, max_delay)
+                        print(f"请求 {id_value} 失败: {e!r}. {delay:.2f}秒后重试...")
+                        await asyncio.sleep(delay)
+
+            tasks = [asyncio.ensure_future(task(id_info)) for id_info in ids_list]
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            _, late = await asyncio.wait(tasks, timeout=timeout)
+            for late_task in late:
+                late_task.cancel()
+            await asyncio.gather(*late, return_exceptions=True)
+
+            self._report_late(ids_list, [i for i, t in enumerate(tasks) if t in late])
+            return [None if t in late else t.result() for t in tasks]
+
+        try:
+            return backend.run(crawl_all())
+        except CancelledError:
+            raise CrawlCancelledError("抓取任务已取消") from None
+
+    def _use_async_backend(self) -> bool:
+        """是否使用异步抓取后端"""
+        if not self.crawl_config or self.crawl_config.CRAWL_BACKEND != "async":
+            return False
+        if not HTTPX_AVAILABLE:
+            print("httpx 未安装，回退到线程池抓取")
+            return False
+        return True
 
     def crawl_websites(
         self,
         ids_list: List[Union[str, Tuple[str, str]]],
         request_interval: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        use_schedule: bool = True,
     ) -> Tuple[Dict, Dict, List]:
-        """爬取多个网站数据"""
+        """
+        爬取多个网站数据
+
+        Args:
+            ids_list: 平台列表，元素为 id 或 (id, name)
+            request_interval: 顺序模式下的请求间隔（毫秒）
+            max_workers: 最大并发数，线程池模式下 <= 1 时使用顺序模式
+            use_schedule: 是否按自适应调度跳过未到抓取时间的平台（手动/API 触发的抓取应传 False）
+
+        内容与最后一次发往下游的相同的平台仍包含在 results 中，其 ID 记录在 last_crawl_unchanged；
+        未到抓取时间的平台沿用上次数据放入 results，其 ID 记录在 last_crawl_carried，
+        只应用于本次报告，不应作为新的抓取记录保存或发送。
+        下游发送成功后应调用 mark_emitted。异步抓取被取消时抛出 CrawlCancelledError
+        """
         if request_interval is None:
             if not self.crawl_config:
                 raise RuntimeError("CrawlConfig 未提供，无法确定请求间隔")
             request_interval = self.crawl_config.REQUEST_INTERVAL
+        if max_workers is None:
+            max_workers = self.crawl_config.CRAWL_MAX_WORKERS if self.crawl_config else 1
+
+        # 自适应调度：未到抓取时间且有缓存的平台沿用上次数据（视为未变化）
+        carried: Dict[str, FetchOutcome] = {}
+        if self.scheduler is not None and use_schedule:
+            _, not_due = self.scheduler.split_due(
+                [self._split_id_info(id_info)[0] for id_info in ids_list]
+            )
+            for id_value in not_due:
+                entry = self.delta_cache.get(id_value)
+                if entry is not None:
+                    carried[id_value] = (copy_titles(entry.titles), True, entry)
+            if carried:
+                print(f"未到抓取时间，沿用上次数据: {list(carried.keys())}")
+        fetch_list = [
+            id_info for id_info in ids_list if self._split_id_info(id_info)[0] not in carried
+        ]
+
+        if not fetch_list:
+            fetched = []
+        elif self._use_async_backend():
+            print(f"异步抓取 {len(fetch_list)} 个平台，最大并发数 {max(1, max_workers)}")
+            fetched = self._crawl_async(fetch_list, max(1, max_workers))
+        elif max_workers > 1 and len(fetch_list) > 1:
+            print(f"并发抓取 {len(fetch_list)} 个平台，最大并发数 {max_workers}")
+            limiter = self._make_limiter()
+            fetched = self._crawl_scheduled(
+                fetch_list, min(max_workers, len(fetch_list)), limiter.acquire
+            )
+        else:
+            fetched = self._crawl_scheduled(
+                fetch_list, 1, self._make_sequential_pacer(request_interval)
+            )
+
+        if self.scheduler is not None:
+            for id_info, outcome in zip(fetch_list, fetched):
+                if outcome is not None:
+                    self.scheduler.observe(self._split_id_info(id_info)[0], outcome[0].keys())
+
+        fetched_by_id = {
+            self._split_id_info(id_info)[0]: outcome
+            for id_info, outcome in zip(fetch_list, fetched)
+        }
+        outcomes = [
+            carried.get(id_value, fetched_by_id.get(id_value))
+            for id_value, _ in map(self._split_id_info, ids_list)
+        ]
+
         results = {}
         id_to_name = {}
         failed_ids = []
+        unchanged_ids = []
+        items_hashes = {}
 
-        for i, id_info in enumerate(ids_list):
-            if isinstance(id_info, tuple):
-                id_value, name = id_info
-            else:
-                id_value = id_info
-                name = id_value
-
+        for id_info, outcome in zip(ids_list, outcomes):
+            id_value, name = self._split_id_info(id_info)
             id_to_name[id_value] = name
-            response, _, _ = self.fetch_data(id_info)
-
-            if response:
-                try:
-                    data = json.loads(response)
-                    results[id_value] = {}
-                    for index, item in enumerate(data.get("items", []), 1):
-                        title = item.get("title")
-                        # 跳过无效标题（None、float、空字符串）
-                        if title is None or isinstance(title, float) or not str(title).strip():
-                            continue
-                        title = str(title).strip()
-                        url = item.get("url", "")
-                        mobile_url = item.get("mobileUrl", "")
-
-                        if title in results[id_value]:
-                            results[id_value][title]["ranks"].append(index)
-                        else:
-                            results[id_value][title] = {
-                                "ranks": [index],
-                                "url": url,
-                                "mobileUrl": mobile_url,
-                            }
-                except json.JSONDecodeError:
-                    print(f"解析 {id_value} 响应失败")
-                    failed_ids.append(id_value)
-                except Exception as e:
-                    print(f"处理 {id_value} 数据出错: {e}")
-                    failed_ids.append(id_value)
+
+            if outcome is not None:
+                results[id_value], unchanged, entry = outcome
+                if id_value in carried:
+                    continue
+                # 只有计入结果的平台才更新增量缓存
+                self.delta_cache.put(id_value, entry)
+                items_hashes[id_value] = entry.items_hash
+                if unchanged:
+                    unchanged_ids.append(id_value)
             else:
                 failed_ids.append(id_value)
 
-            if i < len(ids_list) - 1:
-                actual_interval = request_interval + random.randint(-10, 20)
-                actual_interval = max(50, actual_interval)
-                time.sleep(actual_interval / 1000)
-
+        self.last_crawl_unchanged = unchanged_ids
+        self.last_crawl_carried = list(carried)
+        self.last_crawl_hashes = items_hashes
         print(f"成功: {list(results.keys())}, 失败: {failed_ids}")
+        if unchanged_ids:
+            print(f"内容未变化: {unchanged_ids}")
+        open_platforms = self.health_board.open_platforms()
+        if open_platforms:
+            print(f"熔断中的平台: {open_platforms}")
         return results, id_to_name, failed_ids
 
+    def mark_emitted(self) -> None:
+        """最近一次抓取结果已成功发往下游（或没有下游），之后相同内容的平台视为未变化"""
+        self.delta_cache.mark_emitted(self.last_crawl_hashes)
+
 
 # === 数据处理 ===
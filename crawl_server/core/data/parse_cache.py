@@ -0,0 +1,96 @@
+"""
+快照文件解析缓存
+
+历史快照文件写入后不再变化，按 (路径, mtime_ns, 文件大小) 缓存解析结果，
+文件被覆盖时键随之变化、旧条目自然淘汰。按最近最少使用淘汰，并限制估算内存占用
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# 默认内存上限（按估算大小计）
+DEFAULT_PARSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def estimate_titles_size(titles_by_id: Dict) -> int:
+    """粗略估算解析结果占用的内存（字节）"""
+    size = 0
+    for title_data in titles_by_id.values():
+        for title, data in title_data.items():
+            # 字典、列表和字符串对象本身的开销按 400 字节估算
+            size += 400 + len(title) * 4 + len(data["url"]) + len(data["mobileUrl"])
+    return size
+
+
+class ParseCache:
+    """LRU 解析缓存（线程安全）"""
+
+    def __init__(self, max_bytes: int = DEFAULT_PARSE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        """写入缓存，超过内存上限的单个条目不缓存"""
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def stats(self) -> Dict[str, int]:
+        """命中/未命中次数、条目数和估算内存占用"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+# 进程级共享实例
+_parse_cache_instance: Optional[ParseCache] = None
+_parse_cache_lock = threading.Lock()
+
+
+def get_parse_cache() -> ParseCache:
+    """获取进程级共享的解析缓存（首次调用时创建）"""
+    global _parse_cache_instance
+    with _parse_cache_lock:
+        if _parse_cache_instance is None:
+            _parse_cache_instance = ParseCache()
+        return _parse_cache_instance
+
+
+def reset_parse_cache() -> None:
+    """重置解析缓存（主要用于测试）"""
+    global _parse_cache_instance
+    with _parse_cache_lock:
+        _parse_cache_instance = None
@@ -6,9 +6,41 @@
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-from crawl_server.core.utils import clean_title, format_date_folder
+from crawl_server.core.data.delta_cache import copy_titles
+from crawl_server.core.data.parse_cache import estimate_titles_size, get_parse_cache
+from crawl_server.core.data.snapshot import read_snapshot_file
+from crawl_server.core.utils import clean_title
+from crawl_server.core.utils.file_utils import SNAPSHOT_SUFFIX
 
 def parse_file_titles(file_path: Path) -> Tuple[Dict, Dict]:
+    """
+    解析单个快照文件（二进制 .snap 或 txt）的标题数据，返回(titles_by_id, id_to_name)
+
+    结果按 (路径, mtime_ns, 文件大小) 缓存，返回的是缓存内容的副本，调用方可以随意修改
+    """
+    stat = file_path.stat()
+    key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+    cache = get_parse_cache()
+    cached = cache.get(key)
+    if cached is None:
+        cached = _parse_file_titles(file_path)
+        cache.put(key, cached, estimate_titles_size(cached[0]))
+
+    titles_by_id, id_to_name = cached
+    return (
+        {source_id: copy_titles(title_data) for source_id, title_data in titles_by_id.items()},
+        dict(id_to_name),
+    )
+
+
+def _parse_file_titles(file_path: Path) -> Tuple[Dict, Dict]:
+    if file_path.suffix == SNAPSHOT_SUFFIX:
+        titles_by_id, id_to_name, _ = read_snapshot_file(file_path)
+        return titles_by_id, id_to_name
+    return _parse_txt_titles(file_path)
+
+
+def _parse_txt_titles(file_path: Path) -> Tuple[Dict, Dict]:
     """解析单个txt文件的标题数据，返回(titles_by_id, id_to_name)"""
     titles_by_id = {}
     id_to_name = {}
@@ -158,106 +190,17 @@ def process_source_data(
 def read_all_today_titles(
     current_platform_ids: Optional[List[str]] = None,
 ) -> Tuple[Dict, Dict, Dict]:
-    """读取当天所有标题文件，支持按当前监控平台过滤"""
-    date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
-
-    if not txt_dir.exists():
-        return {}, {}, {}
-
-    all_results = {}
-    final_id_to_name = {}
-    title_info = {}
-
-    files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
-
-    for file_path in files:
-        time_info = file_path.stem
-
-        titles_by_id, file_id_to_name = parse_file_titles(file_path)
-
-        if current_platform_ids is not None:
-            filtered_titles_by_id = {}
-            filtered_id_to_name = {}
-
-            for source_id, title_data in titles_by_id.items():
-                if source_id in current_platform_ids:
-                    filtered_titles_by_id[source_id] = title_data
-                    if source_id in file_id_to_name:
-                        filtered_id_to_name[source_id] = file_id_to_name[source_id]
-
-            titles_by_id = filtered_titles_by_id
-            file_id_to_name = filtered_id_to_name
-
-        final_id_to_name.update(file_id_to_name)
-
-        for source_id, title_data in titles_by_id.items():
-            process_source_data(
-                source_id, title_data, time_info, all_results, title_info
-            )
-
-    return all_results, final_id_to_name, title_info
-
+    """读取当天所有标题（来自当日累计状态），支持按当前监控平台过滤"""
+    from crawl_server.core.data.day_state import get_day_state
 
+    return get_day_state().results(current_platform_ids)
 
 
 def detect_latest_new_titles(current_platform_ids: Optional[List[str]] = None) -> Dict:
-    """检测当日最新批次的新增标题，支持按当前监控平台过滤"""
-    date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
-
-    if not txt_dir.exists():
-        return {}
-
-    files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
-    if len(files) < 2:
-        return {}
-
-    # 解析最新文件
-    latest_file = files[-1]
-    latest_titles, _ = parse_file_titles(latest_file)
-
-    # 如果指定了当前平台列表，过滤最新文件数据
-    if current_platform_ids is not None:
-        filtered_latest_titles = {}
-        for source_id, title_data in latest_titles.items():
-            if source_id in current_platform_ids:
-                filtered_latest_titles[source_id] = title_data
-        latest_titles = filtered_latest_titles
-
-    # 汇总历史标题（按平台过滤）
-    historical_titles = {}
-    for file_path in files[:-1]:
-        historical_data, _ = parse_file_titles(file_path)
-
-        # 过滤历史数据
-        if current_platform_ids is not None:
-            filtered_historical_data = {}
-            for source_id, title_data in historical_data.items():
-                if source_id in current_platform_ids:
-                    filtered_historical_data[source_id] = title_data
-            historical_data = filtered_historical_data
-
-        for source_id, titles_data in historical_data.items():
-            if source_id not in historical_titles:
-                historical_titles[source_id] = set()
-            for title in titles_data.keys():
-                historical_titles[source_id].add(title)
-
-    # 找出新增标题
-    new_titles = {}
-    for source_id, latest_source_titles in latest_titles.items():
-        historical_set = historical_titles.get(source_id, set())
-        source_new_titles = {}
-
-        for title, title_data in latest_source_titles.items():
-            if title not in historical_set:
-                source_new_titles[title] = title_data
-
-        if source_new_titles:
-            new_titles[source_id] = source_new_titles
-
-    return new_titles
+    """检测当日最新批次的新增标题（来自当日累计状态），支持按当前监控平台过滤"""
+    from crawl_server.core.data.day_state import get_day_state
+
+    return get_day_state().new_titles(current_platform_ids)
 
 # split_content_into_batches 已移至 crawl_server.connections
 
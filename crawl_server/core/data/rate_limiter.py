@@ -0,0 +1,81 @@
+"""
+请求限速器
+
+负责控制对上游 API 的请求速率（全局预算 + 按主机的礼貌预算）
+"""
+import threading
+import time
+from typing import Dict
+
+
+class RateLimiter:
+    """令牌桶限速器（线程安全，基于 GCRA 实现）"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        初始化限速器
+
+        Args:
+            rate: 每秒允许的请求数，<= 0 表示不限速
+            burst: 允许的突发请求数
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._tat = 0.0  # 理论到达时间（theoretical arrival time）
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """预约一个请求名额，返回需要等待的秒数"""
+        if self._interval <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            wait_time = tat - now - (self.burst - 1) * self._interval
+            self._tat = tat + self._interval
+        return max(0.0, wait_time)
+
+    def acquire(self) -> None:
+        """阻塞直到获得请求名额"""
+        wait_time = self.reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+
+class HostRateLimiter:
+    """组合限速器：全局请求预算 + 每个主机的礼貌预算"""
+
+    def __init__(self, global_rate: float, per_host_rate: float, burst: int = 1):
+        """
+        初始化组合限速器
+
+        Args:
+            global_rate: 全局每秒请求数，<= 0 表示不限速
+            per_host_rate: 单个主机每秒请求数，<= 0 表示不限速
+            burst: 允许的突发请求数
+        """
+        self.per_host_rate = per_host_rate
+        self.burst = burst
+        self._global = RateLimiter(global_rate, burst)
+        self._hosts: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def _host_limiter(self, host: str) -> RateLimiter:
+        with self._lock:
+            limiter = self._hosts.get(host)
+            if limiter is None:
+                limiter = RateLimiter(self.per_host_rate, self.burst)
+                self._hosts[host] = limiter
+            return limiter
+
+    def reserve(self, host: str) -> float:
+        """同时预约全局和主机名额，返回需要等待的秒数"""
+        return max(self._global.reserve(), self._host_limiter(host).reserve())
+
+    def acquire(self, host: str) -> None:
+        """阻塞直到同时获得全局和主机名额"""
+        wait_time = self.reserve(host)
+        if wait_time > 0:
+            time.sleep(wait_time)
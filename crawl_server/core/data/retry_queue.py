@@ -0,0 +1,72 @@
+"""
+重试队列
+
+失败的抓取任务按抖动指数退避重新入队，到期后再取出重试，
+不阻塞其它平台的抓取
+"""
+import heapq
+import itertools
+import random
+import time
+from typing import Any, List, Optional, Tuple
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """
+    计算第 attempt 次重试前的退避时间（指数退避 + 等额抖动）
+
+    Args:
+        attempt: 重试次数（从 1 开始）
+        base_delay: 基础退避时间（秒）
+        max_delay: 最大退避时间（秒）
+    """
+    delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class RetryQueue:
+    """按到期时间排序的重试队列（最小堆）"""
+
+    def __init__(self, base_delay: float = 1.0, max_delay: float = 8.0):
+        """
+        初始化重试队列
+
+        Args:
+            base_delay: 基础退避时间（秒）
+            max_delay: 最大退避时间（秒）
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._heap: List[Tuple[float, int, Any, int]] = []
+        self._seq = itertools.count()  # 到期时间相同时保持入队顺序
+
+    def push(self, item: Any, attempt: int) -> float:
+        """将任务重新入队，返回退避时间（秒）"""
+        delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), item, attempt))
+        return delay
+
+    def pop_ready(self, now: Optional[float] = None) -> List[Tuple[Any, int]]:
+        """取出所有已到期的任务，返回 [(item, attempt)]"""
+        if now is None:
+            now = time.monotonic()
+        ready = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, item, attempt = heapq.heappop(self._heap)
+            ready.append((item, attempt))
+        return ready
+
+    def next_ready_in(self, now: Optional[float] = None) -> Optional[float]:
+        """距离下一个任务到期的秒数，队列为空时返回 None"""
+        if not self._heap:
+            return None
+        if now is None:
+            now = time.monotonic()
+        return max(0.0, self._heap[0][0] - now)
+
+    def items(self) -> List[Any]:
+        """队列中尚未重试的任务"""
+        return [entry[2] for entry in self._heap]
+
+    def __len__(self) -> int:
+        return len(self._heap)
@@ -0,0 +1,65 @@
+"""
+二进制快照读写
+
+格式定义和编解码在 trendradar_formats.snapshot（mcp_server 共用），
+这里负责按 txt 格式的规则规范化抓取结果（当日标题日志共用）以及快照文件的读写
+"""
+import os
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from trendradar_formats.snapshot import (
+    SNAPSHOT_MAGIC,
+    SNAPSHOT_VERSION,
+    SnapshotFormatError,
+    decode_snapshot,
+    encode_snapshot_records,
+)
+from crawl_server.core.utils import clean_title
+
+
+def normalize_results(
+    results: Dict, id_to_name: Dict
+) -> List[Tuple[str, str, List[Tuple[List[int], str, str, str]]]]:
+    """
+    按 txt 格式的规则规范化抓取结果：清洗标题、缺省排名为 [1]、按首个排名排序、跳过无标题平台
+
+    Returns:
+        [(平台ID, 平台名称, [(ranks, title, url, mobile_url), ...]), ...]
+    """
+    platforms = []
+    for id_value, title_data in results.items():
+        records = []
+        for title, info in title_data.items():
+            if isinstance(info, dict):
+                ranks = info.get("ranks", [])
+                url = info.get("url", "")
+                mobile_url = info.get("mobileUrl", "")
+            else:
+                ranks = info if isinstance(info, list) else []
+                url = ""
+                mobile_url = ""
+            records.append((ranks or [1], clean_title(title), url or "", mobile_url or ""))
+        if records:
+            records.sort(key=lambda x: x[0][0])
+            platforms.append((id_value, id_to_name.get(id_value) or id_value, records))
+    return platforms
+
+
+def encode_snapshot(results: Dict, id_to_name: Dict, failed_ids: List) -> bytes:
+    """将抓取结果编码为二进制快照（规范化规则见 normalize_results）"""
+    return encode_snapshot_records(normalize_results(results, id_to_name), failed_ids)
+
+
+def write_snapshot_file(file_path: str, results: Dict, id_to_name: Dict, failed_ids: List) -> None:
+    """写入快照文件（先写临时文件再替换，读取方不会看到写了一半的文件）"""
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(encode_snapshot(results, id_to_name, failed_ids))
+    os.replace(tmp_path, file_path)
+
+
+def read_snapshot_file(file_path: Path) -> Tuple[Dict, Dict, List]:
+    """读取快照文件，返回 (titles_by_id, id_to_name, failed_ids)"""
+    with open(file_path, "rb") as f:
+        return decode_snapshot(f.read())
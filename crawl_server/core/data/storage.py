@@ -3,13 +3,33 @@
 
 负责将数据保存到文件
 """
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 
+from crawl_server.core.data.day_log import DayLogFormatError, append_day_log
+from crawl_server.core.data.day_state import get_day_state
+from crawl_server.core.data.snapshot import write_snapshot_file
 from crawl_server.core.utils import clean_title, format_time_filename, get_output_path
+from crawl_server.core.utils.file_utils import (
+    DAY_LOG_FILENAME,
+    SNAPSHOT_SUBFOLDER,
+    SNAPSHOT_SUFFIX,
+    TXT_SUBFOLDER,
+)
+
+@dataclass
+class CrawlSnapshot:
+    """一次抓取保存后的句柄，供后续阶段直接使用，无需再次写入或读取快照"""
+    path: str  # 保存位置（当日标题日志，导出或改存快照文件时为快照文件路径）
+    time_info: str  # 抓取时间（快照文件名，如 "10时30分"）
+    results: Dict
+    id_to_name: Dict
+    failed_ids: List
+
 
 def save_titles_to_file(results: Dict, id_to_name: Dict, failed_ids: List) -> str:
     """保存标题到文件"""
-    file_path = get_output_path("txt", f"{format_time_filename()}.txt")
+    file_path = get_output_path(TXT_SUBFOLDER, f"{format_time_filename()}.txt")
 
     with open(file_path, "w", encoding="utf-8") as f:
         for id_value, title_data in results.items():
@@ -57,5 +77,61 @@ def save_titles_to_file(results: Dict, id_to_name: Dict, failed_ids: List) -> st
     return file_path
 
 
+def save_crawl_snapshot(
+    results: Dict,
+    id_to_name: Dict,
+    failed_ids: List,
+    export_txt: bool = False,
+    export_snapshot: bool = False,
+    carried_ids: Optional[List] = None,
+) -> CrawlSnapshot:
+    """
+    将本次抓取追加到当日标题日志并合并到当日累计状态
+
+    Args:
+        results: 抓取结果
+        id_to_name: 平台ID到名称的映射
+        failed_ids: 失败的平台ID列表
+        export_txt: 是否同时导出 txt 文件
+        export_snapshot: 是否同时导出单次抓取的二进制快照文件
+        carried_ids: 沿用上次数据、本次未实际抓取的平台ID，只保留在返回的 results 中，
+            不写入日志和导出文件（否则会被当作新的出现，抬高出现次数和最后出现时间）
+    """
+    time_filename = format_time_filename()
+    file_path = get_output_path(SNAPSHOT_SUBFOLDER, DAY_LOG_FILENAME)
+    observed = results
+    if carried_ids:
+        carried_set = set(carried_ids)
+        observed = {
+            id_value: title_data
+            for id_value, title_data in results.items()
+            if id_value not in carried_set
+        }
+    try:
+        append_day_log(time_filename, observed, id_to_name)
+    except (OSError, DayLogFormatError) as e:
+        # 读取方会从快照文件补上日志中缺少的这次抓取
+        print(f"追加当日标题日志失败，改为保存快照文件: {e}")
+        export_snapshot = True
+
+    if export_snapshot:
+        file_path = get_output_path(SNAPSHOT_SUBFOLDER, f"{time_filename}{SNAPSHOT_SUFFIX}")
+        write_snapshot_file(file_path, observed, id_to_name, failed_ids)
+
+    # 读取日志新追加的部分，合并到当日累计状态
+    get_day_state()
+
+    if export_txt:
+        save_titles_to_file(observed, id_to_name, failed_ids)
+
+    return CrawlSnapshot(
+        path=file_path,
+        time_info=time_filename,
+        results=results,
+        id_to_name=id_to_name,
+        failed_ids=failed_ids,
+    )
+
+
 # load_frequency_words 已移至 crawl_server.utils.data_utils
 
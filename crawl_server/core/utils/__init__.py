@@ -10,8 +10,17 @@ from .time_utils import (
     format_time_display,
 )
 from .string_utils import clean_title, html_escape, strip_markdown
-from .file_utils import ensure_directory_exists, get_output_path, is_first_crawl_today
+from .file_utils import (
+    ensure_directory_exists,
+    get_output_path,
+    is_first_crawl_today,
+    link_or_copy_file,
+    list_snapshot_files,
+    write_text_chunks,
+)
 from .format_utils import format_rank_display
+from .http_utils import close_http_sessions, get_http_session
+from .json_utils import json_loads
 from .version_utils import check_version_update
 from .statistics_utils import (
     calculate_news_weight,
@@ -22,9 +31,12 @@ from .contents import (
     format_title_for_platform,
     render_dingtalk_content,
     render_feishu_content,
+    iter_html_content,
     render_html_content,
 )
 from .data_utils import load_frequency_words, prepare_report_data
+from .word_matcher import WordMatcher, get_word_matcher
+from .weight_utils import TopNewsSelector
 from .render_utils import generate_html_report
 
 __all__ = [
@@ -41,14 +53,25 @@ __all__ = [
     "ensure_directory_exists",
     "get_output_path",
     "is_first_crawl_today",
+    "link_or_copy_file",
+    "list_snapshot_files",
+    "write_text_chunks",
+    # HTTP 工具
+    "get_http_session",
+    "close_http_sessions",
     # 格式化工具
     "format_rank_display",
+    # JSON 工具
+    "json_loads",
     # 版本工具
     "check_version_update",
     # 统计工具
     "calculate_news_weight",
     "count_word_frequency",
     "matches_word_groups",
+    "WordMatcher",
+    "get_word_matcher",
+    "TopNewsSelector",
     # 数据处理工具
     "load_frequency_words",
     "prepare_report_data",
@@ -57,6 +80,7 @@ __all__ = [
     "generate_html_report",
     "render_dingtalk_content",
     "render_feishu_content",
+    "iter_html_content",
     "render_html_content",
 ]
 
@@ -4,8 +4,10 @@ HTML 内容渲染
 用于生成 HTML 报告内容
 """
 import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from crawl_server.core.utils.string_utils import html_escape
 from crawl_server.core.utils.time_utils import get_beijing_time
@@ -17,18 +19,108 @@ def _get_template_path(filename: str) -> Path:
     return template_dir / filename
 
 
-def _load_template(filename: str) -> str:
+# 模板占位符，如 {title_html}（CSS/JS 中的花括号不会匹配）
+_PLACEHOLDER_PATTERN = re.compile(r"\{([a-z_]+)\}")
+
+
+class _CompiledTemplate:
+    """预先按占位符切分好的模板，渲染时只需填入各占位符的值再拼接一次"""
+
+    def __init__(self, source: str):
+        self._parts: List[str] = []
+        self._slots: List[Tuple[int, str]] = []  # (在 _parts 中的位置, 占位符名)
+        pos = 0
+        for match in _PLACEHOLDER_PATTERN.finditer(source):
+            self._parts.append(source[pos:match.start()])
+            self._slots.append((len(self._parts), match.group(1)))
+            # 未提供值的占位符保持原样
+            self._parts.append(match.group(0))
+            pos = match.end()
+        self._parts.append(source[pos:])
+
+    def render(self, values: Dict[str, str]) -> str:
+        parts = self._parts[:]
+        for index, name in self._slots:
+            value = values.get(name)
+            if value is not None:
+                parts[index] = value
+        return "".join(parts)
+
+    def iter_render(self, values: Dict) -> Iterator[str]:
+        """逐块输出渲染结果，值可以是字符串或产生字符串的可迭代对象（只消费一次）"""
+        slots = dict(self._slots)
+        for index, part in enumerate(self._parts):
+            value = values.get(slots[index]) if index in slots else None
+            if value is None:
+                yield part
+            elif isinstance(value, str):
+                yield value
+            else:
+                yield from value
+
+
+# 已编译模板缓存：文件名 -> (HTML/CSS/JS 文件的 (mtime_ns, 大小), 已编译模板)
+_template_cache: Dict[str, Tuple[Tuple, _CompiledTemplate]] = {}
+_template_cache_lock = threading.Lock()
+
+# 已渲染的新闻项缓存：(序号, 渲染用到的字段) -> HTML（任一模板重新加载时清空）
+# 当日汇总中已下榜的标题出现次数和时间不再变化，每次生成报告只需重新渲染仍在榜上的标题
+_FRAGMENT_CACHE_SIZE = 8192
+_fragment_cache: "OrderedDict[Tuple, str]" = OrderedDict()
+
+
+def _template_files(filename: str) -> List[Path]:
+    """模板文件及（HTML 模板的）同名 CSS、JS 文件"""
+    template_path = _get_template_path(filename)
+    if not filename.endswith('.html'):
+        return [template_path]
+    return [
+        template_path,
+        template_path.parent / filename.replace('.html', '.css'),
+        template_path.parent / filename.replace('.html', '.js'),
+    ]
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _get_template(filename: str) -> _CompiledTemplate:
     """
-    加载模板文件内容
-    
-    注意：此函数每次调用都会重新读取文件，确保模板文件的修改能够立即生效。
-    无需重启服务，修改 HTML 模板、CSS 或 JS 文件后下次生成报告时即可看到效果。
+    获取已编译的模板
+
+    按模板及其 CSS、JS 文件的修改时间和大小缓存，文件修改后下次生成报告时自动重新加载，无需重启服务。
     """
+    signature = tuple(_file_signature(path) for path in _template_files(filename))
+    with _template_cache_lock:
+        cached = _template_cache.get(filename)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    compiled = _CompiledTemplate(_load_template(filename))
+    with _template_cache_lock:
+        _template_cache[filename] = (signature, compiled)
+        _fragment_cache.clear()
+    return compiled
+
+
+def clear_template_cache() -> None:
+    """清空已编译模板和词组片段缓存（主要用于测试）"""
+    with _template_cache_lock:
+        _template_cache.clear()
+        _fragment_cache.clear()
+
+
+def _load_template(filename: str) -> str:
+    """从磁盘读取模板文件内容，HTML 模板会插入同名的 CSS 和 JS 文件"""
     template_path = _get_template_path(filename)
     if not template_path.exists():
         raise FileNotFoundError(f"模板文件不存在: {template_path}")
     
-    # 每次调用都重新读取文件，不使用缓存
     with open(template_path, "r", encoding="utf-8") as f:
         template = f.read()
     
@@ -57,123 +149,169 @@ def _generate_error_section(failed_ids: List[str]) -> str:
         return ""
     
     # 加载错误项模板
-    error_item_template = _load_template("error_item.html")
-    error_items = ""
-    
-    for id_value in failed_ids:
-        item_html = error_item_template.replace("{error_id}", html_escape(id_value))
-        error_items += item_html
+    error_item_template = _get_template("error_item.html")
+    error_items = "".join(
+        error_item_template.render({"error_id": html_escape(id_value)})
+        for id_value in failed_ids
+    )
     
     # 加载错误部分外层模板
-    error_section_template = _load_template("error_section.html")
-    return error_section_template.replace("{error_items}", error_items)
+    error_section_template = _get_template("error_section.html")
+    return error_section_template.render({"error_items": error_items})
 
 
 def _generate_stats_section(stats: List[Dict]) -> str:
     """生成统计数据部分 HTML"""
+    return "".join(_iter_stats_section(stats))
+
+
+def _news_item_key(number: int, title_data: Dict) -> Tuple:
+    """新闻项的缓存键，覆盖渲染用到的所有字段（包括每次抓取都会变化的出现次数和时间）"""
+    return (
+        number,
+        title_data["title"],
+        title_data["source_name"],
+        title_data.get("is_new", False),
+        tuple(title_data.get("ranks", [])),
+        title_data.get("rank_threshold", 10),
+        title_data.get("time_display", ""),
+        title_data.get("count", 1),
+        title_data.get("mobile_url"),
+        title_data.get("url", ""),
+    )
+
+
+def _iter_stats_section(stats: List[Dict]) -> Iterator[str]:
+    """
+    逐个词组生成统计数据部分 HTML
+
+    已渲染的新闻项逐条缓存，只有内容（排名、次数、时间等）变化的新闻项才重新渲染；
+    带序号、总数和条数的词组头部开销很小，每次都重新填充
+    """
     if not stats:
-        return ""
+        return
     
     # 加载模板
-    word_group_template = _load_template("word_group_outer.html")
-    news_item_template = _load_template("news_item.html")
+    word_group_template = _get_template("word_group_outer.html")
+    news_item_template = _get_template("news_item.html")
     
     total_count = len(stats)
-    stats_html = ""
     
     for i, stat in enumerate(stats, 1):
-        count = stat["count"]
+        keys = [_news_item_key(j, title_data) for j, title_data in enumerate(stat["titles"], 1)]
+        with _template_cache_lock:
+            news_items = [_fragment_cache.get(key) for key in keys]
+            for key, item in zip(keys, news_items):
+                if item is not None:
+                    _fragment_cache.move_to_end(key)
+
+        rendered = {}
+        for j, title_data in enumerate(stat["titles"], 1):
+            if news_items[j - 1] is None:
+                news_items[j - 1] = rendered[keys[j - 1]] = _render_news_item(j, title_data, news_item_template)
+        if rendered:
+            with _template_cache_lock:
+                _fragment_cache.update(rendered)
+                while len(_fragment_cache) > _FRAGMENT_CACHE_SIZE:
+                    _fragment_cache.popitem(last=False)
+
+        yield _render_word_group(stat, i, total_count, word_group_template, "".join(news_items))
+
+
+def _render_word_group(
+    stat: Dict,
+    index: int,
+    total_count: int,
+    word_group_template: _CompiledTemplate,
+    news_items: str,
+) -> str:
+    """渲染单个词组的 HTML 片段（news_items 为已渲染的新闻列表）"""
+    count = stat["count"]
+    
+    # 确定热度等级
+    if count >= 10:
+        count_class = "hot"
+    elif count >= 5:
+        count_class = "warm"
+    else:
+        count_class = ""
+    
+    # 填充 word-group 模板
+    return word_group_template.render({
+        "word_name": html_escape(stat["word"]),
+        "count_class": count_class,
+        "count": str(count),
+        "index": str(index),
+        "total_count": str(total_count),
+        "news_items": news_items,
+    })
+
+
+def _render_news_item(j: int, title_data: Dict, news_item_template: _CompiledTemplate) -> str:
+    """渲染单条新闻项 HTML（j 为词组内序号）"""
+    is_new = title_data.get("is_new", False)
+    new_class = "new" if is_new else ""
+    
+    # 处理排名显示
+    rank_html = ""
+    ranks = title_data.get("ranks", [])
+    if ranks:
+        min_rank = min(ranks)
+        max_rank = max(ranks)
+        rank_threshold = title_data.get("rank_threshold", 10)
         
-        # 确定热度等级
-        if count >= 10:
-            count_class = "hot"
-        elif count >= 5:
-            count_class = "warm"
+        # 确定排名等级
+        if min_rank <= 3:
+            rank_class = "top"
+        elif min_rank <= rank_threshold:
+            rank_class = "high"
         else:
-            count_class = ""
-        
-        escaped_word = html_escape(stat["word"])
-        
-        # 生成新闻项
-        news_items = ""
-        for j, title_data in enumerate(stat["titles"], 1):
-            is_new = title_data.get("is_new", False)
-            new_class = "new" if is_new else ""
-            
-            # 处理排名显示
-            rank_html = ""
-            ranks = title_data.get("ranks", [])
-            if ranks:
-                min_rank = min(ranks)
-                max_rank = max(ranks)
-                rank_threshold = title_data.get("rank_threshold", 10)
-                
-                # 确定排名等级
-                if min_rank <= 3:
-                    rank_class = "top"
-                elif min_rank <= rank_threshold:
-                    rank_class = "high"
-                else:
-                    rank_class = ""
-                
-                if min_rank == max_rank:
-                    rank_text = str(min_rank)
-                else:
-                    rank_text = f"{min_rank}-{max_rank}"
-                
-                rank_html = f'<span class="rank-num {rank_class}">{rank_text}</span>'
-            
-            # 处理时间显示
-            time_html = ""
-            time_display = title_data.get("time_display", "")
-            if time_display:
-                simplified_time = (
-                    time_display.replace(" ~ ", "~")
-                    .replace("[", "")
-                    .replace("]", "")
-                )
-                time_html = f'<span class="time-info">{html_escape(simplified_time)}</span>'
-            
-            # 处理出现次数
-            count_html = ""
-            count_info = title_data.get("count", 1)
-            if count_info > 1:
-                count_html = f'<span class="count-info">{count_info}次</span>'
-            
-            # 处理标题和链接
-            escaped_title = html_escape(title_data["title"])
-            link_url = title_data.get("mobile_url") or title_data.get("url", "")
-            
-            if link_url:
-                escaped_url = html_escape(link_url)
-                title_html = f'<a href="{escaped_url}" target="_blank" class="news-link">{escaped_title}</a>'
-            else:
-                title_html = escaped_title
-            
-            # 替换新闻项模板
-            news_item_html = news_item_template
-            news_item_html = news_item_html.replace("{news_number}", str(j))
-            news_item_html = news_item_html.replace("{new_class}", new_class)
-            news_item_html = news_item_html.replace("{source_name}", html_escape(title_data["source_name"]))
-            news_item_html = news_item_html.replace("{rank_html}", rank_html)
-            news_item_html = news_item_html.replace("{time_html}", time_html)
-            news_item_html = news_item_html.replace("{count_html}", count_html)
-            news_item_html = news_item_html.replace("{title_html}", title_html)
-            
-            news_items += news_item_html
+            rank_class = ""
         
-        # 替换 word-group 模板
-        word_group_html = word_group_template
-        word_group_html = word_group_html.replace("{word_name}", escaped_word)
-        word_group_html = word_group_html.replace("{count_class}", count_class)
-        word_group_html = word_group_html.replace("{count}", str(count))
-        word_group_html = word_group_html.replace("{index}", str(i))
-        word_group_html = word_group_html.replace("{total_count}", str(total_count))
-        word_group_html = word_group_html.replace("{news_items}", news_items)
+        if min_rank == max_rank:
+            rank_text = str(min_rank)
+        else:
+            rank_text = f"{min_rank}-{max_rank}"
         
-        stats_html += word_group_html
+        rank_html = f'<span class="rank-num {rank_class}">{rank_text}</span>'
+    
+    # 处理时间显示
+    time_html = ""
+    time_display = title_data.get("time_display", "")
+    if time_display:
+        simplified_time = (
+            time_display.replace(" ~ ", "~")
+            .replace("[", "")
+            .replace("]", "")
+        )
+        time_html = f'<span class="time-info">{html_escape(simplified_time)}</span>'
     
-    return stats_html
+    # 处理出现次数
+    count_html = ""
+    count_info = title_data.get("count", 1)
+    if count_info > 1:
+        count_html = f'<span class="count-info">{count_info}次</span>'
+    
+    # 处理标题和链接
+    escaped_title = html_escape(title_data["title"])
+    link_url = title_data.get("mobile_url") or title_data.get("url", "")
+    
+    if link_url:
+        escaped_url = html_escape(link_url)
+        title_html = f'<a href="{escaped_url}" target="_blank" class="news-link">{escaped_title}</a>'
+    else:
+        title_html = escaped_title
+    
+    # 填充新闻项模板
+    return news_item_template.render({
+        "news_number": str(j),
+        "new_class": new_class,
+        "source_name": html_escape(title_data["source_name"]),
+        "rank_html": rank_html,
+        "time_html": time_html,
+        "count_html": count_html,
+        "title_html": title_html,
+    })
 
 
 def _generate_new_titles_section(new_titles: List[Dict]) -> str:
@@ -182,19 +320,19 @@ def _generate_new_titles_section(new_titles: List[Dict]) -> str:
         return ""
     
     # 加载模板
-    new_section_template = _load_template("new_section_outer.html")
-    new_source_group_template = _load_template("new_source_group.html")
-    new_item_template = _load_template("new_item.html")
+    new_section_template = _get_template("new_section_outer.html")
+    new_source_group_template = _get_template("new_source_group.html")
+    new_item_template = _get_template("new_item.html")
     
     total_new_count = sum(len(source["titles"]) for source in new_titles)
     
-    source_groups = ""
+    source_groups = []
     for source_data in new_titles:
         escaped_source = html_escape(source_data["source_name"])
         titles_count = len(source_data["titles"])
         
         # 生成新增新闻项
-        new_items = ""
+        new_items = []
         for idx, title_data in enumerate(source_data["titles"], 1):
             ranks = title_data.get("ranks", [])
             
@@ -224,29 +362,26 @@ def _generate_new_titles_section(new_titles: List[Dict]) -> str:
             else:
                 title_html = escaped_title
             
-            # 替换新增项模板
-            new_item_html = new_item_template
-            new_item_html = new_item_html.replace("{index}", str(idx))
-            new_item_html = new_item_html.replace("{rank_class}", rank_class)
-            new_item_html = new_item_html.replace("{rank_text}", rank_text)
-            new_item_html = new_item_html.replace("{title_html}", title_html)
-            
-            new_items += new_item_html
-        
-        # 替换来源组模板
-        source_group_html = new_source_group_template
-        source_group_html = source_group_html.replace("{source_name}", escaped_source)
-        source_group_html = source_group_html.replace("{titles_count}", str(titles_count))
-        source_group_html = source_group_html.replace("{new_items}", new_items)
+            # 填充新增项模板
+            new_items.append(new_item_template.render({
+                "index": str(idx),
+                "rank_class": rank_class,
+                "rank_text": rank_text,
+                "title_html": title_html,
+            }))
         
-        source_groups += source_group_html
+        # 填充来源组模板
+        source_groups.append(new_source_group_template.render({
+            "source_name": escaped_source,
+            "titles_count": str(titles_count),
+            "new_items": "".join(new_items),
+        }))
     
-    # 替换新增部分外层模板
-    new_section_html = new_section_template
-    new_section_html = new_section_html.replace("{total_new_count}", str(total_new_count))
-    new_section_html = new_section_html.replace("{source_groups}", source_groups)
-    
-    return new_section_html
+    # 填充新增部分外层模板
+    return new_section_template.render({
+        "total_new_count": str(total_new_count),
+        "source_groups": "".join(source_groups),
+    })
 
 
 def _generate_update_info_section(update_info: Optional[Dict]) -> str:
@@ -271,11 +406,20 @@ def render_html_content(
     """
     渲染HTML内容
     
-    注意：每次调用此函数时都会重新从磁盘读取模板文件，
-    因此修改 HTML 模板文件后，下次生成报告时会自动使用最新的模板，无需重启服务。
+    模板按文件修改时间缓存，修改 HTML 模板、CSS 或 JS 文件后，下次生成报告时会自动使用最新的模板，无需重启服务。
     """
-    # 每次调用都重新加载模板文件（不使用缓存）
-    template = _load_template("report_template.html")
+    return "".join(iter_html_content(report_data, total_titles, is_daily_summary, mode, update_info))
+
+
+def iter_html_content(
+    report_data: Dict,
+    total_titles: int,
+    is_daily_summary: bool = False,
+    mode: str = "daily",
+    update_info: Optional[Dict] = None,
+) -> Iterator[str]:
+    """逐块渲染HTML内容（各词组分别输出），拼接结果与 render_html_content 相同"""
+    template = _get_template("report_template.html")
     
     # 处理报告类型显示
     if is_daily_summary:
@@ -295,23 +439,21 @@ def render_html_content(
     now = get_beijing_time()
     generate_time = now.strftime("%m-%d %H:%M")
     
-    # 生成各个部分的内容
-    error_section = _generate_error_section(report_data.get("failed_ids", []))
-    stats_section = _generate_stats_section(report_data.get("stats", []))
-    new_titles_section = _generate_new_titles_section(report_data.get("new_titles", []))
-    update_info_section = _generate_update_info_section(update_info)
+    # 内容部分：错误信息、各词组统计、新增新闻，按顺序生成
+    def content_section() -> Iterator[str]:
+        yield _generate_error_section(report_data.get("failed_ids", []))
+        yield from _iter_stats_section(report_data.get("stats", []))
+        yield _generate_new_titles_section(report_data.get("new_titles", []))
     
-    # 组合内容部分
-    content_section = error_section + stats_section + new_titles_section
-    
-    # 使用正则表达式替换占位符（避免与 CSS 花括号冲突）
-    html = template
-    html = re.sub(r'\{report_type\}', report_type, html)
-    html = re.sub(r'\{total_titles\}', str(total_titles), html)
-    html = re.sub(r'\{hot_news_count\}', str(hot_news_count), html)
-    html = re.sub(r'\{generate_time\}', generate_time, html)
-    html = re.sub(r'\{content_section\}', content_section, html)
-    html = re.sub(r'\{update_info_section\}', update_info_section, html)
+    update_info_section = _generate_update_info_section(update_info)
     
-    return html
+    # 填充占位符（按原样插入，不做转义处理）
+    yield from template.iter_render({
+        "report_type": report_type,
+        "total_titles": str(total_titles),
+        "hot_news_count": str(hot_news_count),
+        "generate_time": generate_time,
+        "content_section": content_section(),
+        "update_info_section": update_info_section,
+    })
 
@@ -8,7 +8,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from crawl_server.configs import CrawlConfig
-from crawl_server.core.utils.statistics_utils import matches_word_groups
+from crawl_server.core.utils.word_matcher import MATCHED_GROUP_KEYS, get_word_matcher
 
 
 def load_frequency_words(
@@ -104,11 +104,19 @@ def prepare_report_data(
     if not hide_new_section:
         filtered_new_titles = {}
         if new_titles and id_to_name:
-            word_groups, filter_words = load_frequency_words()
+            # 优先使用分析流水线写入的匹配标注，没有标注时才按频率词文件匹配
+            matcher = None
             for source_id, titles_data in new_titles.items():
                 filtered_titles = {}
                 for title, title_data in titles_data.items():
-                    if matches_word_groups(title, word_groups, filter_words):
+                    matched_group_keys = title_data.get(MATCHED_GROUP_KEYS)
+                    if matched_group_keys is not None:
+                        matched = bool(matched_group_keys)
+                    else:
+                        if matcher is None:
+                            matcher = get_word_matcher(*load_frequency_words())
+                        matched = matcher.matches(title)
+                    if matched:
                         filtered_titles[title] = title_data
                 if filtered_titles:
                     filtered_new_titles[source_id] = filtered_titles
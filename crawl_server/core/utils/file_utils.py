@@ -1,7 +1,19 @@
 """
 文件操作工具函数
 """
+import os
+import shutil
 from pathlib import Path
+from typing import Iterable
+
+# 快照目录、后缀和文件列表与 mcp_server 共用（格式见 trendradar_formats）
+from trendradar_formats.files import (
+    DAY_LOG_FILENAME,
+    SNAPSHOT_SUBFOLDER,
+    SNAPSHOT_SUFFIX,
+    TXT_SUBFOLDER,
+    list_snapshot_files,
+)
 
 from .time_utils import format_date_folder
 
@@ -19,14 +31,39 @@ def get_output_path(subfolder: str, filename: str) -> str:
     return str(output_dir / filename)
 
 
-def is_first_crawl_today() -> bool:
-    """检测是否是当天第一次爬取"""
-    date_folder = format_date_folder()
-    txt_dir = Path("output") / date_folder / "txt"
+def write_text_chunks(file_path: str, chunks: Iterable[str], buffer_size: int = 1024 * 1024) -> None:
+    """将文本分块写入临时文件后原子替换目标文件，读取方不会看到写了一半的文件"""
+    tmp_path = f"{file_path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", buffering=buffer_size) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 
-    if not txt_dir.exists():
-        return True
+def link_or_copy_file(src_path: str, dst_path: str) -> None:
+    """
+    让 dst_path 与 src_path 内容相同：优先创建硬链接，文件系统不支持时复制，均通过临时文件原子替换
+
+    src_path 之后若被原子替换（新文件），已有的硬链接仍指向旧内容，需再次调用
+    """
+    tmp_path = f"{dst_path}.tmp"
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        os.link(src_path, tmp_path)
+    except OSError:
+        shutil.copyfile(src_path, tmp_path)
+    os.replace(tmp_path, dst_path)
+
+
+def is_first_crawl_today() -> bool:
+    """检测是否是当天第一次爬取（按当日累计状态中的抓取次数）"""
+    from crawl_server.core.data.day_state import get_day_state
 
-    files = sorted([f for f in txt_dir.iterdir() if f.suffix == ".txt"])
-    return len(files) <= 1
+    return get_day_state().crawl_count() <= 1
 
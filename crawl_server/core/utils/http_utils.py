@@ -0,0 +1,102 @@
+"""
+HTTP 连接复用
+
+进程级 requests.Session 注册表，按 (协议+主机, 代理) 复用连接池和 keep-alive 连接，
+抓取器和各通知发送器共用，避免每个批次都重新建立 TCP/TLS 连接
+"""
+import threading
+from typing import Dict, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 每个 Session 缓存的主机连接池数量（同一 Session 可能因重定向访问其它主机）
+DEFAULT_POOL_CONNECTIONS = 4
+# 每个主机连接池保留的最大连接数
+DEFAULT_POOL_MAXSIZE = 10
+
+
+class SessionRegistry:
+    """按 (协议+主机, 代理) 缓存的 Session 注册表（线程安全）"""
+
+    def __init__(self, pool_connections: int = DEFAULT_POOL_CONNECTIONS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE):
+        self.pool_connections = max(1, pool_connections)
+        self.pool_maxsize = max(1, pool_maxsize)
+        self._sessions: Dict[Tuple[str, Optional[str]], requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None) -> None:
+        """调整连接池大小，只影响之后新建的 Session"""
+        with self._lock:
+            if pool_connections is not None:
+                self.pool_connections = max(1, pool_connections)
+            if pool_maxsize is not None:
+                self.pool_maxsize = max(1, pool_maxsize)
+
+    def get(self, url: str, proxy_url: Optional[str] = None, headers: Optional[Mapping[str, str]] = None) -> requests.Session:
+        """
+        获取访问 url 所用的共享 Session（首次调用时创建）
+
+        Args:
+            url: 请求地址（按协议和主机区分）
+            proxy_url: 代理URL
+            headers: 新建 Session 时设置的默认请求头
+        """
+        parts = urlsplit(url)
+        key = (f"{parts.scheme}://{parts.netloc}", proxy_url or None)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                if headers:
+                    session.headers.update(headers)
+                if proxy_url:
+                    session.proxies = {"http": proxy_url, "https": proxy_url}
+                self._sessions[key] = session
+            return session
+
+    def close(self) -> None:
+        """关闭所有 Session（之后再获取会重新创建）"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+# 进程级共享实例
+_session_registry_instance: Optional[SessionRegistry] = None
+_session_registry_lock = threading.Lock()
+
+
+def get_session_registry() -> SessionRegistry:
+    """获取进程级共享的 Session 注册表（首次调用时创建）"""
+    global _session_registry_instance
+    with _session_registry_lock:
+        if _session_registry_instance is None:
+            _session_registry_instance = SessionRegistry()
+        return _session_registry_instance
+
+
+def get_http_session(url: str, proxy_url: Optional[str] = None, headers: Optional[Mapping[str, str]] = None) -> requests.Session:
+    """获取访问 url 所用的共享 Session"""
+    return get_session_registry().get(url, proxy_url, headers)
+
+
+def close_http_sessions() -> None:
+    """关闭所有共享的 HTTP Session"""
+    get_session_registry().close()
+
+
+def reset_session_registry() -> None:
+    """关闭并重置 Session 注册表（主要用于测试）"""
+    global _session_registry_instance
+    with _session_registry_lock:
+        registry = _session_registry_instance
+        _session_registry_instance = None
+    if registry is not None:
+        registry.close()
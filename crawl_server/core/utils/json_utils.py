@@ -0,0 +1,28 @@
+"""
+JSON 工具
+
+安装了 orjson 时使用 orjson 解码，否则回退到标准库 json
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 解码失败时抛出的异常类型（orjson.JSONDecodeError 是 json.JSONDecodeError 的子类）
+JSONDecodeError = json.JSONDecodeError
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """
+    解码 JSON，直接接受 bytes（省去先解码成 str 的开销）
+
+    Args:
+        data: JSON 文本或 UTF-8 字节
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
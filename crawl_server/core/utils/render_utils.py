@@ -7,9 +7,9 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from crawl_server.configs import CrawlConfig
-from crawl_server.core.utils.contents import render_html_content
+from crawl_server.core.utils.contents import iter_html_content
 from crawl_server.core.utils.data_utils import prepare_report_data
-from crawl_server.core.utils.file_utils import get_output_path
+from crawl_server.core.utils.file_utils import get_output_path, link_or_copy_file, write_text_chunks
 from crawl_server.core.utils.time_utils import format_time_filename
 
 def generate_html_report(
@@ -38,17 +38,16 @@ def generate_html_report(
 
     report_data = prepare_report_data(stats, failed_ids, new_titles, id_to_name, mode, crawl_config=crawl_config)
 
-    html_content = render_html_content(
-        report_data, total_titles, is_daily_summary, mode, update_info
+    # 边渲染边写入，不在内存中拼出整个文档
+    write_text_chunks(
+        file_path,
+        iter_html_content(report_data, total_titles, is_daily_summary, mode, update_info),
     )
 
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
-
+    # 根目录 index.html 直接链接到刚生成的文件，不再写第二遍
     if is_daily_summary:
         root_file_path = Path("output") / "index.html"
-        with open(root_file_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        link_or_copy_file(file_path, str(root_file_path))
 
     return file_path
 
@@ -6,6 +6,8 @@ from typing import Dict, List, Optional, Tuple
 from crawl_server.configs import CrawlConfig
 from crawl_server.core.utils.file_utils import is_first_crawl_today
 from crawl_server.core.utils.time_utils import format_time_display
+from crawl_server.core.utils.weight_utils import TopNewsSelector, news_weight, weight_args
+from crawl_server.core.utils.word_matcher import get_word_matcher
 
 
 def calculate_news_weight(
@@ -21,85 +23,31 @@ def calculate_news_weight(
         rank_threshold: 排名阈值
         weight_config: 权重配置对象
     """
-    if not weight_config:
-        raise RuntimeError("weight_config 未提供，无法计算权重")
-    
     ranks = title_data.get("ranks", [])
-    if not ranks:
-        return 0.0
-
     count = title_data.get("count", len(ranks))
+    return news_weight(ranks, count, weight_args(rank_threshold, weight_config))
 
-    # 排名权重：Σ(11 - min(rank, 10)) / 出现次数
-    rank_scores = []
-    for rank in ranks:
-        score = 11 - min(rank, 10)
-        rank_scores.append(score)
-
-    rank_weight = sum(rank_scores) / len(ranks) if ranks else 0
-
-    # 频次权重：min(出现次数, 10) × 10
-    # 使用传入的 weight_config
-    frequency_weight = min(count, 10) * 10
-
-    # 热度加成：高排名次数 / 总出现次数 × 100
-    high_rank_count = sum(1 for rank in ranks if rank <= rank_threshold)
-    hotness_ratio = high_rank_count / len(ranks) if ranks else 0
-    hotness_weight = hotness_ratio * 100
 
-    total_weight = (
-        rank_weight * weight_config.RANK_WEIGHT
-        + frequency_weight * weight_config.FREQUENCY_WEIGHT
-        + hotness_weight * weight_config.HOTNESS_WEIGHT
-    )
-
-    return total_weight
+def resolve_word_groups(
+    word_groups: List[Dict], filter_words: List[str]
+) -> Tuple[List[Dict], List[str]]:
+    """统计实际使用的词组：未配置词组时使用包含所有新闻的虚拟词组，并清空过滤词"""
+    if not word_groups:
+        return [{"required": [], "normal": [], "group_key": "全部新闻"}], []
+    return word_groups, filter_words
 
 
 def matches_word_groups(
     title: str, word_groups: List[Dict], filter_words: List[str]
 ) -> bool:
-    """检查标题是否匹配词组规则"""
-    # 防御性类型检查：确保 title 是有效字符串
-    if not isinstance(title, str):
-        title = str(title) if title is not None else ""
-    if not title.strip():
-        return False
-
-    # 如果没有配置词组，则匹配所有标题（支持显示全部新闻）
-    if not word_groups:
-        return True
-
-    title_lower = title.lower()
-
-    # 过滤词检查
-    if any(filter_word.lower() in title_lower for filter_word in filter_words):
-        return False
-
-    # 词组匹配检查
-    for group in word_groups:
-        required_words = group["required"]
-        normal_words = group["normal"]
-
-        # 必须词检查
-        if required_words:
-            all_required_present = all(
-                req_word.lower() in title_lower for req_word in required_words
-            )
-            if not all_required_present:
-                continue
-
-        # 普通词检查
-        if normal_words:
-            any_normal_present = any(
-                normal_word.lower() in title_lower for normal_word in normal_words
-            )
-            if not any_normal_present:
-                continue
-
-        return True
+    """
+    检查标题是否匹配词组规则
 
-    return False
+    空标题不匹配；未配置词组时匹配所有标题；命中过滤词不匹配；
+    否则任一词组的必须词全部出现且（有普通词时）任一普通词出现即匹配。
+    批量匹配时应直接使用 get_word_matcher() 返回的匹配器，避免每个标题都计算配置指纹
+    """
+    return get_word_matcher(word_groups, filter_words).matches(title)
 
 
 def count_word_frequency(
@@ -125,8 +73,7 @@ def count_word_frequency(
     # 如果没有配置词组，创建一个包含所有新闻的虚拟词组
     if not word_groups:
         print("频率词配置为空，将显示所有新闻")
-        word_groups = [{"required": [], "normal": [], "group_key": "全部新闻"}]
-        filter_words = []  # 清空过滤词，显示所有新闻
+    word_groups, filter_words = resolve_word_groups(word_groups, filter_words)
 
     is_first_today = is_first_crawl_today()
 
@@ -189,15 +136,21 @@ def count_word_frequency(
     total_titles = 0
     processed_titles = {}
     matched_new_count = 0
+    matcher = get_word_matcher(word_groups, filter_words)
 
     if title_info is None:
         title_info = {}
     if new_titles is None:
         new_titles = {}
 
+    # 每个词组边匹配边选出前 N 条（优先级：单独配置 > 全局配置），计数仍统计全部匹配
     for group in word_groups:
         group_key = group["group_key"]
-        word_stats[group_key] = {"count": 0, "titles": {}}
+        group_max_count = group.get("max_count", 0) or crawl_config.MAX_NEWS_PER_KEYWORD
+        word_stats[group_key] = {
+            "count": 0,
+            "selector": TopNewsSelector(group_max_count, rank_threshold, crawl_config.WEIGHT_CONFIG),
+        }
 
     for source_id, titles_data in results_to_process.items():
         total_titles += len(titles_data)
@@ -209,12 +162,9 @@ def count_word_frequency(
             if title in processed_titles.get(source_id, {}):
                 continue
 
-            # 使用统一的匹配逻辑
-            matches_frequency_words = matches_word_groups(
-                title, word_groups, filter_words
-            )
-
-            if not matches_frequency_words:
+            # 使用统一的匹配结果（优先读取匹配阶段的标注），取第一个匹配的词组
+            matched_group_keys = matcher.group_keys_for(title, title_data)
+            if not matched_group_keys:
                 continue
 
             # 如果是增量模式或 current 模式第一次，统计匹配的新增新闻数量
@@ -227,115 +177,87 @@ def count_word_frequency(
             source_url = title_data.get("url", "")
             source_mobile_url = title_data.get("mobileUrl", "")
 
-            # 找到匹配的词组（防御性转换确保类型安全）
-            title_lower = str(title).lower() if not isinstance(title, str) else title.lower()
-            for group in word_groups:
-                required_words = group["required"]
-                normal_words = group["normal"]
-
-                # 如果是"全部新闻"模式，所有标题都匹配第一个（唯一的）词组
-                if len(word_groups) == 1 and word_groups[0]["group_key"] == "全部新闻":
-                    group_key = group["group_key"]
-                    word_stats[group_key]["count"] += 1
-                    if source_id not in word_stats[group_key]["titles"]:
-                        word_stats[group_key]["titles"][source_id] = []
-                else:
-                    # 原有的匹配逻辑
-                    if required_words:
-                        all_required_present = all(
-                            req_word.lower() in title_lower
-                            for req_word in required_words
-                        )
-                        if not all_required_present:
-                            continue
-
-                    if normal_words:
-                        any_normal_present = any(
-                            normal_word.lower() in title_lower
-                            for normal_word in normal_words
-                        )
-                        if not any_normal_present:
-                            continue
-
-                    group_key = group["group_key"]
-                    word_stats[group_key]["count"] += 1
-                    if source_id not in word_stats[group_key]["titles"]:
-                        word_stats[group_key]["titles"][source_id] = []
-
-                first_time = ""
-                last_time = ""
-                count_info = 1
-                ranks = source_ranks if source_ranks else []
-                url = source_url
-                mobile_url = source_mobile_url
-
-                # 对于 current 模式，从历史统计信息中获取完整数据
-                if (
-                    mode == "current"
-                    and title_info
-                    and source_id in title_info
-                    and title in title_info[source_id]
-                ):
-                    info = title_info[source_id][title]
-                    first_time = info.get("first_time", "")
-                    last_time = info.get("last_time", "")
-                    count_info = info.get("count", 1)
-                    if "ranks" in info and info["ranks"]:
-                        ranks = info["ranks"]
-                    url = info.get("url", source_url)
-                    mobile_url = info.get("mobileUrl", source_mobile_url)
-                elif (
-                    title_info
-                    and source_id in title_info
-                    and title in title_info[source_id]
-                ):
-                    info = title_info[source_id][title]
-                    first_time = info.get("first_time", "")
-                    last_time = info.get("last_time", "")
-                    count_info = info.get("count", 1)
-                    if "ranks" in info and info["ranks"]:
-                        ranks = info["ranks"]
-                    url = info.get("url", source_url)
-                    mobile_url = info.get("mobileUrl", source_mobile_url)
-
-                if not ranks:
-                    ranks = [99]
-
-                time_display = format_time_display(first_time, last_time)
-
-                source_name = id_to_name.get(source_id, source_id)
-
-                # 判断是否为新增
-                is_new = False
-                if all_news_are_new:
-                    # 增量模式下所有处理的新闻都是新增，或者当天第一次的所有新闻都是新增
-                    is_new = True
-                elif new_titles and source_id in new_titles:
-                    # 检查是否在新增列表中
-                    new_titles_for_source = new_titles[source_id]
-                    is_new = title in new_titles_for_source
-
-                word_stats[group_key]["titles"][source_id].append(
-                    {
-                        "title": title,
-                        "source_name": source_name,
-                        "first_time": first_time,
-                        "last_time": last_time,
-                        "time_display": time_display,
-                        "count": count_info,
-                        "ranks": ranks,
-                        "rank_threshold": rank_threshold,
-                        "url": url,
-                        "mobileUrl": mobile_url,
-                        "is_new": is_new,
-                    }
-                )
+            # 记入第一个匹配的词组
+            group_key = matched_group_keys[0]
+            word_stats[group_key]["count"] += 1
+            processed_titles[source_id][title] = True
+
+            first_time = ""
+            last_time = ""
+            count_info = 1
+            ranks = source_ranks if source_ranks else []
+            url = source_url
+            mobile_url = source_mobile_url
+
+            # 对于 current 模式，从历史统计信息中获取完整数据
+            if (
+                mode == "current"
+                and title_info
+                and source_id in title_info
+                and title in title_info[source_id]
+            ):
+                info = title_info[source_id][title]
+                first_time = info.get("first_time", "")
+                last_time = info.get("last_time", "")
+                count_info = info.get("count", 1)
+                if "ranks" in info and info["ranks"]:
+                    ranks = info["ranks"]
+                url = info.get("url", source_url)
+                mobile_url = info.get("mobileUrl", source_mobile_url)
+            elif (
+                title_info
+                and source_id in title_info
+                and title in title_info[source_id]
+            ):
+                info = title_info[source_id][title]
+                first_time = info.get("first_time", "")
+                last_time = info.get("last_time", "")
+                count_info = info.get("count", 1)
+                if "ranks" in info and info["ranks"]:
+                    ranks = info["ranks"]
+                url = info.get("url", source_url)
+                mobile_url = info.get("mobileUrl", source_mobile_url)
+
+            if not ranks:
+                ranks = [99]
+
+            # 进不了前 N 条的标题不再构造展示记录
+            selector = word_stats[group_key]["selector"]
+            sort_key = selector.candidate_key(ranks, count_info)
+            if sort_key is None:
+                continue
 
-                if source_id not in processed_titles:
-                    processed_titles[source_id] = {}
-                processed_titles[source_id][title] = True
+            time_display = format_time_display(first_time, last_time)
+
+            source_name = id_to_name.get(source_id, source_id)
+
+            # 判断是否为新增
+            is_new = False
+            if all_news_are_new:
+                # 增量模式下所有处理的新闻都是新增，或者当天第一次的所有新闻都是新增
+                is_new = True
+            elif new_titles and source_id in new_titles:
+                # 检查是否在新增列表中
+                new_titles_for_source = new_titles[source_id]
+                is_new = title in new_titles_for_source
+
+            selector.add(
+                sort_key,
+                {
+                    "title": title,
+                    "source_name": source_name,
+                    "first_time": first_time,
+                    "last_time": last_time,
+                    "time_display": time_display,
+                    "count": count_info,
+                    "ranks": ranks,
+                    "rank_threshold": rank_threshold,
+                    "url": url,
+                    "mobileUrl": mobile_url,
+                    "is_new": is_new,
+                },
+            )
 
-                break
 
     # 最后统一打印汇总信息
     if mode == "incremental":
@@ -388,44 +310,18 @@ def count_word_frequency(
             )
 
     stats = []
-    # 创建 group_key 到位置和最大数量的映射
+    # 创建 group_key 到位置的映射
     group_key_to_position = {
         group["group_key"]: idx for idx, group in enumerate(word_groups)
     }
-    group_key_to_max_count = {
-        group["group_key"]: group.get("max_count", 0) for group in word_groups
-    }
 
     for group_key, data in word_stats.items():
-        all_titles = []
-        for source_id, title_list in data["titles"].items():
-            all_titles.extend(title_list)
-
-        # 按权重排序
-        sorted_titles = sorted(
-            all_titles,
-            key=lambda x: (
-                -calculate_news_weight(x, rank_threshold, crawl_config.WEIGHT_CONFIG),
-                min(x["ranks"]) if x["ranks"] else 999,
-                -x["count"],
-            ),
-        )
-
-        # 应用最大显示数量限制（优先级：单独配置 > 全局配置）
-        group_max_count = group_key_to_max_count.get(group_key, 0)
-        if group_max_count == 0:
-            # 使用全局配置
-            group_max_count = crawl_config.MAX_NEWS_PER_KEYWORD
-
-        if group_max_count > 0:
-            sorted_titles = sorted_titles[:group_max_count]
-
         stats.append(
             {
                 "word": group_key,
                 "count": data["count"],
                 "position": group_key_to_position.get(group_key, 999),
-                "titles": sorted_titles,
+                "titles": data["selector"].result(),
                 "percentage": (
                     round(data["count"] / total_titles * 100, 2)
                     if total_titles > 0
@@ -3,7 +3,7 @@
 """
 from typing import Optional, Tuple
 
-import requests
+from .http_utils import get_http_session
 
 
 def check_version_update(
@@ -21,7 +21,7 @@ def check_version_update(
             "Cache-Control": "no-cache",
         }
 
-        response = requests.get(
+        response = get_http_session(version_url, proxy_url).get(
             version_url, proxies=proxies, headers=headers, timeout=10
         )
         response.raise_for_status()
@@ -0,0 +1,81 @@
+"""
+新闻权重计算与选择
+
+news_weight 是唯一的权重公式实现（calculate_news_weight 也调用它）；
+TopNewsSelector 在匹配过程中边收集边选择，只保留权重最高的前 k 条，
+结果与逐条计算权重后完整排序再截断一致
+"""
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+
+# 权重参数: (排名阈值, 排名权重, 频次权重, 热度权重)
+WeightArgs = Tuple[int, float, float, float]
+
+
+def weight_args(rank_threshold: int, weight_config: object) -> WeightArgs:
+    """一次性读取权重配置，供 news_weight 重复使用"""
+    if not weight_config:
+        raise RuntimeError("weight_config 未提供，无法计算权重")
+    return (
+        rank_threshold,
+        weight_config.RANK_WEIGHT,
+        weight_config.FREQUENCY_WEIGHT,
+        weight_config.HOTNESS_WEIGHT,
+    )
+
+
+def news_weight(ranks: List[int], count: int, args: WeightArgs) -> float:
+    """
+    计算新闻权重
+
+    排名权重 Σ(11 - min(rank, 10)) / 出现次数，频次权重 min(出现次数, 10) × 10，
+    热度加成 高排名次数 / 总出现次数 × 100，按配置加权求和
+    """
+    if not ranks:
+        return 0.0
+    rank_threshold, rank_w, freq_w, hot_w = args
+    rank_weight = sum(11 - min(rank, 10) for rank in ranks) / len(ranks)
+    frequency_weight = min(count, 10) * 10
+    hotness_weight = sum(1 for rank in ranks if rank <= rank_threshold) / len(ranks) * 100
+    return rank_weight * rank_w + frequency_weight * freq_w + hotness_weight * hot_w
+
+
+class TopNewsSelector:
+    """
+    流式选出权重最高的前 limit 条新闻（limit <= 0 时保留全部）
+
+    用有界堆保存当前前 limit 条，内存与 limit 成正比；按 (权重降序, 最高排名升序, 出现次数降序) 排序，
+    同分时先加入的在前。用法：先用 candidate_key() 判断能否入选，能入选时再构造记录并 add()
+    """
+
+    def __init__(self, limit: int, rank_threshold: int, weight_config: object):
+        self._args = weight_args(rank_threshold, weight_config)
+        self.limit = limit if limit and limit > 0 else 0
+        self.offered = 0  # 参与选择的总条数
+        # 有数量限制时为最小堆，元素为取反的排序键，堆顶是已选中最靠后的一条
+        self._entries: List[Tuple[Tuple, Dict]] = []
+
+    def candidate_key(self, ranks: List[int], count: int) -> Optional[Tuple]:
+        """计算排序键，确定无法进入前 limit 条时返回 None"""
+        seq = self.offered
+        self.offered += 1
+        weight = news_weight(ranks, count, self._args)
+        # 取反后的排序键 (-权重, 最高排名, -出现次数, 顺序)
+        key = (weight, -(min(ranks) if ranks else 999), count, -seq)
+        if self.limit and len(self._entries) >= self.limit and key <= self._entries[0][0]:
+            return None
+        return key
+
+    def add(self, key: Tuple, item: Dict) -> None:
+        """加入 candidate_key() 返回的候选记录"""
+        if not self.limit:
+            self._entries.append((key, item))
+        elif len(self._entries) < self.limit:
+            heapq.heappush(self._entries, (key, item))
+        else:
+            heapq.heapreplace(self._entries, (key, item))
+
+    def result(self) -> List[Dict]:
+        """按排序规则返回选中的记录"""
+        return [item for _, item in sorted(self._entries, key=lambda entry: entry[0], reverse=True)]
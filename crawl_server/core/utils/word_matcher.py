@@ -0,0 +1,212 @@
+"""
+频率词匹配器
+
+将词组配置（必须词、普通词、过滤词）编译为一个 Aho-Corasick 自动机，
+标题只需扫描一遍即可得到命中的词集合（位集），再按位运算判断各词组是否匹配。
+匹配规则与逐词 `in` 判断完全一致：标题和词都转小写后做子串匹配，空词视为总是命中。
+
+每次抓取只匹配一次：annotate() 把匹配到的词组 key 和匹配器签名写入标题记录，
+统计、Kafka 事件和报告数据直接读取标注，签名不一致（词组配置不同）时才重新匹配。
+"""
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Tuple
+
+# 缓存的已编译匹配器数量上限
+_MATCHER_CACHE_SIZE = 8
+# 单个匹配器缓存的标题匹配结果数量上限
+_TITLE_CACHE_SIZE = 50000
+
+# 标题记录上的匹配标注字段
+MATCHED_GROUP_KEYS = "matched_group_keys"
+MATCH_SIGNATURE = "match_signature"
+
+
+def word_groups_fingerprint(word_groups: List[Dict], filter_words: List[str]) -> Tuple:
+    """词组配置的指纹，配置内容不变时指纹不变"""
+    return (
+        tuple(
+            (
+                tuple(group.get("required", [])),
+                tuple(group.get("normal", [])),
+                group.get("group_key", ""),
+            )
+            for group in word_groups
+        ),
+        tuple(filter_words),
+    )
+
+
+class WordMatcher:
+    """已编译的词组匹配器"""
+
+    def __init__(self, word_groups: List[Dict], filter_words: List[str]):
+        self.word_groups = word_groups
+        self.group_keys = [group.get("group_key", "") for group in word_groups]
+        # 同一进程内词组配置相同的匹配器签名相同
+        self.signature = hash(word_groups_fingerprint(word_groups, filter_words))
+        self._word_ids: Dict[str, int] = {}
+
+        def word_mask(words: List[str]) -> int:
+            mask = 0
+            for word in words:
+                word = word.lower()
+                word_id = self._word_ids.get(word)
+                if word_id is None:
+                    word_id = len(self._word_ids)
+                    self._word_ids[word] = word_id
+                mask |= 1 << word_id
+            return mask
+
+        self._filter_mask = word_mask(filter_words)
+        # 每个词组: (必须词位集, 普通词位集)
+        self._groups = [
+            (word_mask(group.get("required", [])), word_mask(group.get("normal", [])))
+            for group in word_groups
+        ]
+        # 空词是任何字符串的子串
+        self._always_mask = 1 << self._word_ids[""] if "" in self._word_ids else 0
+        self._build_automaton()
+        self._title_cache: Dict[str, Tuple[int, ...]] = {}
+        self._lock = threading.Lock()
+
+    def _build_automaton(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        output: List[int] = [0]
+        for word, word_id in self._word_ids.items():
+            if not word:
+                continue
+            state = 0
+            for ch in word:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    output.append(0)
+                state = next_state
+            output[state] |= 1 << word_id
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(ch, 0)
+                output[next_state] |= output[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+        self._alphabet = frozenset(ch for transitions in goto for ch in transitions)
+
+    def scan(self, text_lower: str) -> int:
+        """扫描一遍（已转小写的）文本，返回命中词的位集"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        alphabet = self._alphabet
+        found = self._always_mask
+        state = 0
+        for ch in text_lower:
+            if ch not in alphabet:
+                state = 0
+                continue
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            found |= output[state]
+        return found
+
+    def matched_groups(self, title) -> Tuple[int, ...]:
+        """
+        返回标题匹配的所有词组下标（按配置顺序）
+
+        标题为空、命中过滤词或没有词组匹配时返回空元组；未配置词组时视为不过滤，返回空元组，
+        是否放行由 matches() 判断
+        """
+        if not isinstance(title, str):
+            title = str(title) if title is not None else ""
+        cached = self._title_cache.get(title)
+        if cached is not None:
+            return cached
+
+        result: Tuple[int, ...] = ()
+        if title.strip() and self._groups:
+            found = self.scan(title.lower())
+            if not found & self._filter_mask:
+                result = tuple([
+                    index
+                    for index, (required_mask, normal_mask) in enumerate(self._groups)
+                    if found & required_mask == required_mask and (not normal_mask or found & normal_mask)
+                ])
+
+        with self._lock:
+            if len(self._title_cache) >= _TITLE_CACHE_SIZE:
+                self._title_cache.clear()
+            self._title_cache[title] = result
+        return result
+
+    def first_group(self, title) -> Optional[int]:
+        """返回标题匹配的第一个词组下标，不匹配时返回 None"""
+        groups = self.matched_groups(title)
+        return groups[0] if groups else None
+
+    def matches(self, title) -> bool:
+        """与 matches_word_groups 语义一致"""
+        if not self._groups:
+            if not isinstance(title, str):
+                title = str(title) if title is not None else ""
+            return bool(title.strip())
+        return bool(self.matched_groups(title))
+
+    def annotate(self, results: Optional[Dict]) -> None:
+        """为 {source_id: {title: title_data}} 中的每条记录写入匹配到的词组 key 和匹配器签名"""
+        if not results:
+            return
+        signature = self.signature
+        for titles_data in results.values():
+            for title, title_data in titles_data.items():
+                if title_data.get(MATCH_SIGNATURE) != signature:
+                    title_data[MATCHED_GROUP_KEYS] = [
+                        self.group_keys[index] for index in self.matched_groups(title)
+                    ]
+                    title_data[MATCH_SIGNATURE] = signature
+
+    def group_keys_for(self, title, title_data: Dict) -> List[str]:
+        """标题匹配到的词组 key（按配置顺序），优先读取本匹配器写入的标注"""
+        if title_data.get(MATCH_SIGNATURE) == self.signature:
+            return title_data[MATCHED_GROUP_KEYS]
+        return [self.group_keys[index] for index in self.matched_groups(title)]
+
+
+# 进程级缓存：按词组配置指纹复用已编译的匹配器
+_matcher_cache: "OrderedDict[Tuple, WordMatcher]" = OrderedDict()
+_matcher_cache_lock = threading.Lock()
+
+
+def get_word_matcher(word_groups: List[Dict], filter_words: List[str]) -> WordMatcher:
+    """获取词组配置对应的匹配器，配置不变时复用已编译的自动机"""
+    fingerprint = word_groups_fingerprint(word_groups or [], filter_words or [])
+    with _matcher_cache_lock:
+        matcher = _matcher_cache.get(fingerprint)
+        if matcher is not None:
+            _matcher_cache.move_to_end(fingerprint)
+            return matcher
+
+    matcher = WordMatcher(word_groups or [], filter_words or [])
+    with _matcher_cache_lock:
+        _matcher_cache[fingerprint] = matcher
+        while len(_matcher_cache) > _MATCHER_CACHE_SIZE:
+            _matcher_cache.popitem(last=False)
+    return matcher
+
+
+def reset_word_matchers() -> None:
+    """清空匹配器缓存（主要用于测试）"""
+    with _matcher_cache_lock:
+        _matcher_cache.clear()
@@ -9,6 +9,7 @@ import logging
 from typing import Optional
 
 from crawl_server.controllers import CrawlController
+from crawl_server.core.data import CrawlCancelledError
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +38,9 @@ def run_crawl_task(
         crawl_controller.handle_crawl(trigger=trigger, count=count)
         logger.info("✅ 抓取任务完成")
             
+    except CrawlCancelledError:
+        # 收到停止信号时中止本轮，不保存快照、不推送
+        logger.info("🛑 抓取任务已取消，本轮结果不保存")
     except Exception as e:
         logger.error(f"❌ 抓取任务失败: {e}", exc_info=True)
         raise
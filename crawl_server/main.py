@@ -12,10 +12,13 @@ import os
 import time
 import signal
 import logging
+import threading
 
 from crawl_server.configs import load_config, VERSION
 from crawl_server.connections import init_connections, cleanup_connections
 from crawl_server.crawl_task import run_crawl_task
+from crawl_server.core.data.adaptive_scheduler import get_adaptive_scheduler
+from crawl_server.core.data.async_backend import cancel_async_fetches
 
 # 配置日志
 logging.basicConfig(
@@ -26,12 +29,43 @@ logger = logging.getLogger(__name__)
 
 # 全局运行状态
 running = True
+# 停止事件（用于唤醒主循环的等待）
+stop_event = threading.Event()
 
 def signal_handler(sig, frame):
-    """信号处理器（优雅关闭）"""
+    """信号处理器（优雅关闭）：只设置停止标志，取消抓取由主循环完成（信号处理器中不获取锁）"""
     global running
-    logger.info("\n🛑 收到停止信号，正在优雅关闭...")
     running = False
+    stop_event.set()
+
+
+def run_crawl_cycle(crawl_controller) -> None:
+    """
+    在工作线程中执行一次抓取，主线程等待其结束
+
+    收到停止信号后由主线程取消进行中的异步抓取，被取消的一轮不保存、不推送
+    """
+    errors = []
+
+    def target():
+        try:
+            run_crawl_task(crawl_controller=crawl_controller, trigger="scheduled", count=1)
+        except Exception as e:
+            errors.append(e)
+
+    crawl_thread = threading.Thread(target=target, name="crawl-task")
+    crawl_thread.start()
+    stop_logged = False
+    while crawl_thread.is_alive():
+        crawl_thread.join(timeout=0.5)
+        if not running:
+            if not stop_logged:
+                logger.info("🛑 收到停止信号，正在取消进行中的抓取...")
+                stop_logged = True
+            # 抓取可能在取消之后才提交异步请求，所以每次轮询都取消一次
+            cancel_async_fetches()
+    if errors:
+        raise errors[0]
 
 
 def run_server_mode():
@@ -50,6 +84,11 @@ def run_server_mode():
     logger.info("=" * 60)
     logger.info(f"🚀 启动服务器模式")
     logger.info(f"⏰ 定时执行间隔: {crawl_config.SCHEDULE_MINUTES} 分钟")
+    if crawl_config.CRAWL_ADAPTIVE_ENABLED:
+        logger.info(
+            f"⏰ 已启用自适应调度: 各平台间隔 {crawl_config.CRAWL_ADAPTIVE_MIN_MINUTES}"
+            f"~{crawl_config.CRAWL_ADAPTIVE_MAX_MINUTES} 分钟"
+        )
     
     # 初始化连接（PostgreSQL, Redis, Kafka）和 Controllers
     connections = init_connections(db_config=db_config, crawl_config=crawl_config)
@@ -69,16 +108,14 @@ def run_server_mode():
     logger.info(f"🔄 进入主循环，立即执行第一次抓取任务...")
     
     interval_seconds = crawl_config.SCHEDULE_MINUTES * 60
+    # 按固定节拍调度：下次执行时间 = 上次计划时间 + 间隔，抓取耗时不会累积漂移
+    next_run = time.monotonic()
     
     while running:
         try:
             # 先执行抓取任务
             if connections.crawl_controller:
-                run_crawl_task(
-                    crawl_controller=connections.crawl_controller,
-                    trigger="scheduled",
-                    count=1
-                )
+                run_crawl_cycle(connections.crawl_controller)
             else:
                 logger.error("❌ CrawlController 未初始化，无法执行抓取任务")
             
@@ -86,9 +123,15 @@ def run_server_mode():
             if not running:
                 break
             
-            # 等待指定时间
-            logger.info(f"⏰ 等待 {crawl_config.SCHEDULE_MINUTES} 分钟后执行下次任务...")
-            time.sleep(interval_seconds)
+            # 等待到下次计划时间（收到停止信号时立即唤醒）
+            scheduler = get_adaptive_scheduler(crawl_config)
+            if scheduler is not None:
+                # 自适应调度：在最早到期的平台到期时执行
+                next_run = time.monotonic() + scheduler.seconds_until_next_due(interval_seconds)
+            else:
+                next_run = max(next_run + interval_seconds, time.monotonic())
+            logger.info(f"⏰ 等待 {next_run - time.monotonic():.0f} 秒后执行下次任务...")
+            stop_event.wait(next_run - time.monotonic())
             
         except KeyboardInterrupt:
             break
@@ -96,7 +139,10 @@ def run_server_mode():
             logger.error(f"❌ 主循环出错: {e}", exc_info=True)
             logger.info(f"⏰ {crawl_config.SCHEDULE_MINUTES} 分钟后重试...")
             # 即使出错也要等待，避免频繁重试
-            time.sleep(interval_seconds)
+            next_run = time.monotonic() + interval_seconds
+            stop_event.wait(interval_seconds)
+    
+    logger.info("🛑 收到停止信号，正在优雅关闭...")
     
     # 清理连接
     cleanup_connections(connections)
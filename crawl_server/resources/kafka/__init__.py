@@ -3,7 +3,7 @@ Kafka 模块
 
 负责 Kafka 消息的发送和接收
 """
-from .client import KafkaClient
+from .client import KafkaClient, close_kafka_client, get_kafka_client
 from .sender import send_fetched_data_to_kafka
 from .consumer import KafkaEventConsumer, KafkaConsumerThread
 from .events import (
@@ -16,6 +16,8 @@ from .events import (
 
 __all__ = [
     "KafkaClient",
+    "get_kafka_client",
+    "close_kafka_client",
     "send_fetched_data_to_kafka",
     "KafkaEventConsumer",
     "KafkaConsumerThread",
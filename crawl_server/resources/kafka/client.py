@@ -7,7 +7,8 @@ Kafka 客户端
 """
 import json
 import logging
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, Set
 from datetime import datetime
 
 try:
@@ -42,6 +43,8 @@ class KafkaClient:
         self.producer: Optional[KafkaProducer] = None
         self.admin_client: Optional[KafkaAdminClient] = None
         self.logger = logging.getLogger(__name__)
+        # 已确认存在的 topic，同一客户端只检查一次
+        self._known_topics: Set[str] = set()
         
         # 禁用 kafka-python 库的详细日志
         if self.enable_kafka:
@@ -98,12 +101,16 @@ class KafkaClient:
         if not self.enable_kafka or not self.admin_client:
             return False
         
+        if topic in self._known_topics:
+            return True
+        
         try:
             # 检查 topic 是否存在：列出所有 topics
             existing_topics = self.admin_client.list_topics(timeout_ms=5000)
             
             if topic in existing_topics:
                 self.logger.debug(f"✅ Topic '{topic}' 已存在")
+                self._known_topics.add(topic)
                 return True
         except Exception as e:
             # 如果检查失败，尝试直接创建（可能 topic 不存在或连接问题）
@@ -120,10 +127,12 @@ class KafkaClient:
             ]
             self.admin_client.create_topics(new_topics=topic_list, validate_only=False)
             self.logger.debug(f"✅ 已创建 Topic '{topic}' (partitions={num_partitions}, replication={replication_factor})")
+            self._known_topics.add(topic)
             return True
         except TopicAlreadyExistsError:
             # 并发创建时可能已存在
             self.logger.debug(f"✅ Topic '{topic}' 已存在（并发创建）")
+            self._known_topics.add(topic)
             return True
         except Exception as e:
             self.logger.error(f"❌ 创建 Topic '{topic}' 失败: {e}")
@@ -250,6 +259,14 @@ class KafkaClient:
         self.logger.debug(f"📤 批量发送完成: {success_count}/{len(data_list)}")
         return success_count
     
+    def flush(self, timeout: Optional[float] = None):
+        """等待已提交的消息全部发送完成"""
+        if self.producer:
+            try:
+                self.producer.flush(timeout=timeout)
+            except Exception as e:
+                self.logger.error(f"❌ Kafka 生产者 flush 失败: {e}")
+    
     def close(self):
         """关闭 Kafka 连接"""
         if self.admin_client:
@@ -266,3 +283,35 @@ class KafkaClient:
             except Exception as e:
                 self.logger.error(f"❌ 关闭 Kafka 生产者时出错: {e}")
 
+
+# 进程级共享实例（服务进程中由 init_connections 创建，cleanup_connections 关闭）
+_kafka_client_instance: Optional[KafkaClient] = None
+_kafka_client_lock = threading.Lock()
+
+
+def get_kafka_client(bootstrap_servers: str) -> KafkaClient:
+    """
+    获取进程级共享的 Kafka 客户端，复用生产者连接和 topic 检查结果
+
+    首次调用、地址变化或上次初始化失败时重新创建
+    """
+    global _kafka_client_instance
+    with _kafka_client_lock:
+        client = _kafka_client_instance
+        if client is not None and client.enable_kafka and client.bootstrap_servers == bootstrap_servers:
+            return client
+        if client is not None:
+            client.close()
+        _kafka_client_instance = KafkaClient(bootstrap_servers=bootstrap_servers, enable_kafka=True)
+        return _kafka_client_instance
+
+
+def close_kafka_client(timeout: Optional[float] = 10) -> None:
+    """发送完剩余消息后关闭共享的 Kafka 客户端"""
+    global _kafka_client_instance
+    with _kafka_client_lock:
+        client = _kafka_client_instance
+        _kafka_client_instance = None
+    if client is not None:
+        client.flush(timeout)
+        client.close()
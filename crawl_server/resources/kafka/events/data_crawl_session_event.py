@@ -22,6 +22,7 @@ class DataCrawlSessionEvent:
     failed_count: int  # 失败数量
     failed_ids: list  # 失败的平台ID列表
     # 可选字段（有默认值）必须在后面
+    unchanged_ids: list = None  # 内容与上次抓取相同的平台ID列表（这些平台未发送 data.crawl 事件）
     platforms: list = None  # 使用的平台ID列表，格式: ["toutiao", "baidu", "weibo", ...]
     word_groups: list = None  # 使用的频率词组列表
     filter_words: list = None  # 使用的过滤词列表
@@ -30,6 +31,8 @@ class DataCrawlSessionEvent:
     timestamp: Optional[str] = None
     
     def __post_init__(self):
+        if self.unchanged_ids is None:
+            self.unchanged_ids = []
         if self.platforms is None:
             self.platforms = []
         if self.word_groups is None:
@@ -51,6 +54,7 @@ class DataCrawlSessionEvent:
             success_count=data.get("success_count", 0),
             failed_count=data.get("failed_count", 0),
             failed_ids=data.get("failed_ids", []),
+            unchanged_ids=data.get("unchanged_ids", []),
             platforms=data.get("platforms", []),
             word_groups=data.get("word_groups", []),
             filter_words=data.get("filter_words", []),
@@ -10,7 +10,7 @@ from typing import Dict, List, Optional
 from datetime import datetime
 
 from crawl_server.configs import DatabaseConfig
-from crawl_server.resources.kafka.client import KafkaClient
+from crawl_server.resources.kafka.client import get_kafka_client
 from crawl_server.resources.kafka.events import EventType, DataCrawlEvent, DataCrawlSessionEvent
 
 
@@ -25,6 +25,7 @@ def send_fetched_data_to_kafka(
     platforms: Optional[List] = None,  # 平台列表，可以是对象列表 [{"id": "...", "name": "..."}] 或 ID 列表 ["id1", "id2"]，存储时会转换为 ID 列表
     word_groups: Optional[List[Dict]] = None,
     filter_words: Optional[List[str]] = None,
+    unchanged_ids: Optional[List[str]] = None,
 ) -> bool:
     """
     将抓取的新闻数据发送到 Kafka
@@ -40,31 +41,29 @@ def send_fetched_data_to_kafka(
         platforms: 使用的平台ID列表，格式: ["toutiao", "baidu", "weibo", ...]
         word_groups: 使用的频率词组列表
         filter_words: 使用的过滤词列表
+        unchanged_ids: 内容与上次抓取相同的平台ID列表（不再发送其新闻事件）
     
     Returns:
-        bool: 是否发送成功
+        bool: 是否全部发送成功（所有 data.crawl 事件和 data.crawl.session 事件）
     """
     # 检查是否启用 Kafka
     if not db_config or not db_config.KAFKA_ENABLED:
         return False
     
     # 获取 Kafka 配置
-    bootstrap_servers = db_config.KAFKA_BOOTSTRAP_SERVERS
+    bootstrap_servers = db_config.KAFKA_BOOTSTRAP_SERVERS or "Resources-Kafka:9092"
     # 使用事件 topic（参考 Sjgz-Backend 设计）
-    event_topic = db_config.KAFKA_EVENT_TOPIC
+    event_topic = db_config.KAFKA_EVENT_TOPIC or "trendradar.crawl_server"
     
     try:
-        # 初始化 Kafka 客户端
-        kafka_client = KafkaClient(
-            bootstrap_servers=bootstrap_servers,
-            enable_kafka=True
-        )
+        # 复用进程级共享的 Kafka 客户端（由 init_connections 创建，cleanup_connections 关闭）
+        kafka_client = get_kafka_client(bootstrap_servers)
         
         if not kafka_client.enable_kafka:
             print("⚠️  Kafka 未启用或初始化失败，跳过发送")
             return False
         
-        # 确保事件 topic 存在
+        # 确保事件 topic 存在（同一客户端只检查一次）
         if not kafka_client.ensure_topic_exists(event_topic):
             print(f"⚠️  Topic '{event_topic}' 不存在且创建失败，但会尝试发送（依赖自动创建）")
         
@@ -83,7 +82,19 @@ def send_fetched_data_to_kafka(
         total_news_count = 0
         
         # 遍历所有平台的数据，创建 DataCrawlEvent（成功记录）
+        unchanged_set = set(unchanged_ids or [])
+        matcher = None
+        if word_groups:
+            # 延迟导入，避免循环导入
+            from crawl_server.core.utils.word_matcher import get_word_matcher
+
+            matcher = get_word_matcher(word_groups, filter_words)
+        if unchanged_set:
+            print(f"⏭️  跳过 {len(unchanged_set)} 个内容未变化的平台: {sorted(unchanged_set)}")
         for platform_id, titles_data in results.items():
+            # 内容未变化的平台不再重复发送
+            if platform_id in unchanged_set:
+                continue
             
             # 遍历该平台的所有新闻
             for title, title_data in titles_data.items():
@@ -93,55 +104,19 @@ def send_fetched_data_to_kafka(
                 
                 # 使用与 HTML 生成相同的匹配逻辑（只保存匹配到的新闻）
                 matched_group_keys = []
-                if word_groups and title:
-                    # 延迟导入，避免循环导入
-                    from crawl_server.core.utils.statistics_utils import matches_word_groups
-                    
-                    # 使用统一的匹配函数（与 HTML 生成逻辑一致）
-                    # 如果不匹配，跳过这个标题（与 HTML 生成逻辑一致）
-                    if not matches_word_groups(title, word_groups, filter_words):
+                if matcher is not None and title:
+                    # 优先读取抓取阶段的匹配标注；不匹配时跳过这个标题（与 HTML 生成逻辑一致）
+                    group_keys = matcher.group_keys_for(title, title_data)
+                    if not group_keys:
                         continue
-                    
-                    # 如果匹配成功，遍历所有 word_groups，找出所有匹配的组，收集 group_key
-                    title_lower = str(title).lower()
-                    matched_count = 0
-                    for group in word_groups:
-                        required_words = group.get("required", [])
-                        normal_words = group.get("normal", [])
-                        group_key = group.get("group_key", "")
-                        
-                        # 如果是"全部新闻"模式，所有标题都匹配第一个（唯一的）词组
-                        if len(word_groups) == 1 and word_groups[0].get("group_key") == "全部新闻":
-                            if group_key:
-                                matched_group_keys.append(group_key)
-                            break
-                        else:
-                            # 原有的匹配逻辑
-                            if required_words:
-                                all_required_present = all(
-                                    req_word.lower() in title_lower for req_word in required_words
-                                )
-                                if not all_required_present:
-                                    continue
-                            
-                            if normal_words:
-                                any_normal_present = any(
-                                    normal_word.lower() in title_lower for normal_word in normal_words
-                                )
-                                if not any_normal_present:
-                                    continue
-                            
-                            # 匹配成功，收集该组的 group_key
-                            if group_key:
-                                matched_group_keys.append(group_key)
-                                matched_count += 1
-                    
+                    matched_group_keys = [group_key for group_key in group_keys if group_key]
+
                     # 调试：打印匹配结果（只打印前几条有匹配的）
-                    if matched_count > 0 and total_news_count < 10:
+                    if matched_group_keys and total_news_count < 10:
                         print(f"🔍 [DEBUG] ✅ 标题匹配成功: {title[:50]}...")
-                        print(f"🔍 [DEBUG]   匹配到的 word_group 数量: {matched_count}")
+                        print(f"🔍 [DEBUG]   匹配到的 word_group 数量: {len(matched_group_keys)}")
                         print(f"🔍 [DEBUG]   匹配到的 group_keys: {matched_group_keys}")
-                
+
                 # 只创建匹配到的事件对象（与 HTML 生成逻辑一致）
                 event = DataCrawlEvent(
                     platform_id=platform_id,
@@ -220,6 +195,7 @@ def send_fetched_data_to_kafka(
             success_count=success_platforms,
             failed_count=len(failed_ids),
             failed_ids=failed_ids,
+            unchanged_ids=sorted(unchanged_set),
             platforms=platform_ids,  # 只存储 ID 列表
             word_groups=word_groups or [],
             filter_words=filter_words or [],
@@ -244,8 +220,8 @@ def send_fetched_data_to_kafka(
         else:
             print(f"⚠️  发送 data.crawl.session 事件失败: session_id={session_id}")
         
-        kafka_client.close()
-        return success_count > 0 or session_success
+        # 部分事件发送失败时返回 False，调用方据此决定是否记录为已发送
+        return success_count == len(events_list) and session_success
             
     except Exception as e:
         print(f"❌ 发送数据到 Kafka 时出错: {e}")
@@ -9,6 +9,7 @@ MVC 架构 - Service 层
 import logging
 from typing import Dict, List, Optional
 from crawl_server.core import create_news_analyzer
+from crawl_server.core.data import CrawlCancelledError
 from crawl_server.repositories import CrawlPipeline
 from crawl_server.configs import CrawlConfig, DatabaseConfig
 
@@ -80,6 +81,9 @@ class CrawlService:
                 
                 success_count += 1
                 logger.info(f"✅ 第 {i+1}/{count} 次抓取完成")
+            except CrawlCancelledError:
+                # 收到停止信号：不再执行后续抓取
+                raise
             except Exception as e:
                 logger.error(f"❌ 第 {i+1}/{count} 次抓取失败: {e}", exc_info=True)
                 # 继续执行下一次，不中断
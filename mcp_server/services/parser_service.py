@@ -1,7 +1,7 @@
 """
 文件解析服务
 
-提供txt格式新闻数据和YAML配置文件的解析功能。
+提供当日标题日志、新闻快照（二进制 .snap 和 txt 格式）和YAML配置文件的解析功能。
 """
 
 import re
@@ -11,6 +11,17 @@ from datetime import datetime
 
 import yaml
 
+from trendradar_formats import (
+    DAY_LOG_FILENAME,
+    SNAPSHOT_SUBFOLDER,
+    SNAPSHOT_SUFFIX,
+    TXT_SUBFOLDER,
+    DayLogFormatError,
+    decode_snapshot,
+    list_snapshot_files,
+    read_day_log,
+)
+
 from ..utils.errors import FileParseError, DataNotFoundError
 from .cache_service import get_cache
 
@@ -143,6 +154,43 @@ class ParserService:
 
         return titles_by_id, id_to_name
 
+    def parse_snapshot_file(self, file_path: Path) -> Tuple[Dict, Dict]:
+        """
+        解析单个二进制快照文件的标题数据
+
+        Args:
+            file_path: .snap 文件路径
+
+        Returns:
+            (titles_by_id, id_to_name) 元组，结构与 parse_txt_file 相同
+
+        Raises:
+            FileParseError: 文件解析错误
+        """
+        if not file_path.exists():
+            raise FileParseError(str(file_path), "文件不存在")
+
+        try:
+            titles_by_id, id_to_name, _ = decode_snapshot(file_path.read_bytes())
+        except Exception as e:
+            raise FileParseError(str(file_path), str(e))
+
+        return titles_by_id, id_to_name
+
+    def parse_news_file(self, file_path: Path) -> Tuple[Dict, Dict]:
+        """
+        按文件后缀解析快照文件（.snap 或 .txt）
+
+        Args:
+            file_path: 快照文件路径
+
+        Returns:
+            (titles_by_id, id_to_name) 元组
+        """
+        if file_path.suffix == SNAPSHOT_SUFFIX:
+            return self.parse_snapshot_file(file_path)
+        return self.parse_txt_file(file_path)
+
     def get_date_folder_name(self, date: datetime = None) -> str:
         """
         获取日期文件夹名称
@@ -163,7 +211,7 @@ class ParserService:
         platform_ids: Optional[List[str]] = None
     ) -> Tuple[Dict, Dict, Dict]:
         """
-        读取指定日期的所有标题文件（带缓存）
+        读取指定日期的所有标题（当日标题日志和快照文件，带缓存）
 
         Args:
             date: 日期对象，默认为今天
@@ -173,7 +221,7 @@ class ParserService:
             (all_titles, id_to_name, all_timestamps) 元组
             - all_titles: {platform_id: {title: {ranks, url, mobileUrl, ...}}}
             - id_to_name: {platform_id: platform_name}
-            - all_timestamps: {filename: timestamp}
+            - all_timestamps: {文件名或抓取时间: timestamp}
 
         Raises:
             DataNotFoundError: 数据不存在
@@ -195,9 +243,9 @@ class ParserService:
 
         # 缓存未命中，读取文件
         date_folder = self.get_date_folder_name(date)
-        txt_dir = self.project_root / "output" / date_folder / "txt"
+        day_dir = self.project_root / "output" / date_folder
 
-        if not txt_dir.exists():
+        if not (day_dir / TXT_SUBFOLDER).exists() and not (day_dir / SNAPSHOT_SUBFOLDER).exists():
             raise DataNotFoundError(
                 f"未找到 {date_folder} 的数据目录",
                 suggestion="请先运行爬虫或检查日期是否正确"
@@ -207,18 +255,36 @@ class ParserService:
         id_to_name = {}
         all_timestamps = {}
 
-        # 读取所有txt文件
-        txt_files = sorted(txt_dir.glob("*.txt"))
-
-        if not txt_files:
+        # 读取当日标题日志（每天的主存储）
+        log_path = day_dir / SNAPSHOT_SUBFOLDER / DAY_LOG_FILENAME
+        day_log = None
+        log_mtime = None
+        if log_path.exists():
+            try:
+                day_log = read_day_log(log_path)
+                log_mtime = log_path.stat().st_mtime
+            except (OSError, DayLogFormatError) as e:
+                print(f"Warning: 读取当日标题日志 {log_path} 失败: {e}")
+
+        # 日志中没有的抓取时间读取快照文件（旧数据或日志追加失败时保存，.snap 优先，兼容 .txt）
+        sources = {time_info: None for time_info in (day_log.crawls if day_log else ())}
+        for news_file in list_snapshot_files(day_dir):
+            if news_file.stem not in sources:
+                sources[news_file.stem] = news_file
+
+        if not sources:
             raise DataNotFoundError(
                 f"{date_folder} 没有数据文件",
                 suggestion="请等待爬虫任务完成"
             )
 
-        for txt_file in txt_files:
+        for time_info in sorted(sources):
+            news_file = sources[time_info]
             try:
-                titles_by_id, file_id_to_name = self.parse_txt_file(txt_file)
+                if news_file is None:
+                    titles_by_id, file_id_to_name = day_log.crawl_titles(time_info)
+                else:
+                    titles_by_id, file_id_to_name = self.parse_news_file(news_file)
 
                 # 更新id_to_name
                 id_to_name.update(file_id_to_name)
@@ -239,12 +305,15 @@ class ParserService:
                         else:
                             all_titles[platform_id][title] = info.copy()
 
-                # 记录文件时间戳
-                all_timestamps[txt_file.name] = txt_file.stat().st_mtime
+                # 记录抓取时间戳（日志中的抓取取日志文件的修改时间）
+                if news_file is None:
+                    all_timestamps[time_info] = log_mtime
+                else:
+                    all_timestamps[news_file.name] = news_file.stat().st_mtime
 
             except Exception as e:
-                # 忽略单个文件的解析错误，继续处理其他文件
-                print(f"Warning: 解析文件 {txt_file} 失败: {e}")
+                # 忽略单次抓取的解析错误，继续处理其他抓取
+                print(f"Warning: 解析 {news_file or log_path} 中 {time_info} 的数据失败: {e}")
                 continue
 
         if not all_titles:
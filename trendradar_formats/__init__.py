@@ -0,0 +1,39 @@
+"""
+TrendRadar 数据文件格式
+
+crawl_server 写入、crawl_server 和 mcp_server 共同读取的 output 目录文件格式，
+只依赖标准库，两个服务直接导入，修改格式时只需改这里
+"""
+from .day_log import DayLog, DayLogFormatError, DayLogWriter, decode_day_log, read_day_log
+from .files import (
+    DAY_LOG_FILENAME,
+    SNAPSHOT_SUBFOLDER,
+    SNAPSHOT_SUFFIX,
+    TXT_SUBFOLDER,
+    list_snapshot_files,
+)
+from .snapshot import (
+    SNAPSHOT_MAGIC,
+    SNAPSHOT_VERSION,
+    SnapshotFormatError,
+    decode_snapshot,
+    encode_snapshot_records,
+)
+
+__all__ = [
+    "DAY_LOG_FILENAME",
+    "SNAPSHOT_SUBFOLDER",
+    "SNAPSHOT_SUFFIX",
+    "TXT_SUBFOLDER",
+    "list_snapshot_files",
+    "SNAPSHOT_MAGIC",
+    "SNAPSHOT_VERSION",
+    "SnapshotFormatError",
+    "encode_snapshot_records",
+    "decode_snapshot",
+    "DayLog",
+    "DayLogFormatError",
+    "DayLogWriter",
+    "decode_day_log",
+    "read_day_log",
+]
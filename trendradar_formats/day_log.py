@@ -0,0 +1,328 @@
+"""
+当日标题追加日志
+
+每天的主存储：每个 (平台, 标题) 首次出现时分配一个整数 ID，标题和 URL 只写一次；之后每次抓取
+只追加 (抓取时间, 标题ID, 排名) 记录。文件大小和读取耗时随当天不同标题数增长，
+而不是随 标题数 × 抓取次数 增长。
+
+文件: output/<日期>/snapshots/titles.dlog
+    magic(4 字节 b"TRDL") | version(1 字节) | 记录 ...
+记录: 类型(1 字节) | varint 载荷字节数 | 载荷，其中字符串均为 varint 字节数 + UTF-8
+    S 字符串定义: varint 字符串ID | 字符串（平台ID、平台名称）
+    T 标题定义:   varint 标题ID | varint 平台字符串ID | 标题 | URL | 移动URL
+    U URL 补全:   varint 标题ID | URL | 移动URL（首次出现时 URL 为空、之后抓到了 URL）
+    C 抓取记录:   抓取时间 | 整数宽度(1 字节) | 小端定宽整数数组，内容依次为
+        平台数, [平台字符串ID, 名称字符串ID, 标题数 n, 标题ID * n, 排名数 * n, 所有排名] * 平台数
+
+同一抓取时间有多条抓取记录时以最后一条为准（与同名快照文件被覆盖的行为一致，
+同一分钟内重复保存的是同一份结果，标题和 URL 定义不受影响）。
+每次抓取的所有记录一次性追加，末尾不完整的记录读取时忽略，下次写入前截掉。
+"""
+import os
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from .snapshot import SnapshotPlatform, encode_int_array, read_varint, write_varint
+
+DAY_LOG_MAGIC = b"TRDL"
+DAY_LOG_VERSION = 1
+_HEADER_SIZE = len(DAY_LOG_MAGIC) + 1
+
+_RECORD_STRING = ord("S")
+_RECORD_TITLE = ord("T")
+_RECORD_URL = ord("U")
+_RECORD_CRAWL = ord("C")
+
+# 单次抓取中一个平台的数据: (平台字符串ID, 名称字符串ID, [(标题ID, ranks), ...])
+CrawlEntries = Tuple[int, int, List[Tuple[int, List[int]]]]
+
+
+class DayLogFormatError(ValueError):
+    """当日标题日志格式错误"""
+
+
+def _write_string(out: bytearray, value: str) -> None:
+    data = value.encode("utf-8")
+    write_varint(out, len(data))
+    out += data
+
+
+def _read_string(buf: bytes, pos: int) -> Tuple[str, int]:
+    length, pos = read_varint(buf, pos)
+    return buf[pos:pos + length].decode("utf-8"), pos + length
+
+
+def _write_record(out: bytearray, kind: int, payload: bytes) -> None:
+    out.append(kind)
+    write_varint(out, len(payload))
+    out += payload
+
+
+def _decode_ints(data: bytes) -> List[int]:
+    numbers = array(chr(data[0]))
+    numbers.frombytes(data[1:])
+    if sys.byteorder == "big":
+        numbers.byteswap()
+    return numbers.tolist()
+
+
+class DayLog:
+    """
+    解析后的当日标题日志
+
+    支持增量读取：update 只解码 valid_end 之后新追加的部分
+    """
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self.titles: List[List] = []  # 标题ID -> [平台字符串ID, 标题, URL, 移动URL]
+        self.crawls: Dict[str, bytes] = {}  # 抓取时间 -> 整数区（含宽度字节），同一时间以最后一条为准
+        self.valid_end = 0  # 最后一条完整记录在文件中的结束位置
+
+    def crawl_times(self) -> List[str]:
+        """所有抓取时间，按时间排序"""
+        return sorted(self.crawls)
+
+    def update(self, data: bytes) -> List[str]:
+        """
+        解码文件中 valid_end 之后的内容（末尾不完整的记录留到下次）
+
+        Args:
+            data: 从文件 valid_end 位置开始读取的字节
+
+        Returns:
+            本次读到的抓取记录的时间（按记录顺序，可能与已有时间重复）
+        """
+        pos = 0
+        if self.valid_end == 0:
+            if len(data) < _HEADER_SIZE:
+                if DAY_LOG_MAGIC.startswith(data[:4]):
+                    return []
+                raise DayLogFormatError("不是当日标题日志")
+            if data[:4] != DAY_LOG_MAGIC:
+                raise DayLogFormatError("不是当日标题日志")
+            if data[4] != DAY_LOG_VERSION:
+                raise DayLogFormatError(f"不支持的日志版本: {data[4]}")
+            pos = _HEADER_SIZE
+            self.valid_end = pos
+
+        base = self.valid_end - pos
+        new_times = []
+        try:
+            while pos < len(data):
+                kind = data[pos]
+                try:
+                    length, start = read_varint(data, pos + 1)
+                except IndexError:
+                    break
+                end = start + length
+                if end > len(data):
+                    break
+
+                if kind == _RECORD_STRING:
+                    string_id, p = read_varint(data, start)
+                    if string_id != len(self.strings):
+                        raise DayLogFormatError(f"字符串ID不连续: {string_id}")
+                    self.strings.append(data[p:end].decode("utf-8"))
+                elif kind == _RECORD_TITLE:
+                    title_id, p = read_varint(data, start)
+                    if title_id != len(self.titles):
+                        raise DayLogFormatError(f"标题ID不连续: {title_id}")
+                    platform_sid, p = read_varint(data, p)
+                    title, p = _read_string(data, p)
+                    url, p = _read_string(data, p)
+                    mobile_url, p = _read_string(data, p)
+                    self.titles.append([platform_sid, title, url, mobile_url])
+                elif kind == _RECORD_URL:
+                    title_id, p = read_varint(data, start)
+                    url, p = _read_string(data, p)
+                    mobile_url, p = _read_string(data, p)
+                    self.titles[title_id][2:] = [url, mobile_url]
+                elif kind == _RECORD_CRAWL:
+                    time_info, p = _read_string(data, start)
+                    self.crawls.pop(time_info, None)
+                    self.crawls[time_info] = data[p:end]
+                    new_times.append(time_info)
+                else:
+                    raise DayLogFormatError(f"未知的记录类型: {kind}")
+
+                pos = end
+                self.valid_end = base + pos
+        except DayLogFormatError:
+            raise
+        except (IndexError, ValueError) as e:
+            raise DayLogFormatError(f"当日标题日志已损坏: {e}")
+
+        return new_times
+
+    def iter_crawl(self, time_info: str) -> Iterator[CrawlEntries]:
+        """遍历某次抓取的各平台数据"""
+        ints = _decode_ints(self.crawls[time_info])
+        pos = 1
+        for _ in range(ints[0]):
+            platform_sid, name_sid, n = ints[pos:pos + 3]
+            pos += 3
+            title_ids = ints[pos:pos + n]
+            rank_counts = ints[pos + n:pos + 2 * n]
+            pos += 2 * n
+            entries = []
+            for title_id, count in zip(title_ids, rank_counts):
+                entries.append((title_id, ints[pos:pos + count]))
+                pos += count
+            yield platform_sid, name_sid, entries
+
+    def crawl_titles(self, time_info: str) -> Tuple[Dict, Dict]:
+        """
+        某次抓取的标题数据，结构与解码该次快照相同
+
+        Returns:
+            (titles_by_id, id_to_name)
+        """
+        titles_by_id = {}
+        id_to_name = {}
+        for platform_sid, name_sid, entries in self.iter_crawl(time_info):
+            titles = {}
+            for title_id, ranks in entries:
+                _, title, url, mobile_url = self.titles[title_id]
+                titles[title] = {"ranks": ranks, "url": url, "mobileUrl": mobile_url}
+            source_id = self.strings[platform_sid]
+            titles_by_id[source_id] = titles
+            id_to_name[source_id] = self.strings[name_sid]
+        return titles_by_id, id_to_name
+
+
+def decode_day_log(data: bytes) -> DayLog:
+    """解码当日标题日志（忽略末尾不完整的记录）"""
+    day_log = DayLog()
+    day_log.update(data)
+    return day_log
+
+
+def read_day_log(file_path: Path) -> DayLog:
+    """读取当日标题日志"""
+    with open(file_path, "rb") as f:
+        return decode_day_log(f.read())
+
+
+class DayLogWriter:
+    """当日标题日志写入器（线程安全，字符串和标题ID映射常驻内存）"""
+
+    def __init__(self, file_path: str):
+        self.file_path = str(file_path)
+        self._lock = threading.Lock()
+        self._strings: Dict[str, int] = {}
+        self._titles: Dict[Tuple[int, str], int] = {}
+        self._urls: List[Tuple[str, str]] = []
+        self._size = 0
+        self._load()
+
+    def _load(self) -> None:
+        """从已有文件恢复映射，截掉末尾不完整的记录"""
+        self._strings.clear()
+        self._titles.clear()
+        self._urls.clear()
+        self._size = 0
+        if not os.path.exists(self.file_path):
+            return
+
+        day_log = read_day_log(Path(self.file_path))
+        for string_id, value in enumerate(day_log.strings):
+            self._strings[value] = string_id
+        for title_id, (platform_sid, title, url, mobile_url) in enumerate(day_log.titles):
+            self._titles[(platform_sid, title)] = title_id
+            self._urls.append((url, mobile_url))
+
+        if os.path.getsize(self.file_path) > day_log.valid_end:
+            with open(self.file_path, "r+b") as f:
+                f.truncate(day_log.valid_end)
+        self._size = day_log.valid_end
+
+    def _intern_string(self, out: bytearray, value: str) -> int:
+        string_id = self._strings.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings[value] = string_id
+            payload = bytearray()
+            write_varint(payload, string_id)
+            payload += value.encode("utf-8")
+            _write_record(out, _RECORD_STRING, payload)
+        return string_id
+
+    def _intern_title(self, out: bytearray, platform_sid: int, title: str, url: str, mobile_url: str) -> int:
+        title_id = self._titles.get((platform_sid, title))
+        if title_id is None:
+            title_id = len(self._urls)
+            self._titles[(platform_sid, title)] = title_id
+            self._urls.append((url, mobile_url))
+            payload = bytearray()
+            write_varint(payload, title_id)
+            write_varint(payload, platform_sid)
+            _write_string(payload, title)
+            _write_string(payload, url)
+            _write_string(payload, mobile_url)
+            _write_record(out, _RECORD_TITLE, payload)
+            return title_id
+
+        # 与合并逻辑一致：保留第一个非空 URL
+        old_url, old_mobile_url = self._urls[title_id]
+        new_url, new_mobile_url = old_url or url, old_mobile_url or mobile_url
+        if (new_url, new_mobile_url) != (old_url, old_mobile_url):
+            self._urls[title_id] = (new_url, new_mobile_url)
+            payload = bytearray()
+            write_varint(payload, title_id)
+            _write_string(payload, new_url)
+            _write_string(payload, new_mobile_url)
+            _write_record(out, _RECORD_URL, payload)
+        return title_id
+
+    def append_crawl(self, time_info: str, platforms: List[SnapshotPlatform]) -> None:
+        """追加一次抓取（platforms 为规范化后的抓取结果，与快照编码的输入相同）"""
+        with self._lock:
+            # 文件被外部删除或改动时重新加载
+            try:
+                size = os.path.getsize(self.file_path)
+            except OSError:
+                size = 0
+            if size != self._size:
+                self._load()
+
+            out = bytearray()
+            if self._size == 0:
+                out += DAY_LOG_MAGIC
+                out.append(DAY_LOG_VERSION)
+
+            ints: List[int] = [len(platforms)]
+            for id_value, name, records in platforms:
+                platform_sid = self._intern_string(out, id_value)
+                name_sid = self._intern_string(out, name)
+                # 同一平台内重复的标题保留第一次出现的位置、最后一次的内容（与快照解码后的字典一致）
+                deduped: Dict[str, Tuple] = {}
+                for record in records:
+                    deduped[record[1]] = record
+                entries: Dict[int, List[int]] = {}
+                for ranks, title, url, mobile_url in deduped.values():
+                    title_id = self._intern_title(out, platform_sid, title, url, mobile_url)
+                    entries[title_id] = [max(0, int(rank)) for rank in ranks]
+                ints += (platform_sid, name_sid, len(entries))
+                ints += entries.keys()
+                ints += [len(ranks) for ranks in entries.values()]
+                for ranks in entries.values():
+                    ints += ranks
+
+            payload = bytearray()
+            _write_string(payload, time_info)
+            payload += encode_int_array(ints)
+            _write_record(out, _RECORD_CRAWL, payload)
+
+            try:
+                with open(self.file_path, "ab") as f:
+                    f.write(out)
+                    f.flush()
+            except OSError:
+                # 内存中的映射可能已超前于文件，下次写入前重新加载
+                self._size = -1
+                raise
+            self._size += len(out)
@@ -0,0 +1,36 @@
+"""
+output 目录布局
+
+每天一个目录 output/<YYYY年MM月DD日>：
+    snapshots/titles.dlog  当日标题日志，每天的主存储（格式见 day_log）
+    snapshots/*.snap       单次抓取的二进制快照（旧数据或导出，格式见 snapshot）
+    txt/*.txt              单次抓取的 txt 快照（旧数据或导出）
+"""
+from pathlib import Path
+from typing import Dict, List
+
+SNAPSHOT_SUBFOLDER = "snapshots"
+SNAPSHOT_SUFFIX = ".snap"
+TXT_SUBFOLDER = "txt"
+DAY_LOG_FILENAME = "titles.dlog"
+
+
+def list_snapshot_files(day_dir: Path) -> List[Path]:
+    """
+    列出某天的单次抓取快照文件，按时间排序
+
+    同时读取 snapshots/*.snap 和 txt/*.txt（旧数据或 txt 导出），
+    同一时间点两种文件都存在时只取二进制快照
+    """
+    files: Dict[str, Path] = {}
+    txt_dir = Path(day_dir) / TXT_SUBFOLDER
+    if txt_dir.exists():
+        for file_path in txt_dir.iterdir():
+            if file_path.suffix == ".txt":
+                files[file_path.stem] = file_path
+    snapshot_dir = Path(day_dir) / SNAPSHOT_SUBFOLDER
+    if snapshot_dir.exists():
+        for file_path in snapshot_dir.iterdir():
+            if file_path.suffix == SNAPSHOT_SUFFIX:
+                files[file_path.stem] = file_path
+    return [files[stem] for stem in sorted(files)]
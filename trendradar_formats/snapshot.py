@@ -0,0 +1,162 @@
+"""
+二进制快照格式
+
+一次抓取结果保存为一个紧凑的二进制快照（output/<日期>/snapshots/HH时MM分.snap）。
+读取时字符串表一次解码、整数区一次性载入数组，无需逐行 split。
+
+文件布局：
+    magic(4 字节 b"TRSN") | version(1 字节) | 整数宽度(1 字节: b"B"/b"H"/b"I")
+    字符串表: varint 字节数 + 以 \x00 分隔的 UTF-8 字符串（相同字符串只存一份）
+    整数区: varint 个数 + 小端定宽整数数组，内容依次为
+        平台数,
+        [id, name, 标题数 n, title * n, url * n, mobile_url * n, 排名数 * n, 所有排名] * 平台数,
+        失败平台数, [id] * 失败平台数
+    其中 id/name/title/url/mobile_url 均为字符串表下标
+"""
+import sys
+from array import array
+from typing import Dict, List, Tuple
+
+SNAPSHOT_MAGIC = b"TRSN"
+SNAPSHOT_VERSION = 1
+_STRING_SEPARATOR = "\x00"
+
+# 规范化后的一个平台: (平台ID, 平台名称, [(ranks, title, url, mobile_url), ...])
+SnapshotPlatform = Tuple[str, str, List[Tuple[List[int], str, str, str]]]
+
+
+class SnapshotFormatError(ValueError):
+    """快照文件格式错误"""
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    """写入无符号 LEB128 varint"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    """读取无符号 LEB128 varint，返回 (值, 新位置)"""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def encode_int_array(ints: List[int]) -> bytes:
+    """编码为 整数宽度(1 字节) + 小端定宽整数数组，宽度按最大值选择"""
+    max_value = max(ints)
+    typecode = "B" if max_value < 1 << 8 else "H" if max_value < 1 << 16 else "I"
+    numbers = array(typecode, ints)
+    if sys.byteorder == "big":
+        numbers.byteswap()
+    return typecode.encode("ascii") + numbers.tobytes()
+
+
+def encode_snapshot_records(platforms: List[SnapshotPlatform], failed_ids: List) -> bytes:
+    """将已规范化的抓取结果编码为二进制快照"""
+    table: List[str] = []
+    index: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        idx = index.get(value)
+        if idx is None:
+            idx = len(table)
+            index[value] = idx
+            # 分隔符不会出现在正常文本中，出现时直接去掉
+            table.append(value.replace(_STRING_SEPARATOR, ""))
+        return idx
+
+    ints: List[int] = [len(platforms)]
+    for id_value, name, records in platforms:
+        ints += (intern(id_value), intern(name), len(records))
+        ints += [intern(record[1]) for record in records]
+        ints += [intern(record[2]) for record in records]
+        ints += [intern(record[3]) for record in records]
+        ints += [len(record[0]) for record in records]
+        for record in records:
+            ints += [max(0, int(rank)) for rank in record[0]]
+
+    ints.append(len(failed_ids))
+    ints += [intern(id_value) for id_value in failed_ids]
+
+    encoded_ints = encode_int_array(ints)
+    blob = _STRING_SEPARATOR.join(table).encode("utf-8")
+    out = bytearray(SNAPSHOT_MAGIC)
+    out.append(SNAPSHOT_VERSION)
+    out += encoded_ints[:1]
+    write_varint(out, len(blob))
+    out += blob
+    write_varint(out, len(ints))
+    out += encoded_ints[1:]
+    return bytes(out)
+
+
+def decode_snapshot(data: bytes) -> Tuple[Dict, Dict, List]:
+    """
+    解码二进制快照
+
+    Returns:
+        (titles_by_id, id_to_name, failed_ids)
+    """
+    if data[:4] != SNAPSHOT_MAGIC:
+        raise SnapshotFormatError("不是快照文件")
+    if len(data) < 6 or data[4] != SNAPSHOT_VERSION:
+        raise SnapshotFormatError(f"不支持的快照版本: {data[4] if len(data) > 4 else None}")
+
+    try:
+        typecode = chr(data[5])
+        pos = 6
+        blob_length, pos = read_varint(data, pos)
+        table = data[pos:pos + blob_length].decode("utf-8").split(_STRING_SEPARATOR)
+        pos += blob_length
+
+        count, pos = read_varint(data, pos)
+        numbers = array(typecode)
+        numbers.frombytes(data[pos:pos + count * numbers.itemsize])
+        if len(numbers) != count:
+            raise SnapshotFormatError("快照文件已截断")
+        if sys.byteorder == "big":
+            numbers.byteswap()
+        ints = numbers.tolist()
+
+        titles_by_id = {}
+        id_to_name = {}
+        pos = 1
+        for _ in range(ints[0]):
+            id_idx, name_idx, n = ints[pos:pos + 3]
+            pos += 3
+            title_idx = ints[pos:pos + n]
+            url_idx = ints[pos + n:pos + 2 * n]
+            mobile_idx = ints[pos + 2 * n:pos + 3 * n]
+            rank_counts = ints[pos + 3 * n:pos + 4 * n]
+            pos += 4 * n
+
+            titles = {}
+            for t, u, m, c in zip(title_idx, url_idx, mobile_idx, rank_counts):
+                titles[table[t]] = {
+                    "ranks": ints[pos:pos + c],
+                    "url": table[u],
+                    "mobileUrl": table[m],
+                }
+                pos += c
+
+            source_id = table[id_idx]
+            id_to_name[source_id] = table[name_idx]
+            titles_by_id[source_id] = titles
+
+        failed_count = ints[pos]
+        failed_ids = [table[i] for i in ints[pos + 1:pos + 1 + failed_count]]
+    except SnapshotFormatError:
+        raise
+    except (IndexError, ValueError) as e:
+        raise SnapshotFormatError(f"快照文件已损坏: {e}")
+
+    return titles_by_id, id_to_name, failed_ids